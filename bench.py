@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Benchmarks of nomenclature engines on synthetic workloads. Results are 
+# written to JSON file, two result files can be compared.
+#
+# Example:
+# > python bench.py -o before.json
+# > python bench.py -o after.json --compare before.json
+# > python bench.py -k coords_to_100k -n 10000
+
+import argparse
+import datetime
+import fnmatch
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+
+import nomk2
+from nomk import algos, coord, parser, sheetid, text, util
+
+scales = sheetid.scales
+
+# Cities for clustered points: (longtitude, latitude)
+cities = [
+    (37.62, 55.75), (30.31, 59.94), (82.92, 55.03), (60.60, 56.84), (49.11, 55.79),
+    (131.89, 43.12), (-0.13, 51.51), (-74.01, 40.71), (-58.38, -34.60), (151.21, -33.87),
+    (18.42, -33.92), (116.40, 39.90), (-43.17, -22.91), (174.78, -41.29), (-179.90, 65.0),
+]
+
+def uniform_points(rnd, count):
+    return [(rnd.uniform(-180.0, 180.0), rnd.uniform(-87.99, 87.99)) for _ in range(count)]
+
+def clustered_points(rnd, count):
+    points = []
+    for _ in range(count):
+        x, y = rnd.choice(cities)
+        x = min(max(rnd.gauss(x, 0.2), -179.99), 179.99)
+        points.append((x, rnd.gauss(y, 0.2)))
+    return points
+
+def polar_points(rnd, count):
+    # Half of points in doubled sheets (60 - 76), half in quadrupled ones
+    points = []
+    for i in range(count):
+        y = rnd.uniform(60.0, 76.0) if i % 2 == 0 else rnd.uniform(76.0, 87.99)
+        points.append((rnd.uniform(-180.0, 180.0), y if rnd.random() < 0.5 else -y))
+    return points
+
+def southern_points(rnd, count):
+    return [(rnd.uniform(-180.0, 180.0), rnd.uniform(-59.99, -0.01)) for _ in range(count)]
+
+point_workloads = {
+    'uniform': uniform_points,
+    'clustered': clustered_points,
+    'polar': polar_points,
+}
+
+# Names are made from sheets of points
+name_workloads = {
+    'uniform': uniform_points,
+    'clustered': clustered_points,
+    'polar': polar_points,
+    'southern': southern_points,
+}
+
+def to_nomk2_name(scale, nomk_str):
+    # nomk2 has other notation of 200k, 5k and 2k and no southern hemisphere
+    if util.south_suffix() in nomk_str:
+        return None
+    if scale == '200k':
+        prefix, parts = nomk_str.rsplit('-', 1)
+        nomk_str = prefix + '-' + ','.join('{:02d}'.format(util.roman_figures.index(part) + 1) 
+            for part in parts.split(','))
+    elif scale == '5k':
+        nomk_str = nomk_str.replace('-(', '(')
+    elif scale == '2k':
+        nomk_str = nomk_str.replace('-(', '(').replace(')-', '-') + ')'
+    if nomk2.get_nomk(nomk_str) is None:
+        return None
+    return nomk_str
+
+def measure(func, items, repeat):
+    """Returns timings of calling func for every item repeat times"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(items)
+        timings.append(time.perf_counter() - start)
+    count = len(items)
+    best = min(timings)
+    return {
+        'count': count,
+        'repeat': repeat,
+        'best_ns': best / count * 1e9,
+        'median_ns': statistics.median(timings) / count * 1e9,
+        'ops_per_sec': count / best if best > 0 else math.inf,
+    }
+
+def _coords_case(coords_to_func):
+    def run(points):
+        for x, y in points:
+            coords_to_func(x, y)
+    return run
+
+def _text_case(text_func):
+    def run(parsed):
+        for parts, is_south in parsed:
+            text_func(*parts, is_south)
+    return run
+
+def _parse_case(scale):
+    def run(names):
+        for name in names:
+            parser.parse(name, scale)
+    return run
+
+def _neighbors_case(scale):
+    def run(names):
+        for name in names:
+            algos.get_neighbors([name], scale)
+    return run
+
+def _nomk2_case(names):
+    for name in names:
+        nomk2.get_nomk(name).get_bbox_as_wkt()
+
+def build_cases(count, seed):
+    """Yields (name, func, items) of benchmark cases. Func is called with 
+        items, which are prepared out of time measurement.
+    """
+    points = dict((workload, points_func(random.Random(seed), count)) 
+        for workload, points_func in name_workloads.items())
+
+    for workload in point_workloads:
+        for scale in scales:
+            coords_to_func = getattr(coord, 'coords_to_' + scale)
+            yield 'coords_to_{}/{}'.format(scale, workload), _coords_case(coords_to_func), points[workload]
+
+    for workload in name_workloads:
+        for scale in scales:
+            coords_to_func = getattr(coord, 'coords_to_' + scale)
+            names = [coords_to_func(x, y)[0] for x, y in points[workload]]
+            parsed = [parser.parse(name, scale)[1:] for name in names]
+            yield ('text_to_{}/{}'.format(scale, workload), 
+                _text_case(getattr(text, 'text_to_' + scale)), parsed)
+            yield 'parse_{}/{}'.format(scale, workload), _parse_case(scale), names
+            yield 'parse_detect_{}/{}'.format(scale, workload), _parse_case(''), names
+            if scale in ('1m', '100k', '10k'):
+                yield 'get_neighbors_{}/{}'.format(scale, workload), _neighbors_case(scale), names
+
+            nomk2_names = [name for name in (to_nomk2_name(scale, name) for name in names) if name]
+            if nomk2_names:
+                yield 'nomk2_{}/{}'.format(scale, workload), _nomk2_case, nomk2_names
+
+def run(count, repeat, seed, patterns):
+    results = {}
+    for name, func, items in build_cases(count, seed):
+        if patterns and not any(fnmatch.fnmatch(name, '*' + pattern + '*') for pattern in patterns):
+            continue
+        results[name] = measure(func, items, repeat)
+        print(u'{:<32}{:>12.0f} ns{:>14.0f} ops/s'.format(name, results[name]['best_ns'], 
+            results[name]['ops_per_sec']), file=sys.stderr)
+    return {
+        'meta': {
+            'date': datetime.datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'count': count,
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+def compare(base, current, threshold):
+    """Prints ratio of best timings, returns names of cases slower than 
+        threshold
+    """
+    slower = []
+    print(u'{:<32}{:>12}{:>12}{:>9}'.format('case', 'base ns', 'current ns', 'ratio'))
+    for name, result in current['results'].items():
+        if name not in base['results']:
+            continue
+        base_ns = base['results'][name]['best_ns']
+        ratio = result['best_ns'] / base_ns if base_ns > 0 else math.inf
+        mark = ''
+        if ratio > 1.0 + threshold:
+            slower.append(name)
+            mark = ' !'
+        print(u'{:<32}{:>12.0f}{:>12.0f}{:>9.2f}{}'.format(name, base_ns, result['best_ns'], ratio, mark))
+    return slower
+
+if __name__ == "__main__":
+    parser_obj = argparse.ArgumentParser(description='Benchmark nomenclature engines')
+    parser_obj.add_argument('-n', '--count', help='Number of items in workload (default: %(default)s)', type=int, default=2000)
+    parser_obj.add_argument('-r', '--repeat', help='Number of measurements of case, the best is reported (default: %(default)s)', type=int, default=5)
+    parser_obj.add_argument('--seed', help='Random seed of workloads (default: %(default)s)', type=int, default=1)
+    parser_obj.add_argument('-k', '--filter', help='Run only cases containing pattern (can be repeated)', action='append', dest='patterns')
+    parser_obj.add_argument('-o', '--output', help='Write results to JSON file')
+    parser_obj.add_argument('--compare', help='Compare results with JSON file of previous run', metavar='FILE')
+    parser_obj.add_argument('--threshold', help='Relative slowdown to report as regression (default: %(default)s)', type=float, default=0.1)
+
+    args = parser_obj.parse_args()
+
+    current = run(args.count, args.repeat, args.seed, args.patterns)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            base = json.load(f)
+        slower = compare(base, current, args.threshold)
+        if slower:
+            exit('{} cases are slower than {}'.format(len(slower), args.compare))
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Load generator for nomk.py --serve. Opens concurrent connections, sends
+# requests of random operations and prints latency percentiles.
+#
+# Example:
+# > python nomk.py --serve 127.0.0.1:8765 &
+# > python loadgen.py 127.0.0.1:8765 -c 16 -n 20000 --batch 10
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from nomk import server, sheetid
+
+def make_request(rnd, ops):
+    op = rnd.choice(ops)
+    x = rnd.uniform(-179.0, 179.0)
+    y = rnd.uniform(-80.0, 80.0)
+    if op == 'point':
+        return {'op': 'point', 'x': x, 'y': y}
+    scale = rnd.choice(sheetid.scales[:4])
+    if op == 'bbox':
+        return {'op': 'bbox', 'bbox': [x, y, x + 1.0, y + 1.0], 'scale': scale}
+    nomk_str = sheetid.to_nomk(sheetid.from_coords(x, y, scale))[0]
+    if op == 'name':
+        return {'op': 'name', 'nomk': nomk_str}
+    return {'op': 'neighbors', 'nomk': nomk_str, 'scale': scale}
+
+async def client(address, lines, latencies, errors):
+    host, port = server.parse_address(address)
+    if host is None:
+        reader, writer = await asyncio.open_unix_connection(port, limit = server.MAX_LINE)
+    else:
+        reader, writer = await asyncio.open_connection(host, port, limit = server.MAX_LINE)
+    for line in lines:
+        start = time.perf_counter()
+        writer.write(line)
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        for item in response if isinstance(response, list) else [response]:
+            if 'error' in item:
+                errors.append(item['error'])
+    writer.close()
+
+def percentile(values, percent):
+    return values[min(len(values) - 1, int(len(values) * percent / 100.0))]
+
+async def main(args):
+    rnd = random.Random(args.seed)
+    ops = args.ops.split(',')
+    requests = []
+    for _ in range(args.count):
+        items = [make_request(rnd, ops) for _ in range(args.batch)]
+        request = items if args.batch > 1 else items[0]
+        requests.append(json.dumps(request).encode('utf-8') + b'\n')
+
+    latencies = []
+    errors = []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(args.address, requests[i::args.connections], latencies, errors) 
+        for i in range(args.connections)])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print('requests: {}, items: {}, errors: {}, time: {:.2f} s'.format(
+        len(latencies), len(latencies) * args.batch, len(errors), elapsed))
+    print('throughput: {:.0f} requests/s, {:.0f} items/s'.format(
+        len(latencies) / elapsed, len(latencies) * args.batch / elapsed))
+    print('latency ms: p50 {:.3f}, p90 {:.3f}, p99 {:.3f}, max {:.3f}'.format(
+        *[percentile(latencies, percent) * 1e3 for percent in (50, 90, 99, 100)]))
+    if errors:
+        print('first error: {}'.format(errors[0]), file=sys.stderr)
+
+if __name__ == "__main__":
+    parser_obj = argparse.ArgumentParser(description='Load generator for nomk.py --serve')
+    parser_obj.add_argument('address', help='HOST:PORT, PORT or unix:PATH of server')
+    parser_obj.add_argument('-c', '--connections', help='Number of concurrent connections (default: %(default)s)', type=int, default=8)
+    parser_obj.add_argument('-n', '--count', help='Number of requests (default: %(default)s)', type=int, default=10000)
+    parser_obj.add_argument('--batch', help='Number of items in request, more than 1 sends JSON arrays (default: %(default)s)', type=int, default=1)
+    parser_obj.add_argument('--ops', help='Comma separated operations (default: %(default)s)', default='point,name,bbox,neighbors')
+    parser_obj.add_argument('--seed', help='Random seed of requests (default: %(default)s)', type=int, default=1)
+
+    asyncio.run(main(parser_obj.parse_args()))
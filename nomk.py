@@ -25,46 +25,111 @@
 # Example:
 # > python nomk.py -c 37.0 55.0
 # > python nomk.py -n "N-37-100"
+# > python nomk.py -b points.txt -s 100k -j 8
+# > python nomk.py --serve 127.0.0.1:8765
+# > python nomk.py --build-table sheets.bin
+# > cat points.csv | python nomk.py -b - --input-format csv --output-format ndjson --scales 1m,100k --skip-errors
 
 import argparse
-from nomk import parser, text, coord
+import atexit
+import io
+import sys
+from nomk import parser, text, coord, parallel, server, stats, stream, table
+
+def open_stream(path, mode):
+    # Buffered UTF-8 text stream, - is stdin or stdout
+    if path == '-':
+        fileno = sys.stdin.fileno() if mode == 'r' else sys.stdout.fileno()
+        return io.open(fileno, mode, encoding='utf-8', buffering=1 << 16, closefd=False)
+    return io.open(path, mode, encoding='utf-8', buffering=1 << 16)
+
+def report_error(error):
+    print(error, file=sys.stderr)
 
 if __name__ == "__main__":
     parser_obj = argparse.ArgumentParser(description='Transform coordinates to nomenclature and vice versa')
     parser_obj.add_argument('-v', '--version', action='version', version='%(prog)s 0.1')
     parser_obj.add_argument('-c', '--coord2nomk', help='Transform coordinates (longtitude latitude) to nomenclature.', type=float, nargs=2, metavar=('X', 'Y'))
     parser_obj.add_argument('-n', '--nomk2coord', help='Transform nomenclature to coordinates', dest='nomk')
-    parser_obj.add_argument('-s', '--scale', help='Override map scale in nomk2coord', dest='scale', choices=['1m', '500k', '200k', '100k', '50k', '25k', '10k', '5k', '2k' ])
+    parser_obj.add_argument('-s', '--scale', help='Override map scale in nomk2coord, map scale in batch (all scales by default)', dest='scale', choices=['1m', '500k', '200k', '100k', '50k', '25k', '10k', '5k', '2k' ])
+    parser_obj.add_argument('-b', '--batch', help='Transform coordinates or nomenclatures from file (- for stdin) record by record', metavar='FILE')
+    parser_obj.add_argument('-o', '--output', help='Output file of batch (default: stdout)', default='-', metavar='FILE')
+    parser_obj.add_argument('--input-format', help='Batch input format: text ("X Y" or nomenclature per line), csv (x,y or nomk columns), ndjson (default: %(default)s)', choices=stream.input_formats, default='text')
+    parser_obj.add_argument('--output-format', help='Batch output format (default: %(default)s)', choices=stream.output_formats, default='text')
+    parser_obj.add_argument('--scales', help='Comma separated scales of batch (default: all or --scale)')
+    parser_obj.add_argument('--serve', help='Serve JSON requests on HOST:PORT, PORT or unix:PATH (see nomk/server.py)', metavar='ADDRESS')
+    parser_obj.add_argument('--max-connections', help='Number of connections served at once (default: %(default)s)', type=int, default=server.MAX_CONNECTIONS)
+    parser_obj.add_argument('--build-table', help='Write table of all sheets of 1:1M - 1:100k (or --scales) for nomk.table.SheetTable', metavar='FILE')
+    parser_obj.add_argument('--stats', help='Print number of calls and latency percentiles of functions to stderr at exit (calls in worker processes are not counted)', action='store_true')
+    parser_obj.add_argument('--skip-errors', help='Report failed batch records to stderr and continue', action='store_true')
+    parser_obj.add_argument('-j', '--jobs', help='Number of processes in batch (default: %(default)s, 0 for number of CPUs)', type=int, default=1)
+    parser_obj.add_argument('--chunk-size', help='Number of points sent to process at once in batch (default: %(default)s)', type=int, default=parallel.DEFAULT_CHUNK_SIZE)
 
     args = parser_obj.parse_args()
 
+    if args.stats:
+        stats.enable()
+        atexit.register(lambda: print(stats.report(), file=sys.stderr))
+
+    if args.build_table is not None:
+        scales = table.DEFAULT_SCALES if args.scales is None else [scale.strip() for scale in args.scales.split(',')]
+        print('{} records'.format(table.build(args.build_table, scales)))
+        exit(0)
+
+    if args.serve is not None:
+        server.run(args.serve, args.max_connections)
+        exit(0)
+
     X = Y = None
     if args.coord2nomk:
         X = args.coord2nomk[0]
         Y = args.coord2nomk[1]
 
     if X is not None and Y is not None:
-        if X > 180.0 or X < -180.0 or Y > 90.0 or Y < -90.0:
-            exit('Coordintates out of bounds')
-        nomk, min_x, max_x, min_y, max_y = coord.coords_to_1m(X, Y)
-        print(u'1 : 1 000 000\t{}\t\t[{:.6f} {:.6f}, {:.6f} {:.6f}]'.format(nomk, min_x, min_y, max_x, max_y))
-        nomk, min_x, max_x, min_y, max_y = coord.coords_to_500k(X, Y)
-        print(u'1 : 500 000\t{}\t\t[{:.6f} {:.6f}, {:.6f} {:.6f}]'.format(nomk, min_x, min_y, max_x, max_y))
-        nomk, min_x, max_x, min_y, max_y = coord.coords_to_200k(X, Y)
-        print(u'1 : 200 000\t{}\t\t[{:.6f} {:.6f}, {:.6f} {:.6f}]'.format(nomk, min_x, min_y, max_x, max_y))
-        nomk, min_x, max_x, min_y, max_y = coord.coords_to_100k(X, Y)
-        print(u'1 : 100 000\t{}\t\t[{:.6f} {:.6f}, {:.6f} {:.6f}]'.format(nomk, min_x, min_y, max_x, max_y))
-        nomk, min_x, max_x, min_y, max_y = coord.coords_to_50k(X, Y)
-        print(u'1 : 50 000\t{}\t[{:.6f} {:.6f}, {:.6f} {:.6f}]'.format(nomk, min_x, min_y, max_x, max_y))
-        nomk, min_x, max_x, min_y, max_y = coord.coords_to_25k(X, Y)
-        print(u'1 : 25 000\t{}\t[{:.6f} {:.6f}, {:.6f} {:.6f}]'.format(nomk, min_x, min_y, max_x, max_y))
-        nomk, min_x, max_x, min_y, max_y = coord.coords_to_10k(X, Y)
-        print(u'1 : 10 000\t{}\t[{:.6f} {:.6f}, {:.6f} {:.6f}]'.format(nomk, min_x, min_y, max_x, max_y))
-        nomk, min_x, max_x, min_y, max_y = coord.coords_to_5k(X, Y)
-        print(u'1 : 5 000\t{}\t[{:.6f} {:.6f}, {:.6f} {:.6f}]'.format(nomk, min_x, min_y, max_x, max_y))
-        nomk, min_x, max_x, min_y, max_y = coord.coords_to_2k(X, Y)
-        print(u'1 : 2 000\t{}\t[{:.6f} {:.6f}, {:.6f} {:.6f}]'.format(nomk, min_x, min_y, max_x, max_y))
-        
+        if X >= 180.0 or X < -180.0 or Y > 90.0 or Y < -90.0:
+            exit('Coordinates out of bounds')
+        captions = [
+            ('1m', u'1 : 1 000 000\t{}\t\t'),
+            ('500k', u'1 : 500 000\t{}\t\t'),
+            ('200k', u'1 : 200 000\t{}\t\t'),
+            ('100k', u'1 : 100 000\t{}\t\t'),
+            ('50k', u'1 : 50 000\t{}\t'),
+            ('25k', u'1 : 25 000\t{}\t'),
+            ('10k', u'1 : 10 000\t{}\t'),
+            ('5k', u'1 : 5 000\t{}\t'),
+            ('2k', u'1 : 2 000\t{}\t'),
+        ]
+        sheets = coord.coords_to_all(X, Y)
+        for scale, caption in captions:
+            nomk, min_x, max_x, min_y, max_y = sheets[scale]
+            print((caption + u'[{:.6f} {:.6f}, {:.6f} {:.6f}]').format(nomk, min_x, min_y, max_x, max_y))
+
+    if args.batch is not None:
+        jobs = args.jobs if args.jobs > 0 else None
+        if args.scales is not None:
+            scales = [scale.strip() for scale in args.scales.split(',')]
+        else:
+            scales = [args.scale] if args.scale is not None else None
+        errors = []
+        def on_error(error):
+            errors.append(error.line)
+            report_error(error)
+
+        input_stream = open_stream(args.batch, 'r')
+        output_stream = open_stream(args.output, 'w')
+        try:
+            records = stream.read_records(input_stream, args.input_format)
+            rows = stream.convert(records, scales, args.skip_errors, on_error, jobs, args.chunk_size)
+            stream.write_rows(rows, output_stream, args.output_format)
+        except stream.RecordError as e:
+            exit(str(e))
+        finally:
+            output_stream.close()
+            input_stream.close()
+        if errors:
+            report_error('{} records failed'.format(len(errors)))
+        exit(0)
+
     if args.nomk is not None:
         scale, parts, is_south = parser.parse(args.nomk, args.scale)
         if scale == '1m':
@@ -1,10 +1,13 @@
-from typing import Tuple, List
+from typing import Iterable, Iterator, Tuple, List
 
 from . import parser
 from . import text
 from . import coord
+from . import sheetid
 
 
+# Tables of functions by scale are public API kept for existing callers,
+# functions of this module do not use them
 nomk_parse_funcs = {
     '1m': parser.parse1m,
     '500k': parser.parse500k,
@@ -42,42 +45,152 @@ coords_to_funcs = {
 }
 
 
-def get_neighbors_for_nomk(nomk: str, scale: str = None) -> Tuple[str]:
-    if scale is None:
-        scale, parts, is_south = parser.parse(nomk)
-    else:
-        parts, is_south = nomk_parse_funcs[scale](nomk)
+def _signed_row(is_south: bool, row: int) -> int:
+    # Rows of both hemispheres in one axis: 0 is the first row north of equator
+    return -row - 1 if is_south else row
 
-    _, min_x, max_x, min_y, max_y = nomk_text_funcs[scale](*parts, is_south)
 
-    width = max_x - min_x
-    height = max_y - min_y
-    center_x = min_x + width / 2
-    center_y = min_y + height / 2
+def get_neighbor_ids(sheet_id: int) -> Tuple[int]:
+    """Returns identifiers of sheets around the sheet in the same scale.
 
-    neighbor_centers = [
-        (center_x - width, center_y - height),
-        (center_x - width, center_y),
-        (center_x - width, center_y + height),
-        (center_x, center_y - height),
-        (center_x, center_y + height),
-        (center_x + width, center_y - height),
-        (center_x + width, center_y),
-        (center_x + width, center_y + height),
-    ]
+        Neighbors are found by grid indexes, so no coordinates are computed.
+        Columns wrap around 180 meridian, polar composite sheets are returned
+        once and rows which are not supported by the scale are skipped.
+    """
+    scale, is_south, row, col = sheetid.to_grid(sheet_id)
+    parts = sheetid.get_parts_count(scale)
+    col_count = 60 * parts
 
-    nomks = []
-    for x, y in neighbor_centers:
-        nomen, _, _, _, _ = coords_to_funcs[scale](x, y)
-        nomks.append(nomen)
+    if scale == '1m' and row >= sheetid.POLE_ROW:
+        # Polar cap borders with all sheets of the last row
+        row = sheetid.POLE_ROW - 1
+        return tuple(dict.fromkeys(
+            sheetid.from_grid(scale, is_south, row, col) for col in range(col_count)))
 
-    return tuple(nomks)
+    # Last row supported by the scale, the 1:1M polar cap is above it
+    last_row = sheetid.POLE_ROW if scale == '1m' else sheetid.POLE_ROW * parts - 1
+    width = sheetid.get_polar_width(scale, row // parts)
+    signed_row = _signed_row(is_south, row)
 
+    neighbors = {}
+    for delta in (-1, 0, 1):
+        row_is_south = signed_row + delta < 0
+        neighbor_row = -(signed_row + delta) - 1 if row_is_south else signed_row + delta
+        if neighbor_row > last_row:
+            continue
+        for neighbor_col in range(col - 1, col + width + 1):
+            if delta == 0 and col <= neighbor_col < col + width:
+                continue
+            neighbor_id = sheetid.from_grid(scale, row_is_south, neighbor_row, 
+                neighbor_col % col_count)
+            if neighbor_id != sheet_id:
+                neighbors[neighbor_id] = None
 
-def get_neighbors(nomks: List[str], scale: str = None) -> Tuple[str]:
-    neighbor_nomks = ()
+    return tuple(neighbors)
+
+
+def _nomk_to_id(nomk: str, scale: str = None) -> int:
+    return sheetid.from_nomk(nomk, '' if scale is None else scale)
 
-    for nomk in nomks:
-        neighbor_nomks += get_neighbors_for_nomk(nomk, scale)
 
-    return tuple(set(neighbor_nomks).difference(nomks))
+def get_neighbors_for_nomk(nomk: str, scale: str = None) -> Tuple[str]:
+    neighbor_ids = get_neighbor_ids(_nomk_to_id(nomk, scale))
+    return tuple(sheetid.to_nomk(neighbor_id)[0] for neighbor_id in neighbor_ids)
+
+
+def get_neighbors(nomks: List[str], scale: str = None) -> Tuple[str]:
+    sheet_ids = set(_nomk_to_id(nomk, scale) for nomk in nomks)
+
+    neighbor_ids = set()
+    for sheet_id in sheet_ids:
+        neighbor_ids.update(get_neighbor_ids(sheet_id))
+
+    return tuple(sheetid.to_nomk(neighbor_id)[0] 
+        for neighbor_id in sorted(neighbor_ids.difference(sheet_ids)))
+
+
+def k_ring_ids(sheet_ids: Iterable[int], k: int) -> set:
+    """Returns identifiers of sheets not more than k steps away from any of
+        the sheets, including the sheets themselves
+    """
+    visited = set(sheet_ids)
+    frontier = visited
+    for _ in range(k):
+        next_frontier = set()
+        for sheet_id in frontier:
+            next_frontier.update(get_neighbor_ids(sheet_id))
+        frontier = next_frontier.difference(visited)
+        if not frontier:
+            break
+        visited.update(frontier)
+    return visited
+
+
+def k_ring(nomks: Iterable[str], k: int, scale: str = None) -> Tuple[str]:
+    """Returns nomenclatures of sheets not more than k steps away from any of
+        the sheets, including the sheets themselves
+    """
+    sheet_ids = k_ring_ids((_nomk_to_id(nomk, scale) for nomk in nomks), k)
+    return tuple(sheetid.to_nomk(sheet_id)[0] for sheet_id in sorted(sheet_ids))
+
+
+def _check_scales(parent_scale: str, child_scale: str) -> int:
+    # Returns number of child sheets per side of parent sheet
+    parent_parts = sheetid.get_parts_count(parent_scale)
+    child_parts = sheetid.get_parts_count(child_scale)
+    if child_parts < parent_parts or child_parts % parent_parts != 0:
+        raise Exception('Scale {} is not smaller than {}'.format(parent_scale, child_scale))
+    return child_parts // parent_parts
+
+
+def get_parent_id(sheet_id: int, scale: str) -> int:
+    """Returns identifier of sheet of the scale which contains the sheet.
+
+        Composite polar sheets are looked up by their first (western) part.
+    """
+    child_scale, is_south, row, col = sheetid.to_grid(sheet_id)
+    ratio = _check_scales(scale, child_scale)
+    return sheetid.from_grid(scale, is_south, row // ratio, col // ratio)
+
+
+def get_child_ids(sheet_id: int, scale: str) -> Iterator[int]:
+    """Yields identifiers of sheets of the scale inside the sheet in order 
+        of numbering: rows from the top of the map (from the equator in the 
+        southern hemisphere), columns from the west.
+
+        Composite polar sheets are yielded once. Nothing is yielded for 
+        latitudes which are not supported by the scale.
+    """
+    parent_scale, is_south, row, col = sheetid.to_grid(sheet_id)
+    ratio = _check_scales(parent_scale, scale)
+    parts = sheetid.get_parts_count(scale)
+    if scale != '1m' and row >= sheetid.POLE_ROW * sheetid.get_parts_count(parent_scale):
+        return
+    if parent_scale == '1m' and row >= sheetid.POLE_ROW:
+        # Polar cap is not divided
+        yield sheet_id
+        return
+
+    width = sheetid.get_polar_width(parent_scale, row // sheetid.get_parts_count(parent_scale))
+    rows = range(row * ratio, (row + 1) * ratio)
+    if not is_south:
+        rows = reversed(rows)
+    for child_row in rows:
+        child_col = col * ratio
+        end_col = (col + width) * ratio
+        while child_col < end_col:
+            yield sheetid.from_grid(scale, is_south, child_row, child_col)
+            child_col += sheetid.get_polar_width(scale, child_row // parts)
+
+
+def parent(nomk: str, scale: str) -> str:
+    """Returns nomenclature of sheet of the scale which contains the sheet"""
+    return sheetid.to_nomk(get_parent_id(sheetid.from_nomk(nomk), scale))[0]
+
+
+def children(nomk: str, scale: str) -> Iterator[str]:
+    """Yields nomenclatures of sheets of the scale inside the sheet (see 
+        get_child_ids)
+    """
+    for sheet_id in get_child_ids(sheetid.from_nomk(nomk), scale):
+        yield sheetid.to_nomk(sheet_id)[0]
@@ -0,0 +1,497 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Vectorized versions of coord.coords_to_* for arrays of points. Every
+# function takes arrays of longitudes and latitudes and returns the tuple
+# (nomk, min_x, max_x, min_y, max_y) of NumPy column arrays, computed in the
+# same way as the scalar functions in coord.py. Function text_to_bbox is 
+# the reverse: arrays of nomenclatures to bboxes of text.text_to_*.
+#
+# Example:
+#   from nomk import batch
+#   nomk, min_x, max_x, min_y, max_y = batch.coords_to_100k(xs, ys)
+#   scale, min_x, max_x, min_y, max_y, error = batch.text_to_bbox(nomks)
+
+import numpy as np
+from . import grid, parser, sheetid, util
+
+_letters = np.array(util.letters)
+_ru_letters = np.array(util.ru_letters)
+_ru_letters_low = np.array([letter.lower() for letter in util.ru_letters])
+_ru_letters_small = np.array(util.ru_letters_small)
+_roman_figures = np.array(util.roman_figures)
+_row_ru = np.array([u'А,Б', u'В,Г'])
+_row_num = np.array([u'1,2', u'3,4'])
+_row_ru_small = np.array([u'а,б,в', u'г,д,е', u'ж,з,и'])
+
+
+def _prepare(x, y):
+    x, y = np.broadcast_arrays(np.atleast_1d(np.asarray(x, dtype=np.float64)), 
+        np.atleast_1d(np.asarray(y, dtype=np.float64)))
+    is_south = y < 0
+    mult = np.where(is_south, -1.0, 1.0)
+    return x, y, np.abs(y), is_south, mult
+
+def _check_lat(y, abs_y):
+    wrong = abs_y > 88.0
+    if wrong.any():
+        raise Exception('Unsupported latitude ({:.6f}) for this scale'.format(y[wrong][0]))
+
+def _join(*parts):
+    result = parts[0]
+    for part in parts[1:]:
+        result = np.char.add(result, part)
+    return result
+
+def _num(values, width):
+    return np.char.zfill(values.astype(np.int64).astype(str), width)
+
+def _merge(size, parts):
+    # parts is a list of (mask, strings) pairs which cover all items
+    dtype = max([values.dtype for _, values in parts], key=lambda dtype: dtype.itemsize)
+    result = np.empty(size, dtype=dtype)
+    for mask, values in parts:
+        result[mask] = values
+    return result
+
+def _label_row(row, rows, is_south):
+    # Row of the label in subdivision tables (see util.get_letter_*)
+    return np.where(is_south, row, rows - 1 - row)
+
+def _add_south(nomk, is_south):
+    return np.char.add(nomk, np.where(is_south, util.south_suffix(), ''))
+
+def _get_1m(x, abs_y):
+    col = np.floor(x / 6.0)
+    row = np.floor(abs_y / 4.0)
+    return (col + 31).astype(np.int64), row.astype(np.int64), col * 6.0, row * 4.0
+
+def _get_grid_pos(x, y, min_x, min_y, parts):
+    size_x = 6.0 / parts
+    size_y = 4.0 / parts
+
+    row = np.floor((y - min_y) / size_y)
+    col = np.floor(np.abs(x - min_x) / size_x)
+
+    min_x = min_x + col * size_x
+    min_y = min_y + row * size_y
+
+    return row.astype(np.int64), col.astype(np.int64), size_x, size_y, \
+        min_x, min_x + size_x, min_y, min_y + size_y
+
+def _bands(abs_y, double_max):
+    quad = abs_y > 76.0
+    if double_max:
+        double = (abs_y > 60.0) & (abs_y <= 76.0)
+    else:
+        double = (abs_y > 60.0) & (abs_y < 76.0)
+    return quad, double, ~(quad | double)
+
+def _100k_simple(x, abs_y, is_south):
+    col, row, min_x, min_y = _get_1m(x, abs_y)
+    row_100k, col_100k, _, _, min_x, _, min_y, _ = _get_grid_pos(x, abs_y, min_x, min_y, 12)
+    last_num = _label_row(row_100k, 12, is_south) * 12 + col_100k + 1
+    return _letters[row], col, last_num, min_x, min_y
+
+def _50k_simple(x, abs_y, is_south):
+    letter, number, last_number, min_x, min_y = _100k_simple(x, abs_y, is_south)
+    row_50k, col_50k, _, _, min_x_50k, _, min_y_50k, _ = _get_grid_pos(x, abs_y, min_x, min_y, 24)
+    return letter, number, last_number, row_50k, col_50k, min_x_50k, min_y_50k
+
+def _5k_simple(x, abs_y, is_south):
+    letter, number, last_number, min_x, min_y = _100k_simple(x, abs_y, is_south)
+    row_5k, col_5k, _, _, min_x_5k, _, min_y_5k, _ = _get_grid_pos(x, abs_y, min_x, min_y, 192)
+    last_num = _label_row(row_5k, 16, is_south) * 16 + col_5k + 1
+    return letter, number, last_number, last_num, min_x_5k, min_y_5k
+
+def coords_to_1m(x, y, alternative = False):
+    x, y, abs_y, is_south, mult = _prepare(x, y)
+    size = len(x)
+
+    row = np.floor(abs_y / 4.0)
+    min_y = row * 4.0
+    max_y = min_y + 4.0
+
+    pole = abs_y >= 88.0
+    quad = (abs_y < 88.0) & (abs_y > 76.0)
+    if alternative:
+        quad[:] = False
+    double = (abs_y < 76.0) & (abs_y > 60.0)
+    single = ~(pole | quad | double)
+
+    min_x = np.empty(size)
+    max_x = np.empty(size)
+    parts = []
+    for mask, width in ((quad, 4), (double, 2)):
+        col = np.floor((x[mask] + 180) / (6.0 * width))
+        min_x[mask] = col * 6.0 * width - 180.0
+        max_x[mask] = min_x[mask] + 6.0 * width
+        first = (col * width + 1).astype(np.int64)
+        col_str = _num(first, 2)
+        for i in range(1, width):
+            col_str = _join(col_str, ',', _num(first + i, 2))
+        parts.append((mask, col_str))
+
+    col = np.floor(x[single] / 6.0)
+    min_x[single] = col * 6.0
+    max_x[single] = min_x[single] + 6.0
+    parts.append((single, _num(col + 31, 2)))
+
+    nomk = _add_south(_join(_letters[np.minimum(row, 21).astype(np.int64)], '-', _merge(size, parts)), is_south)
+    nomk[pole] = 'Z'
+    min_x[pole] = -180.0
+    max_x[pole] = 180.0
+    min_y[pole] = 88.0
+    max_y[pole] = 90.0
+
+    return nomk, min_x, max_x, min_y * mult, max_y * mult
+
+def coords_to_500k(x, y):
+    x, y, abs_y, is_south, mult = _prepare(x, y)
+    _check_lat(y, abs_y)
+    size = len(x)
+
+    col, row, min_x, min_y = _get_1m(x, abs_y)
+    quad, double, single = _bands(abs_y, False)
+    max_x = np.empty(size)
+    parts = []
+
+    polar = quad | double
+    upper = abs_y >= min_y + 2.0
+    letter = _row_ru[_label_row(upper.astype(np.int64), 2, is_south)]
+    min_y = np.where(polar & upper, min_y + 2.0, min_y)
+
+    even = quad & (col % 2 == 0)
+    first = np.where(even, col - 1, col)
+    min_x = np.where(even, min_x - 6, min_x)
+    max_x[quad] = min_x[quad] + 12.0
+    parts.append((quad, _join(_num(first[quad], 2), '-', letter[quad], ',', 
+        _num(first[quad] + 1, 2), '-', letter[quad])))
+
+    max_x[double] = min_x[double] + 6.0
+    parts.append((double, _join(_num(col[double], 2), '-', letter[double])))
+
+    local_col = np.floor(np.abs(x[single] - min_x[single]) / 3.0)
+    local_row = np.floor((abs_y[single] - min_y[single]) / 2.0)
+    index = _label_row(local_row, 2, is_south[single]) * 2 + local_col
+    min_x[single] = min_x[single] + local_col * 3.0
+    min_y[single] = min_y[single] + local_row * 2.0
+    max_x[single] = min_x[single] + 3.0
+    parts.append((single, _join(_num(col[single], 2), '-', _ru_letters[index.astype(np.int64)])))
+
+    max_y = min_y + 2.0
+
+    nomk = _add_south(_join(_letters[row], '-', _merge(size, parts)), is_south)
+    return nomk, min_x, max_x, min_y * mult, max_y * mult
+
+def coords_to_200k(x, y):
+    x, y, abs_y, is_south, mult = _prepare(x, y)
+    _check_lat(y, abs_y)
+
+    col, row, min1_x, min_y = _get_1m(x, abs_y)
+    size_x = 6.0 / 6
+    size_y = 4.0 / 6
+
+    row_200k = np.floor((abs_y - min_y) / size_y).astype(np.int64)
+    col_200k = np.floor(np.abs(x - min1_x) / size_x).astype(np.int64)
+    label_row = _label_row(row_200k, 6, is_south)
+
+    quad, double, single = _bands(abs_y, True)
+    width = np.select([quad, double], [3, 2], 1)
+    begin_col = col_200k // width * width
+
+    min_x = min1_x + begin_col
+    max_x = min_x + width * size_x
+
+    letter = _roman_figures[label_row * 6 + begin_col]
+    for i in range(1, 3):
+        letter = np.where(width > i, _join(letter, ',', _roman_figures[label_row * 6 + np.minimum(begin_col + i, 5)]), letter)
+
+    min_y = min_y + row_200k * size_y
+    max_y = min_y + size_y
+
+    nomk = _add_south(_join(_letters[row], '-', _num(col, 2), '-', letter), is_south)
+    return nomk, min_x, max_x, min_y * mult, max_y * mult
+
+def coords_to_100k(x, y):
+    x, y, abs_y, is_south, mult = _prepare(x, y)
+    _check_lat(y, abs_y)
+
+    col, row, min1_x, min1_y = _get_1m(x, abs_y)
+    row_100k, col_100k, size_x, _, min_x, max_x, min_y, max_y = _get_grid_pos(x, abs_y, min1_x, min1_y, 12)
+    label_row = _label_row(row_100k, 12, is_south)
+
+    quad, double, _ = _bands(abs_y, True)
+    width = np.select([quad, double], [4, 2], 1)
+    begin_col = col_100k // width * width
+
+    polar = width > 1
+    min_x = np.where(polar, min1_x + begin_col * size_x, min_x)
+    max_x = np.where(polar, min_x + width * size_x, max_x)
+
+    letter_str = _num(label_row * 12 + begin_col + 1, 3)
+    for i in range(1, 4):
+        letter_str = np.where(width > i, _join(letter_str, ',', _num(label_row * 12 + begin_col + i + 1, 3)), letter_str)
+
+    nomk = _add_south(_join(_letters[row], '-', _num(col, 2), '-', letter_str), is_south)
+    return nomk, min_x, max_x, min_y * mult, max_y * mult
+
+def coords_to_50k(x, y):
+    x, y, abs_y, is_south, mult = _prepare(x, y)
+    _check_lat(y, abs_y)
+    size = len(x)
+
+    letter, number, last_number, min_x, min_y = _100k_simple(x, abs_y, is_south)
+    row_50k, col_50k, size_x_50k, _, min_x, max_x, min_y_50k, max_y_50k = _get_grid_pos(x, abs_y, min_x, min_y, 24)
+    label_row = _label_row(row_50k, 2, is_south)
+
+    quad, double, single = _bands(abs_y, True)
+    letter_str = _row_ru[label_row]
+    even = quad & (last_number % 2 == 0)
+    first = np.where(even, last_number - 1, last_number)
+    min_x = np.where(even, min_x - size_x_50k * 2, min_x)
+    min_x = np.where((quad | double) & (col_50k % 2 != 0), min_x - size_x_50k, min_x)
+    max_x = np.select([quad, double], [min_x + size_x_50k * 4, min_x + size_x_50k * 2], max_x)
+
+    parts = [
+        (quad, _join(_num(first[quad], 3), '-', letter_str[quad], ',', 
+            _num(first[quad] + 1, 3), '-', letter_str[quad])),
+        (double, _join(_num(last_number[double], 3), '-', letter_str[double])),
+        (single, _join(_num(last_number[single], 3), '-', 
+            _ru_letters[label_row[single] * 2 + col_50k[single]])),
+    ]
+
+    nomk = _add_south(_join(letter, '-', _num(number, 2), '-', _merge(size, parts)), is_south)
+    return nomk, min_x, max_x, min_y_50k * mult, max_y_50k * mult
+
+def coords_to_25k(x, y):
+    x, y, abs_y, is_south, mult = _prepare(x, y)
+    _check_lat(y, abs_y)
+    size = len(x)
+
+    letter, number, last_number, row_50k, col_50k, min_x, min_y = _50k_simple(x, abs_y, is_south)
+    row_25k, col_25k, size_x_25k, _, min_x, max_x, min_y_25k, max_y_25k = _get_grid_pos(x, abs_y, min_x, min_y, 48)
+    label_row_50k = _label_row(row_50k, 2, is_south)
+    label_row = _label_row(row_25k, 2, is_south)
+    last_letter = _ru_letters[label_row_50k * 2 + col_50k]
+
+    quad, double, single = _bands(abs_y, True)
+    letter_str = _row_ru[label_row]
+    min_x = np.where(quad & (col_50k % 2 != 0), min_x - size_x_25k * 2, min_x)
+    min_x = np.where((quad | double) & (col_25k % 2 != 0), min_x - size_x_25k, min_x)
+    max_x = np.select([quad, double], [min_x + size_x_25k * 4, min_x + size_x_25k * 2], max_x)
+
+    parts = [
+        (quad, _join(_ru_letters[label_row_50k[quad] * 2], '-', np.char.lower(letter_str[quad]), ',', 
+            _ru_letters[label_row_50k[quad] * 2 + 1], '-', np.char.lower(letter_str[quad]))),
+        (double, _join(last_letter[double], '-', np.char.lower(letter_str[double]))),
+        (single, _join(last_letter[single], '-', _ru_letters_low[label_row[single] * 2 + col_25k[single]])),
+    ]
+
+    nomk = _add_south(_join(letter, '-', _num(number, 2), '-', _num(last_number, 3), '-', 
+        _merge(size, parts)), is_south)
+    return nomk, min_x, max_x, min_y_25k * mult, max_y_25k * mult
+
+def coords_to_10k(x, y):
+    x, y, abs_y, is_south, mult = _prepare(x, y)
+    _check_lat(y, abs_y)
+    size = len(x)
+
+    letter, number, last_number, row_50k, col_50k, min_x, min_y = _50k_simple(x, abs_y, is_south)
+    row_25k, col_25k, _, _, min_x, _, min_y, _ = _get_grid_pos(x, abs_y, min_x, min_y, 48)
+    row_10k, col_10k, size_x_10k, _, min_x, max_x, min_y_10k, max_y_10k = _get_grid_pos(x, abs_y, min_x, min_y, 96)
+    letter2 = _ru_letters[_label_row(row_50k, 2, is_south) * 2 + col_50k]
+    label_row_25k = _label_row(row_25k, 2, is_south)
+    label_row = _label_row(row_10k, 2, is_south)
+    last_letter = _ru_letters_low[label_row_25k * 2 + col_25k]
+
+    quad, double, single = _bands(abs_y, True)
+    letter_str = _row_num[label_row]
+    min_x = np.where(quad & (col_25k % 2 != 0), min_x - size_x_10k * 2, min_x)
+    min_x = np.where((quad | double) & (col_10k % 2 != 0), min_x - size_x_10k, min_x)
+    max_x = np.select([quad, double], [min_x + size_x_10k * 4, min_x + size_x_10k * 2], max_x)
+
+    parts = [
+        (quad, _join(_ru_letters_low[label_row_25k[quad] * 2], '-', letter_str[quad], ',', 
+            _ru_letters_low[label_row_25k[quad] * 2 + 1], '-', letter_str[quad])),
+        (double, _join(last_letter[double], '-', letter_str[double])),
+        (single, _join(last_letter[single], '-', (label_row[single] * 2 + col_10k[single] + 1).astype(str))),
+    ]
+
+    nomk = _add_south(_join(letter, '-', _num(number, 2), '-', _num(last_number, 3), '-', letter2, '-', 
+        _merge(size, parts)), is_south)
+    return nomk, min_x, max_x, min_y_10k * mult, max_y_10k * mult
+
+def coords_to_5k(x, y):
+    x, y, abs_y, is_south, mult = _prepare(x, y)
+    _check_lat(y, abs_y)
+
+    letter, number, last_number, min_x, min_y = _100k_simple(x, abs_y, is_south)
+    row_5k, col_5k, size_x_5k, _, min_x_5k, max_x_5k, min_y_5k, max_y_5k = _get_grid_pos(x, abs_y, min_x, min_y, 192)
+    label_row = _label_row(row_5k, 16, is_south)
+
+    quad, double, _ = _bands(abs_y, True)
+    width = np.select([quad, double], [4, 2], 1)
+    begin_col = col_5k // width * width
+
+    polar = width > 1
+    min_x = np.where(polar, min_x + begin_col * size_x_5k, min_x_5k)
+    max_x = np.where(polar, min_x + width * size_x_5k, max_x_5k)
+
+    letter_str = _num(label_row * 16 + begin_col + 1, 3)
+    for i in range(1, 4):
+        letter_str = np.where(width > i, _join(letter_str, ',', _num(label_row * 16 + begin_col + i + 1, 3)), letter_str)
+
+    nomk = _add_south(_join(letter, '-', _num(number, 2), '-', _num(last_number, 3), '-(', letter_str, ')'), 
+        is_south)
+    return nomk, min_x, max_x, min_y_5k * mult, max_y_5k * mult
+
+def coords_to_2k(x, y):
+    x, y, abs_y, is_south, mult = _prepare(x, y)
+    _check_lat(y, abs_y)
+    size = len(x)
+
+    letter, number, last_number, last_letter, min_x, min_y = _5k_simple(x, abs_y, is_south)
+    row_2k, col_2k, size_x_2k, _, min_x_2k, max_x_2k, min_y_2k, max_y_2k = _get_grid_pos(x, abs_y, min_x, min_y, 576)
+    label_row = _label_row(row_2k, 3, is_south)
+
+    polar = abs_y > 60.0
+    min_x = np.where(polar, min_x_2k - size_x_2k * col_2k, min_x_2k)
+    max_x = np.where(polar, min_x + size_x_2k * 3, max_x_2k)
+
+    single = ~polar
+    parts = [
+        (polar, _row_ru_small[label_row[polar]]),
+        (single, _ru_letters_small[label_row[single] * 3 + col_2k[single]]),
+    ]
+
+    nomk = _add_south(_join(letter, '-', _num(number, 2), '-', _num(last_number, 3), '-(', 
+        _num(last_letter, 3), ')-', _merge(size, parts)), is_south)
+    return nomk, min_x, max_x, min_y_2k * mult, max_y_2k * mult
+
+coords_to_funcs = {
+    '1m': coords_to_1m,
+    '500k': coords_to_500k,
+    '200k': coords_to_200k,
+    '100k': coords_to_100k,
+    '50k': coords_to_50k,
+    '25k': coords_to_25k,
+    '10k': coords_to_10k,
+    '5k': coords_to_5k,
+    '2k': coords_to_2k,
+}
+
+def coords_to(scale, x, y):
+    """Transforms arrays of coordinates to nomenclatures of the scale
+
+        Returns tuple of arrays (nomk, min_x, max_x, min_y, max_y)
+    """
+    return coords_to_funcs[scale](x, y)
+
+# Columns of tokenized nomenclature: scale index in sheetid.scales (-1 if 
+# failed to parse), hemisphere, row of 1:1 000 000 sheet, zone - 1 and 
+# indexes in subdivision tables of every level (see sheetid.levels)
+_TOKEN_SIZE = 4 + len(sheetid.LEVEL_SHIFTS)
+
+def _tokenize(nomk_str, scale):
+    scale, parts, is_south = parser.parse(nomk_str, scale)
+    zone = parts[1] - 1
+    if zone < 0 or zone >= 60:
+        raise Exception('Unsupported zone {}'.format(parts[1]))
+    token = [sheetid.scales.index(scale), int(is_south), util.letters.index(parts[0]), zone]
+    for level_parts, kind, label in zip(sheetid.levels[scale], sheetid.labels[scale], parts[2:]):
+        try:
+            index = sheetid._label_to_index(kind, label)
+        except ValueError:
+            index = -1
+        if index < 0 or index >= level_parts * level_parts:
+            raise Exception('Unsupported sheet part {}'.format(label))
+        token.append(index)
+    return token
+
+def tokenize(nomks, scale = ''):
+    """Parses array of nomenclatures to integer array of shape (N, 8): scale 
+        index in sheetid.scales (-1 if failed), hemisphere, row of 1:1 000 000
+        sheet, zone - 1 and indexes of levels. Every distinct string is 
+        parsed once.
+    """
+    nomks = np.atleast_1d(np.asarray(nomks, dtype=str))
+    unique, inverse = np.unique(nomks, return_inverse=True)
+    tokens = np.zeros((len(unique), _TOKEN_SIZE), dtype=np.int64)
+    for i, nomk_str in enumerate(unique.tolist()):
+        try:
+            token = _tokenize(nomk_str, scale)
+        except Exception:
+            tokens[i, 0] = -1
+            continue
+        tokens[i, :len(token)] = token
+    return tokens[inverse.reshape(-1)]
+
+def _tokens_to_bbox(tokens, scale):
+    # Global grid position, then the same integer bbox as grid.get_units
+    row_1m = tokens[:, 2]
+    row = row_1m.copy()
+    col = tokens[:, 3].copy()
+    for level, parts in enumerate(sheetid.levels[scale]):
+        index = tokens[:, 4 + level]
+        local_row = np.where(tokens[:, 1] == 1, index // parts, parts - 1 - index // parts)
+        row = row * parts + local_row
+        col = col * parts + index % parts
+
+    double_width, quad_width = grid.polar_widths[scale]
+    width = np.select([row_1m >= 19, row_1m >= 15], [quad_width, double_width], 1)
+    col = col // width * width
+
+    step = grid.get_step(scale)
+    min_col = col * step
+    min_row = row * step
+    return min_col * 6.0 / grid.UNITS - 180.0, (min_col + width * step) * 6.0 / grid.UNITS - 180.0, \
+        min_row * 4.0 / grid.UNITS, (min_row + step) * 4.0 / grid.UNITS
+
+def text_to_bbox(nomks, scale = ''):
+    """Transforms array of nomenclatures to bboxes without building 
+        nomenclature strings. Scale is detected for every item if not set.
+
+        Returns tuple of arrays (scale, min_x, max_x, min_y, max_y, error) 
+        with the values of text.text_to_*. Error is True for items failed to
+        parse, their scale is empty and coordinates are NaN.
+    """
+    tokens = tokenize(nomks, scale)
+    size = len(tokens)
+    min_x = np.full(size, np.nan)
+    max_x = np.full(size, np.nan)
+    min_y = np.full(size, np.nan)
+    max_y = np.full(size, np.nan)
+    scales = np.full(size, '', dtype='<U4')
+
+    for index in np.unique(tokens[:, 0]):
+        if index < 0:
+            continue
+        mask = tokens[:, 0] == index
+        scale_name = sheetid.scales[index]
+        min_x[mask], max_x[mask], min_y[mask], max_y[mask] = _tokens_to_bbox(tokens[mask], scale_name)
+        scales[mask] = scale_name
+
+    mult = np.where(tokens[:, 1] == 1, -1.0, 1.0)
+    return scales, min_x, max_x, min_y * mult, max_y * mult, tokens[:, 0] < 0
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Optional caches for repeated lookups:
+#   text_to_bbox(nomk_str) - parser.parse + text.text_to_* by nomenclature
+#   coords_to(x, y, scale) - coord.coords_to_* keyed by the cell of grid of point
+#   sheet_to_nomk(sheet_id) - sheetid.to_nomk keyed by sheet identifier, its
+#                             items are separate from coords_to ones, but
+#                             share capacity and counters of coords_cache
+#
+# Example:
+#   from nomk import cache
+#   cache.warm(['N-37-027', 'N-37-028'])
+#   scale, min_x, max_x, min_y, max_y = cache.text_to_bbox('N-37-027')
+#   print(cache.stats())
+
+import threading
+from collections import OrderedDict
+from . import coord, grid, parser, sheetid, text
+
+class LRUCache(object):
+    """Thread safe dictionary with limited size. Least recently used items 
+        are evicted first.
+    """
+    def __init__(self, max_size = 65536):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default = None):
+        with self._lock:
+            try:
+                value = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            self._evict()
+
+    def get_or_compute(self, key, func, *args):
+        with self._lock:
+            try:
+                value = self._items[key]
+                self._items.move_to_end(key)
+                self.hits += 1
+                return value
+            except KeyError:
+                self.misses += 1
+
+        # Compute without lock, other threads can use cache meanwhile
+        value = func(*args)
+        self.put(key, value)
+        return value
+
+    def resize(self, max_size):
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._items),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _evict(self):
+        while len(self._items) > self.max_size:
+            self._items.popitem(last = False)
+            self.evictions += 1
+
+
+text_cache = LRUCache()
+coords_cache = LRUCache()
+
+def _text_to_bbox(nomk_str, scale):
+    scale, parts, is_south = parser.parse(nomk_str, scale)
+    return getattr(text, 'text_to_' + scale)(*parts, is_south)
+
+def text_to_bbox(nomk_str, scale = ''):
+    """Returns cached result of text.text_to_* (scale, min_x, max_x, min_y, max_y)
+        for nomenclature string. Raises exception if not parsed.
+    """
+    return text_cache.get_or_compute((nomk_str, scale), _text_to_bbox, nomk_str, scale)
+
+def _coords_to(x, y, scale):
+    return getattr(coord, 'coords_to_' + scale)(x, y)
+
+def coords_to(x, y, scale):
+    """Returns cached result of coord.coords_to_* (nomk, min_x, max_x, min_y, max_y).
+        Cache is keyed by the cell of grid of the scale which contains point 
+        (a part of joined polar sheet), so all points of the cell share one 
+        item. Points near edges of cells (grid.near_edge) are not cached, 
+        coords_to_* can return other sheets for them.
+    """
+    if grid.near_edge(x, y, scale):
+        return _coords_to(x, y, scale)
+    key = (scale,) + grid.locate(x, y, scale)
+    return coords_cache.get_or_compute(key, _coords_to, x, y, scale)
+
+def sheet_to_nomk(sheet_id):
+    """Returns cached result of sheetid.to_nomk for sheet identifier. Items
+        are keyed by identifiers in coords_cache, coords_to never reads them.
+    """
+    return coords_cache.get_or_compute(sheet_id, sheetid.to_nomk, sheet_id)
+
+def warm(nomks, scale = ''):
+    """Fills caches with sheets from list of nomenclatures. 
+        Returns count of sheets which failed to parse.
+    """
+    failed = 0
+    for nomk_str in nomks:
+        try:
+            scale_detected, parts, is_south = parser.parse(nomk_str, scale)
+            bbox = getattr(text, 'text_to_' + scale_detected)(*parts, is_south)
+            scale_detected, is_south, row, col = sheetid.to_grid(
+                sheetid.from_parts(scale_detected, parts, is_south))
+        except Exception:
+            failed += 1
+            continue
+        text_cache.put((nomk_str, scale), bbox)
+        min_col, max_col, min_row, max_row = grid.get_units(scale_detected, row, col)
+        step = grid.get_step(scale_detected)
+        for col in range(min_col // step, max_col // step):
+            key = (scale_detected, is_south, row, col)
+            if key not in coords_cache:
+                min_x, max_x, min_y, max_y = grid.to_degrees(col * step, (col + 1) * step, 
+                    row * step, (row + 1) * step, is_south)
+                coords_cache.put(key, _coords_to((min_x + max_x) / 2, (min_y + max_y) / 2, scale_detected))
+    return failed
+
+def stats():
+    """Returns counters of caches"""
+    return {
+        'text': text_cache.stats(),
+        'coords': coords_cache.stats(),
+    }
+
+def clear():
+    text_cache.clear()
+    coords_cache.clear()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Index of catalog of sheets of mixed scales. Finds catalog sheets which 
+# contain a point by dictionary lookups of the point sheet in every scale 
+# of the catalog instead of testing bboxes of all sheets.
+#
+# Example:
+#   from nomk import catalog
+#   index = catalog.CatalogIndex(['N-37', 'N-37-027', 'N-37-027-В-в-3'])
+#   index.query(37.01, 55.01)  # ['N-37', 'N-37-027', 'N-37-027-В-в-3']
+
+import sys
+from . import coord, grid, sheetid
+
+class CatalogIndex(object):
+    """Catalog sheets keyed by sheet identifiers (see sheetid), which encode
+        grid cell of the sheet in every level of hierarchy. Every sheet has a 
+        value, the nomenclature by default. Equal sheets keep all values.
+    """
+    def __init__(self, nomks = None):
+        # scale -> sheet identifier -> list of values
+        self._sheets = {}
+        self.errors = []
+        if nomks is not None:
+            self.add_many(nomks)
+
+    def __len__(self):
+        return sum(len(values) for sheets in self._sheets.values() for values in sheets.values())
+
+    def add(self, nomk_str, value = None, scale = ''):
+        """Adds sheet, returns its identifier. Raises exception if not parsed."""
+        sheet_id = sheetid.from_nomk(nomk_str, scale)
+        sheets = self._sheets.setdefault(sheetid.get_scale(sheet_id), {})
+        sheets.setdefault(sheet_id, []).append(nomk_str if value is None else value)
+        return sheet_id
+
+    def add_many(self, nomks, scale = ''):
+        """Adds sheets from iterable of nomenclatures or (nomenclature, value)
+            pairs. Nomenclatures which failed to parse are kept in errors as
+            (nomenclature, message). Returns number of failed ones.
+        """
+        failed = 0
+        for item in nomks:
+            nomk_str, value = (item, None) if isinstance(item, str) else item
+            try:
+                self.add(nomk_str, value, scale)
+            except Exception as e:
+                self.errors.append((nomk_str, str(e)))
+                failed += 1
+        return failed
+
+    def scales(self):
+        """Returns scales of catalog from 1:1M to 1:2000"""
+        return [scale for scale in sheetid.scales if scale in self._sheets]
+
+    def query(self, x, y):
+        """Returns values of catalog sheets which contain the sheet of point 
+            which coord.coords_to_* returns, from the smallest scale to the 
+            largest one. On 60 and 76 degrees it is a part of joined sheet.
+        """
+        result = []
+        for scale in sheetid.scales:
+            sheets = self._sheets.get(scale)
+            if sheets is None or (abs(y) > 88.0 and scale != '1m'):
+                # Latitudes above 88 are supported by 1:1M only
+                continue
+            sheet_id = self._sheet_id(x, y, scale)
+            values = sheets.get(sheet_id) if sheet_id is not None else None
+            if values is not None:
+                result.extend(values)
+        return result
+
+    def _sheet_id(self, x, y, scale):
+        if not grid.near_edge(x, y, scale):
+            return sheetid.from_coords(x, y, scale)
+        # coords_to_* can round the point to the next sheet or return a 
+        # sheet of row W on 88 degrees, which is not in catalog
+        try:
+            return sheetid.from_nomk(getattr(coord, 'coords_to_' + scale)(x, y)[0], scale)
+        except Exception:
+            return None
+
+    def query_many(self, points):
+        """Returns list of query results for iterable of (x, y) points"""
+        return [self.query(x, y) for x, y in points]
+
+    def memory_report(self):
+        """Returns number of sheets and approximate size in bytes of index
+            structures (dictionaries, identifiers, lists) and values per scale
+        """
+        report = {}
+        for scale in self.scales():
+            sheets = self._sheets[scale]
+            index_bytes = sys.getsizeof(sheets)
+            values_bytes = 0
+            count = 0
+            for sheet_id, values in sheets.items():
+                index_bytes += sys.getsizeof(sheet_id) + sys.getsizeof(values)
+                values_bytes += sum(sys.getsizeof(value) for value in values)
+                count += len(values)
+            report[scale] = {
+                'sheets': count,
+                'keys': len(sheets),
+                'index_bytes': index_bytes,
+                'values_bytes': values_bytes,
+            }
+        report['total'] = dict((key, sum(item[key] for item in report.values())) 
+            for key in ('sheets', 'keys', 'index_bytes', 'values_bytes'))
+        return report
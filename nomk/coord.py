@@ -22,487 +22,292 @@
 #
 ################################################################################
 
+# Coordinates to nomenclature. Every scale is described by Scale descriptor,
+# one generic resolver interprets descriptors and coords_to_* functions are 
+# thin wrappers of it.
+#
+# Example:
+#   from nomk import coord
+#   nomk, min_x, max_x, min_y, max_y = coord.coords_to_100k(37.61556, 55.75222)
+
 import math
+from collections import namedtuple
 from . import util
 
-def get_1m(x, y):
-    col = int(math.floor(x / 6.0))
-    min_x = col * 6.0
-    row = int(math.floor(y / 4.0))
-    min_y = math.floor(row * 4.0)
-
-    return col + 31, row, min_x, min_y
-
-def coords_to_1m(x, y, alternative = False):
-    mult = 1
-    if y < 0:
-        mult = -1
-
-    abs_y = abs(y)
-
-    if abs_y >= 88.0:
-        return 'Z', -180.0, 180.0, 88.0 * mult, 90.0 * mult
-
-    row = int(math.floor(abs(y) / 4.0))
-    min_y = math.floor(row * 4.0)
-
-    col_str = ''
-    
-    max_y = min_y + 4.0
-    min_x = max_x = 0.0
-
-    if abs_y < 88.0 and abs_y > 76.0 and alternative == False: # Create quad sheets
-        new_x = x + 180
-        col = int(math.floor(new_x / 24.0))
-        min_x = col * 24.0 - 180.0
-        col = col * 4
-        max_x = min_x
-
-        for i in range(4):
-            if col_str == '':
-                col_str = '{:02d}'.format(col + 1 + i)
-            else: 
-                col_str = col_str + ',{:02d}'.format(col + 1 + i)
-            max_x = max_x + 6.0
-
-    elif abs_y < 76.0 and abs_y > 60.0: # Create double sheets    
-        new_x = x + 180    
-        col = int(math.floor(new_x / 12.0))
-        min_x = col * 12.0 - 180.0
-        col = col * 2
-        max_x = min_x
-
-        for i in range(2):
-            if col_str == '':
-                col_str = '{:02d}'.format(col + 1 + i)
-            else: 
-                col_str = col_str + ',{:02d}'.format(col + 1 + i)
-            max_x = max_x + 6.0
-
+# Declarative description of sheets of the scale:
+#   parent        - scale of sheet which is divided to sheets of the scale
+#   parts         - number of sheets along the side of parent sheet
+#   label         - function (col, row, is_south) of label in parent sheet,
+#                   rows are counted from equator
+#   label_format  - format of label in nomenclature (zone for 1:1 000 000)
+#   brackets      - labels of the scale are enclosed in brackets
+#   bands         - sheets joined by longitude as tuples (min_lat, max_lat, 
+#                   is max_lat included, width), min_lat is excluded. The 
+#                   first band is above 76 degrees.
+Scale = namedtuple('Scale', 'parent parts label label_format brackets bands')
+
+_quad_76 = (76.0, 88.0, True, 4)
+_double_60 = (60.0, 76.0, True, 2)
+
+def _get_letter_ru_low(col, row, is_south):
+    return util.get_letter_ru(col, row, is_south).lower()
+
+scales = {
+    '1m': Scale(None, 1, None, '{:02d}', False, ((76.0, 88.0, False, 4), (60.0, 76.0, False, 2))),
+    '500k': Scale('1m', 2, util.get_letter_ru, '{}', False, (_quad_76, (60.0, 76.0, False, 2))),
+    '200k': Scale('1m', 6, util.get_letter_roman, '{}', False, ((76.0, 88.0, True, 3), _double_60)),
+    '100k': Scale('1m', 12, util.get_letter_num, '{:03d}', False, (_quad_76, _double_60)),
+    '50k': Scale('100k', 2, util.get_letter_ru, '{}', False, (_quad_76, _double_60)),
+    '25k': Scale('50k', 2, _get_letter_ru_low, '{}', False, (_quad_76, _double_60)),
+    '10k': Scale('25k', 2, util.get_letter_num_simple, '{}', False, (_quad_76, _double_60)),
+    '5k': Scale('100k', 16, util.get_letter_num2, '{:03d}', True, (_quad_76, _double_60)),
+    '2k': Scale('5k', 3, util.get_letter_ru_small, '{}', False, ((60.0, 88.0, True, 3),)),
+}
+
+def _get_chain(scale):
+    # Scales from the child of 1:1 000 000 to the scale
+    chain = []
+    while scales[scale].parent is not None:
+        chain.insert(0, scale)
+        scale = scales[scale].parent
+    return tuple(chain)
+
+def _compile(scale):
+    # Descriptor as (parts, size_x, size_y, labels, raw labels, brackets), 
+    # labels are indexed by [is_south][row * parts + col]
+    descriptor = scales[scale]
+    parts = descriptor.parts
+    raw_labels = tuple(tuple(descriptor.label_format.format(descriptor.label(col, row, is_south)) 
+        for row in range(parts) for col in range(parts)) for is_south in (False, True))
+    labels = raw_labels
+    if descriptor.brackets:
+        labels = tuple(tuple('(' + label + ')' for label in items) for items in raw_labels)
+    return parts, 6.0 / util.scale_parts[scale], 4.0 / util.scale_parts[scale], labels, raw_labels, descriptor.brackets
+
+_chains = dict((scale, _get_chain(scale)) for scale in scales)
+_compiled = dict((scale, _compile(scale)) for scale in scales if scales[scale].parent is not None)
+
+def _get_split(scale, width):
+    # Index in chain of the first level which divides joined sheets, 0 for zone
+    if util.scale_parts[scale] < width:
+        return 0
+    for index, level_scale in enumerate(_chains[scale]):
+        if util.scale_parts[scale] // util.scale_parts[level_scale] < width:
+            return index + 1
+    return len(_chains[scale])
+
+_splits = dict(((scale, width), _get_split(scale, width)) 
+    for scale in scales for _, _, _, width in scales[scale].bands)
+
+def _locate(x, abs_y, is_south, scale, positions):
+    # Returns (row, col, min_x, min_y, nomk) of sheet of the scale: global row 
+    # and column in grid of the scale, corner and nomenclature without 
+    # joining. Sheets of parent scales are kept in positions if it is set.
+    chain = _chains[scale]
+    start = 0
+    position = None
+    if positions:
+        for start in range(len(chain), -1, -1):
+            position = positions.get(chain[start - 1] if start > 0 else '1m')
+            if position is not None:
+                break
+
+    if position is None:
+        zone = int(math.floor(x / 6.0))
+        row = int(math.floor(abs_y / 4.0))
+        col = zone + 30
+        min_x = zone * 6.0
+        min_y = math.floor(row * 4.0)
+        nomk_str = util.letters[row] + '-' + '{:02d}'.format(zone + 31)
+        if positions is not None:
+            positions['1m'] = (row, col, min_x, min_y, nomk_str)
     else:
-        col = int(math.floor(x / 6.0))
-        min_x = col * 6.0
-        col_str = '{:02d}'.format(col + 31)
-        max_x = min_x + 6.0
-
-    nomk_str = '{}-{}'.format(util.letters[row], col_str)
-    if y < 0:
-        nomk_str += util.south_suffix()
-    return nomk_str, min_x, max_x, min_y * mult, max_y * mult
-
-def coords_to_500k(x, y):
-    mult = 1
-    if y < 0:
-        mult = -1
-
-    abs_y = abs(y)
-    col, row, min_x, min_y = get_1m(x, abs_y)
-    letter = ''
-    col_str = ''
-
-    if abs_y > 88.0:
-        raise Exception('Unsupported latitude ({:.6f}) for this scale'.format(y))
-    elif abs_y > 76.0: # Create quad sheets
-        if abs_y > min_y + 2.0:
-            letter = util.get_row_ru(1, y < 0)
-            min_y + 2.0
-        else: 
-            letter = util.get_row_ru(0, y < 0)
-
-        if col % 2 == 0:
-            col_str = u'{:02d}-{},{:02d}-{}'.format(col - 1, letter, col, letter)
-            min_x -= 6
+        row, col, min_x, min_y, nomk_str = position
+
+    for level_scale in chain[start:]:
+        parts, size_x, size_y, labels, _, _ = _compiled[level_scale]
+        # The same arithmetic as util.get_grid_pos
+        local_row = int(math.floor((abs_y - min_y) / size_y))
+        local_col = int(math.floor(abs(x - min_x) / size_x))
+        row = row * parts + local_row
+        col = col * parts + local_col
+        min_x = min_x + local_col * size_x
+        min_y = min_y + local_row * size_y
+        if 0 <= local_row < parts and 0 <= local_col < parts:
+            nomk_str += '-' + labels[is_south][local_row * parts + local_col]
         else:
-            col_str = u'{:02d}-{},{:02d}-{}'.format(col, letter, col + 1, letter)
-        max_x = min_x + 12.0
-        
-    elif abs_y < 76.0 and abs_y > 60.0: # Create double sheets    
-        if abs_y > min_y + 2.0:
-            letter = util.get_row_ru(1, y < 0)
-            min_y + 2.0
-        else: 
-            letter = util.get_row_ru(0, y < 0)
-        max_x = min_x + 6.0
-        col_str = u'{:02d}-{}'.format(col, letter)
+            # Rounding at the edge of parent sheet
+            nomk_str += '-' + _format_label(level_scale, local_col, local_row, is_south)
+        if positions is not None:
+            positions[level_scale] = (row, col, min_x, min_y, nomk_str)
+    return row, col, min_x, min_y, nomk_str
+
+def _format_label(scale, col, row, is_south):
+    descriptor = scales[scale]
+    label = descriptor.label_format.format(descriptor.label(col, row, is_south))
+    return '(' + label + ')' if descriptor.brackets else label
+
+def _get_width(bands, abs_y):
+    for min_lat, max_lat, max_included, width in bands:
+        if abs_y > min_lat and (abs_y < max_lat or max_included and abs_y == max_lat):
+            return width
+    return 1
+
+def _join(labels, brackets, tail):
+    # Labels of several sheets of the level, tail is common for every sheet
+    if brackets and not tail:
+        return '(' + ','.join(labels) + ')'
+    if brackets:
+        labels = ['(' + label + ')' for label in labels]
+    if tail:
+        labels = [label + '-' + tail for label in labels]
+    return ','.join(labels)
+
+def _get_suffix(scale, split, row, first_col, width, is_south):
+    # Labels from the split level: sheets of the level are listed and the 
+    # rows of deeper levels are repeated for every of them
+    parts = util.scale_parts[scale]
+    chain = _chains[scale]
+    tail = ''
+    for level_scale in reversed(chain[split:]):
+        level_parts, _, _, _, raw_labels, brackets = _compiled[level_scale]
+        local_row = row // (parts // util.scale_parts[level_scale]) % level_parts
+        tail = _join(raw_labels[is_south][local_row * level_parts:(local_row + 1) * level_parts], brackets, tail)
+
+    if split == 0:
+        zones = range(first_col // parts, (first_col + width - 1) // parts + 1)
+        return _join(['{:02d}'.format(zone + 1) for zone in zones], False, tail)
+
+    level_scale = chain[split - 1]
+    size = parts // util.scale_parts[level_scale]
+    level_parts, _, _, _, raw_labels, brackets = _compiled[level_scale]
+    local_row = row // size % level_parts
+    labels = [raw_labels[is_south][local_row * level_parts + level_col % level_parts] 
+        for level_col in range(first_col // size, (first_col + width) // size)]
+    return _join(labels, brackets, tail)
+
+# Labels of joined sheets from the split level by position of the first 
+# sheet in the sheet which contains all of them
+_suffixes = {}
+
+def _join_labels(scale, nomk_str, row, first_col, width, is_south):
+    # Joined sheets share labels of levels which contain all of them, the 
+    # rest ones are listed: T-47-В,Г,48-В,Г
+    parts = util.scale_parts[scale]
+    split = _splits[(scale, width)]
+    if split == 0:
+        key = (scale, width, is_south, row % parts, first_col)
     else:
-        local_col = int(math.floor(abs(x - min_x) / 3.0))
-        local_row = int(math.floor((abs_y - min_y) / 2.0))
-        letter = util.get_letter_ru(local_col, local_row, y < 0)
-
-        min_x = min_x + local_col * 3.0
-        min_y = min_y + local_row * 2.0
-
-        max_x = min_x + 3.0
-
-        col_str = u'{:02d}-{}'.format(col, letter)
-
-    max_y = min_y + 2.0
-
-    nomk_str = u'{}-{}'.format(util.letters[row], col_str)
-    if y < 0:
-        nomk_str += util.south_suffix()
-    return nomk_str, min_x, max_x, min_y * mult, max_y * mult
-
-def coords_to_200k(x, y):
+        size = parts // util.scale_parts[_chains[scale][split - 2]] if split > 1 else parts
+        key = (scale, width, is_south, row % size, first_col % size)
+
+    suffix = _suffixes.get(key)
+    if suffix is None:
+        suffix = _get_suffix(scale, split, row, first_col, width, is_south)
+        _suffixes[key] = suffix
+    return '-'.join(nomk_str.split('-', split + 1)[:split + 1] + [suffix])
+
+def resolve(x, y, scale, alternative = False, positions = None):
+    """Transforms coordinates to nomenclature of the scale by its descriptor
+        in scales. Alternative 1:1 000 000 sheets are not joined above 76 
+        degrees. Sheets of parent scales are shared between calls for the 
+        same point in positions dictionary if it is set.
+
+        Returns tuple (nomk, min_x, max_x, min_y, max_y)
+    """
     mult = 1
     if y < 0:
         mult = -1
-
+    is_south = y < 0
     abs_y = abs(y)
-    col, row, min1_x, min_y = get_1m(x, abs_y)
-    letter = ''
-    size_x = 6.0 / 6
-    size_y = 4.0 / 6
-
-    row_200k = int(math.floor((abs_y - min_y) / size_y))
-    col_200k = int(math.floor(abs(x - min1_x) / size_x))
-
-    if abs_y > 88.0:
-        raise Exception('Unsupported latitude ({:.6f}) for this scale'.format(y))
-    elif abs_y > 76.0: # Create triple sheets
-        begin_col = int(math.floor(col_200k / 3) * 3)
-        min_x = min1_x + begin_col
-        max_x = min_x
-        for i in range(3):
-            if letter == '':
-                letter = util.get_letter_roman(begin_col + i, row_200k, y < 0)
-            else: 
-                letter = letter + ',{}'.format(util.get_letter_roman(begin_col + i, row_200k, y < 0))
-            max_x = max_x + size_x
-
-    elif abs_y > 60.0 and abs_y <= 76.0: # Create double sheets
-        begin_col = int(math.floor(col_200k / 2) * 2)
-        min_x = min1_x + begin_col
-        max_x = min_x
-        for i in range(2):
-            if letter == '':
-                letter = util.get_letter_roman(begin_col + i, row_200k, y < 0)
-            else: 
-                letter = letter + ',{}'.format(util.get_letter_roman(begin_col + i, row_200k, y < 0))
-            max_x = max_x + size_x
-    else:
-        letter = util.get_letter_roman(col_200k, row_200k, y < 0)
 
-        min_x = min1_x + col_200k
+    if abs_y >= 88.0:
+        if scale == '1m':
+            return 'Z', -180.0, 180.0, 88.0 * mult, 90.0 * mult
+        if abs_y > 88.0:
+            raise Exception('Unsupported latitude ({:.6f}) for this scale'.format(y))
+
+    row, col, min_x, min_y, nomk_str = _locate(x, abs_y, is_south, scale, positions)
+    parts = util.scale_parts[scale]
+    size_x = 6.0 / parts
+    max_y = min_y + 4.0 / parts
+
+    width = 1
+    if abs_y > 60.0:
+        bands = scales[scale].bands
+        width = _get_width(bands[1:] if alternative else bands, abs_y)
+
+    if width == 1:
         max_x = min_x + size_x
+    else:
+        offset = col % width
+        min_x = min_x - offset * size_x
+        max_x = min_x + width * size_x
+        nomk_str = _join_labels(scale, nomk_str, row, col - offset, width, is_south)
 
-    min_y = min_y + row_200k * size_y
-    max_y = min_y + size_y
-
-    nomk_str = '{}-{:02d}-{}'.format(util.letters[row], col, letter)
-    if y < 0:
+    if is_south:
         nomk_str += util.south_suffix()
     return nomk_str, min_x, max_x, min_y * mult, max_y * mult
 
-def coords_to_100k_simple(x, y):
-    mult = 1
-    if y < 0:
-        mult = -1
-
-    abs_y = abs(y)
+def get_1m(x, y):
+    row, col, min_x, min_y, _ = _locate(x, y, False, '1m', None)
+    return col + 1, row, min_x, min_y
+
+def _simple(x, y, scale):
+    # Letter, zone, labels of every level and corner of sheet without joining
+    row, col, min_x, min_y, _ = _locate(x, abs(y), y < 0, scale, None)
+    parts = util.scale_parts[scale]
+    values = [util.letters[row // parts], col // parts + 1]
+    for level_scale in _chains[scale]:
+        size = parts // util.scale_parts[level_scale]
+        descriptor = scales[level_scale]
+        values.append(descriptor.label(col // size % descriptor.parts, row // size % descriptor.parts, y < 0))
+    return tuple(values + [min_x, min_y * (-1 if y < 0 else 1)])
 
-    col, row, min_x, min_y = get_1m(x, abs_y)
-    row_100k, col_100k, _, _, min_x, _, min_y, _ = util.get_grid_pos(x, abs_y, min_x, min_y, 12, y < 0)
-    letter = util.letters[row]
-    last_num = util.get_letter_num(col_100k, row_100k, y < 0)
-    return letter, col, last_num, min_x, min_y * mult
+def coords_to_100k_simple(x, y):
+    return _simple(x, y, '100k')
 
 def coords_to_50k_simple(x, y):
-    mult = 1
-    if y < 0:
-        mult = -1
-
-    abs_y = abs(y)
-    
-    letter, number, last_number, min_x, min_y = coords_to_100k_simple(x, y)
-    row_50k, col_50k, _, _, min_x_50k, _, min_y_50k, _ = util.get_grid_pos(x, abs_y, min_x, min_y, 24, y < 0)
-
-    letter_str = util.get_letter_ru(col_50k, row_50k, y < 0)
-    return letter, number, last_number, letter_str, min_x_50k, min_y_50k * mult
+    return _simple(x, y, '50k')
 
 def coords_to_25k_simple(x, y):
-    mult = 1
-    if y < 0:
-        mult = -1
-
-    abs_y = abs(y)
-
-    letter, number, last_number, last_letter, min_x, min_y = coords_to_50k_simple(x, y)
-    row_25k, col_25k, _, _, min_x_25k, max_x_25k, min_y_25k, _ = util.get_grid_pos(x, abs_y, min_x, min_y, 48, y < 0)
-
-    # pos_x, pos_y = util.get_pos_ru(last_letter, y < 0)
-
-    # min_x = min_x_25k
-    # max_x = max_x_25k
-
-    letter_str = util.get_letter_ru(col_25k, row_25k, y < 0).lower()
-    return letter, number, last_number, last_letter, letter_str, min_x_25k, min_y_25k * mult
+    return _simple(x, y, '25k')
 
 def coords_to_5k_simple(x, y):
-    mult = 1
-    if y < 0:
-        mult = -1
+    return _simple(x, y, '5k')
 
-    abs_y = abs(y)
-    
-    letter, number, last_number, min_x, min_y = coords_to_100k_simple(x, y)
-    row_5k, col_5k, _, _, min_x_5k, _, min_y_5k, _ = util.get_grid_pos(x, abs_y, min_x, min_y, 192, y < 0)
+def coords_to_1m(x, y, alternative = False):
+    return resolve(x, y, '1m', alternative)
 
-    # min_x = min_x_5k
-    # max_x = max_x_5k
-    
-    letter_str = util.get_letter_num2(col_5k, row_5k, y < 0)
+def coords_to_500k(x, y):
+    return resolve(x, y, '500k')
 
-    return letter, number, last_number, letter_str, min_x_5k, min_y_5k * mult
+def coords_to_200k(x, y):
+    return resolve(x, y, '200k')
 
 def coords_to_100k(x, y):
-    mult = 1
-    if y < 0:
-        mult = -1
-
-    abs_y = abs(y)
-    col, row, min1_x, min1_y = get_1m(x, abs_y)
-    row_100k, col_100k, size_x, _, min_x, max_x, min_y, max_y = util.get_grid_pos(x, abs_y, min1_x, min1_y, 12, y < 0)
-
-    letter_str = ''
-
-    if abs_y > 88.0:
-        raise Exception('Unsupported latitude ({:.6f}) for this scale'.format(y))
-    elif abs_y > 76.0: # Create quad sheets
-        begin_col = int(math.floor(col_100k / 4) * 4)
-        min_x = min1_x + (begin_col * size_x)
-        max_x = min_x
-        for i in range(4):
-            if letter_str == '':
-                letter_str = '{:03d}'.format(util.get_letter_num(begin_col + i, row_100k, y < 0))
-            else: 
-                letter_str = letter_str + ',{:03d}'.format(util.get_letter_num(begin_col + i, row_100k, y < 0))
-            max_x = max_x + size_x
-    elif abs_y > 60.0 and abs_y <= 76.0: # Create double sheets    
-        begin_col = int(math.floor(col_100k / 2) * 2)
-        min_x = min1_x + (begin_col * size_x)
-        max_x = min_x
-        for i in range(2):
-            if letter_str == '':
-                letter_str = '{:03d}'.format(util.get_letter_num(begin_col + i, row_100k, y < 0))
-            else: 
-                letter_str = letter_str + ',{:03d}'.format(util.get_letter_num(begin_col + i, row_100k, y < 0))
-            max_x = max_x + size_x
-    else:
-        letter_str = '{:03d}'.format(util.get_letter_num(col_100k, row_100k, y < 0))
-
-    nomk_str = '{}-{:02d}-{}'.format(util.letters[row], col, letter_str)
-    if y < 0:
-        nomk_str += util.south_suffix()
-    return nomk_str, min_x, max_x, min_y * mult, max_y * mult
+    return resolve(x, y, '100k')
 
 def coords_to_50k(x, y):
-    mult = 1
-    if y < 0:
-        mult = -1
-
-    abs_y = abs(y)
-    
-    letter, number, last_number, min_x, min_y = coords_to_100k_simple(x, y)    
-    row_50k, col_50k, size_x_50k, _, min_x_50k, max_x_50k, min_y_50k, max_y_50k = util.get_grid_pos(x, abs_y, min_x, min_y, 24, y < 0)
-
-    col_str = ''
-    min_x = min_x_50k
-    max_x = max_x_50k
-
-    if abs_y > 88.0:
-        raise Exception('Unsupported latitude ({:.6f}) for this scale'.format(y))
-    elif abs_y > 76.0: # Create quad sheets
-        letter_str = util.get_row_ru(row_50k, y < 0)
-        if last_number % 2 == 0:
-            col_str = u'{:03d}-{},{:03d}-{}'.format(last_number - 1, letter_str, last_number, letter_str)
-            min_x -= size_x_50k * 2
-        else:
-            col_str = u'{:03d}-{},{:03d}-{}'.format(last_number, letter_str, last_number + 1, letter_str)
-        if col_50k % 2 != 0:
-            min_x -= size_x_50k
-        max_x = min_x + size_x_50k * 4
-    elif abs_y > 60.0 and abs_y <= 76.0: # Create double sheets
-        letter_str = util.get_row_ru(row_50k, y < 0)
-        if col_50k % 2 != 0:
-            min_x -= size_x_50k
-        col_str = u'{:03d}-{}'.format(last_number, letter_str)
-        max_x = min_x + size_x_50k * 2
-    else:
-        letter_str = util.get_letter_ru(col_50k, row_50k, y < 0)
-        col_str = u'{:03d}-{}'.format(last_number, letter_str)
-
-    nomk_str = u'{}-{:02d}-{}'.format(letter, number, col_str)
-    if y < 0:
-        nomk_str += util.south_suffix()
-    return nomk_str, min_x, max_x, min_y_50k * mult, max_y_50k * mult
+    return resolve(x, y, '50k')
 
 def coords_to_25k(x, y):
-    mult = 1
-    if y < 0:
-        mult = -1
-
-    abs_y = abs(y)
-
-    letter, number, last_number, last_letter, min_x, min_y = coords_to_50k_simple(x, y)
-    row_25k, col_25k, size_x_25k, size_y_25k, min_x_25k, max_x_25k, min_y_25k, max_y_25k = util.get_grid_pos(x, abs_y, min_x, min_y, 48, y < 0)
-
-
-    pos_x, pos_y = util.get_pos_ru(last_letter, y < 0)
-    # print('col: {}, size: {}, min_x: {}, min_x_25k: {}'.format(col_25k, size_x_25k, min_x, min_x_25k))
-
-    col_str = ''
-    min_x = min_x_25k
-    max_x = max_x_25k
-
-    if abs_y > 88.0:
-        raise Exception('Unsupported latitude ({:.6f}) for this scale'.format(y))
-    elif abs_y > 76.0: # Create quad sheets
-        letter_str = util.get_row_ru(row_25k, y < 0).lower()
-        if pos_x % 2 == 0:
-            last_letter1 = util.get_letter_ru(pos_x - 1, pos_y, y < 1)
-            last_letter2 = util.get_letter_ru(pos_x, pos_y, y < 1)
-            col_str = u'{}-{},{}-{}'.format(last_letter1, letter_str, last_letter2, letter_str)
-            min_x -= size_x_25k * 2
-        else:
-            last_letter1 = util.get_letter_ru(pos_x, pos_y, y < 1)
-            last_letter2 = util.get_letter_ru(pos_x + 1, pos_y, y < 1)
-            col_str = u'{}-{},{}-{}'.format(last_letter1, letter_str, last_letter2, letter_str)
-        if col_25k % 2 != 0:
-            min_x -= size_x_25k
-        max_x = min_x + size_x_25k * 4
-    elif abs_y > 60.0 and abs_y <= 76.0: # Create double sheets
-        if col_25k % 2 != 0:
-            min_x -= size_x_25k
-        letter_str = util.get_row_ru(row_25k, y < 0).lower()
-        col_str = u'{}-{}'.format(last_letter, letter_str)
-        max_x = min_x + size_x_25k * 2
-    else:
-        letter_str = util.get_letter_ru(col_25k, row_25k, y < 0).lower()
-        col_str = u'{}-{}'.format(last_letter, letter_str)
-
-    nomk_str = u'{}-{:02d}-{:03d}-{}'.format(letter, number, last_number, col_str)
-    if y < 0:
-        nomk_str += util.south_suffix()
-    return nomk_str, min_x, max_x, min_y_25k * mult, max_y_25k * mult
+    return resolve(x, y, '25k')
 
 def coords_to_10k(x, y):
-    mult = 1
-    if y < 0:
-        mult = -1
-    
-    abs_y = abs(y)
-    letter, number, last_number, letter2, last_letter, min_x, min_y = coords_to_25k_simple(x, abs_y)
-    row_10k, col_10k, size_x_10k, size_y_10k, min_x_10k, max_x_10k, min_y_10k, max_y_10k = util.get_grid_pos(x, abs_y, min_x, min_y, 96, y < 0)
-
-    pos_x, pos_y = util.get_pos_ru(last_letter.upper(), y < 0)
-
-    col_str = ''
-    min_x = min_x_10k
-    max_x = max_x_10k
-
-    if abs_y > 88.0:
-        raise Exception('Unsupported latitude ({:.6f}) for this scale'.format(y))
-    elif abs_y > 76.0: # Create quad sheets
-        letter_str = util.get_row_num(row_10k, y < 0)
-        if pos_x % 2 == 0:
-            last_letter1 = util.get_letter_ru(pos_x - 1, pos_y, y < 1).lower()
-            last_letter2 = util.get_letter_ru(pos_x, pos_y, y < 1).lower()
-            col_str = u'{}-{},{}-{}'.format(last_letter1, letter_str, last_letter2, letter_str)
-            min_x -= size_x_10k * 2
-        else:
-            last_letter1 = util.get_letter_ru(pos_x, pos_y, y < 1)
-            last_letter2 = util.get_letter_ru(pos_x + 1, pos_y, y < 1)
-            col_str = u'{}-{},{}-{}'.format(last_letter1, letter_str, last_letter2, letter_str)
-        if col_10k % 2 != 0:
-            min_x -= size_x_10k
-
-        max_x = min_x + size_x_10k * 4
-    elif abs_y > 60.0 and abs_y <= 76.0: # Create double sheets
-        if col_10k % 2 != 0:
-            min_x -= size_x_10k
-        letter_str = util.get_row_num(row_10k, y < 0)
-        col_str = u'{}-{}'.format(last_letter, letter_str)
-        max_x = min_x + size_x_10k * 2
-    else:
-        letter_str = util.get_letter_num_simple(col_10k, row_10k, y < 0)
-        col_str = u'{}-{}'.format(last_letter, letter_str)
-
-    nomk_str = u'{}-{:02d}-{:03d}-{}-{}'.format(letter, number, last_number, letter2, col_str)
-    if y < 0:
-        nomk_str += util.south_suffix()
-    return nomk_str, min_x, max_x, min_y_10k * mult, max_y_10k * mult
-
+    return resolve(x, y, '10k')
 
 def coords_to_5k(x, y):
-    mult = 1
-    if y < 0:
-        mult = -1
-
-    abs_y = abs(y)
-    letter_str = ''
-    letter, number, last_number, min_x, min_y = coords_to_100k_simple(x, y)
-    row_5k, col_5k, size_x_5k, _, min_x_5k, max_x_5k, min_y_5k, max_y_5k = util.get_grid_pos(x, abs_y, min_x, min_y, 192, y < 0)
-
-    if abs_y > 88.0:
-        raise Exception('Unsupported latitude ({:.6f}) for this scale'.format(y))
-    elif abs_y > 76.0: # Create quad sheets
-        begin_col = int(math.floor(col_5k / 4) * 4)
-        min_x = min_x + begin_col
-        max_x = min_x
-        for i in range(4):
-            if letter_str == '':
-                letter_str = '({:03d}'.format(util.get_letter_num2(begin_col + i, row_5k, y < 0))
-            else: 
-                letter_str = letter_str + ',{:03d}'.format(util.get_letter_num2(begin_col + i, row_5k, y < 0))
-            max_x = max_x + size_x_5k
-        letter_str += ')'
-    elif abs_y > 60.0 and abs_y <= 76.0: # Create double sheets
-        begin_col = int(math.floor(col_5k / 2) * 2)
-        min_x = min_x + begin_col
-        max_x = min_x
-        for i in range(2):
-            if letter_str == '':
-                letter_str = '({:03d}'.format(util.get_letter_num2(begin_col + i, row_5k, y < 0))
-            else: 
-                letter_str = letter_str + ',{:03d}'.format(util.get_letter_num2(begin_col + i, row_5k, y < 0))
-            max_x = max_x + size_x_5k
-        letter_str += ')'
-    else:
-        letter_str = '({:03d})'.format(util.get_letter_num2(col_5k, row_5k, y < 0))
-        min_x = min_x_5k
-        max_x = max_x_5k
-
-    nomk_str = u'{}-{:02d}-{:03d}-{}'.format(letter, number, last_number, letter_str)
-    if y < 0:
-        nomk_str += util.south_suffix()
-    return nomk_str, min_x, max_x, min_y_5k * mult, max_y_5k * mult
+    return resolve(x, y, '5k')
 
 def coords_to_2k(x, y):
-    mult = 1
-    if y < 0:
-        mult = -1
+    return resolve(x, y, '2k')
 
-    abs_y = abs(y)
-    letter_str = ''
-    letter, number, last_number, last_letter, min_x, min_y = coords_to_5k_simple(x, y)
-    row_2k, col_2k, size_x_2k, size_y_2k, min_x_2k, max_x_2k, min_y_2k, max_y_2k = util.get_grid_pos(x, abs_y, min_x, min_y, 576, y < 0)
-
-    if abs_y > 88.0:
-        raise Exception('Unsupported latitude ({:.6f}) for this scale'.format(y))
-    elif abs_y > 60.0 and abs_y <= 88.0: # abs_y > 76.0: # Create triple sheets
-        # FIXME: https://geodesist.ru/threads/planshety-1-2000-i-1-5000-na-ploschad-bolee-20-km2.59117/page-2#post-976613
-        letter_str = util.get_row_ru_small(row_2k, y < 0)
-        min_x = min_x_2k - size_x_2k * col_2k
-        max_x = min_x + size_x_2k * 3
-    # elif abs_y > 60.0 and abs_y <= 76.0: # Create double sheets
-    #     raise Exception('Unsupported double sheets for this scale')
-    else:
-        letter_str = util.get_letter_ru_small(col_2k, row_2k, y < 0)
-        min_x = min_x_2k
-        max_x = max_x_2k
+def coords_to_all(x, y):
+    """Transforms coordinates to nomenclatures of all scales at once.
+        Every parent sheet is calculated only once and reused by child scales.
 
-    nomk_str = u'{}-{:02d}-{:03d}-({:03d})-{}'.format(letter, number, last_number, last_letter, letter_str)
-    if y < 0:
-        nomk_str += util.south_suffix()
-    return nomk_str, min_x, max_x, min_y_2k * mult, max_y_2k * mult
+        Returns dictionary scale -> (nomk, min_x, max_x, min_y, max_y)
+    """
+    positions = {}
+    return dict((scale, resolve(x, y, scale, positions = positions)) for scale in scales)
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Sheets which cover an area.
+#
+# Example:
+#   from nomk import cover
+#   for nomk, min_x, max_x, min_y, max_y in cover.sheets_in_bbox(37.0, 55.0, 38.0, 56.0, '25k'):
+#       print(nomk)
+
+import math
+from . import sheetid, util
+
+def _index_range(min_value, max_value, size, count):
+    first = int(math.floor(min_value / size))
+    last = int(math.ceil(max_value / size)) - 1
+    return max(first, 0), min(max(first, last), count - 1)
+
+def _hemisphere_ranges(min_y, max_y):
+    # Latitude ranges as (is_south, min_abs_y, max_abs_y)
+    if max_y > 0.0 or min_y >= 0.0:
+        yield False, max(min_y, 0.0), max_y
+    if min_y < 0.0:
+        yield True, max(-max_y, 0.0), -min_y
+
+def sheet_ids_in_bbox(min_x, min_y, max_x, max_y, scale):
+    """Yields identifiers (see sheetid) of all sheets of the scale which 
+        intersect bbox. Double, triple and quad sheets are yielded once.
+        If min_x > max_x bbox crosses 180 meridian.
+    """
+    if min_x > max_x:
+        for sheet_id in sheet_ids_in_bbox(min_x, min_y, 180.0, max_y, scale):
+            yield sheet_id
+        for sheet_id in sheet_ids_in_bbox(-180.0, min_y, max_x, max_y, scale):
+            yield sheet_id
+        return
+
+    parts = util.scale_parts[scale]
+    size_x = 6.0 / parts
+    size_y = 4.0 / parts
+
+    first_col, last_col = _index_range(min_x + 180.0, max_x + 180.0, size_x, 60 * parts)
+
+    for is_south, min_abs_y, max_abs_y in _hemisphere_ranges(min_y, max_y):
+        # Sheets above 88 degrees are not supported except 1:1 000 000 sheet Z
+        first_row, last_row = _index_range(min_abs_y, max_abs_y, size_y, sheetid.POLE_ROW * parts + 1)
+
+        for row in range(first_row, min(last_row, sheetid.POLE_ROW * parts - 1) + 1):
+            width = sheetid.get_polar_width(scale, row // parts)
+            for col in range(first_col // width * width, last_col + 1, width):
+                yield sheetid.from_grid(scale, is_south, row, col)
+
+        if last_row >= sheetid.POLE_ROW * parts and scale == '1m':
+            yield sheetid.from_grid(scale, is_south, sheetid.POLE_ROW, 0)
+
+def sheets_in_bbox(min_x, min_y, max_x, max_y, scale):
+    """Yields coord.coords_to_* results (nomk, min_x, max_x, min_y, max_y) for
+        all sheets of the scale which intersect bbox
+    """
+    for sheet_id in sheet_ids_in_bbox(min_x, min_y, max_x, max_y, scale):
+        yield sheetid.to_nomk(sheet_id)
+
+INSIDE = 'inside'
+BOUNDARY = 'boundary'
+
+def _segment_in_rect(edge, min_x, min_y, max_x, max_y):
+    # Liang-Barsky clipping of segment by closed rectangle
+    x0, y0, x1, y1 = edge
+    dx = x1 - x0
+    dy = y1 - y0
+    t0 = 0.0
+    t1 = 1.0
+    for p, q in ((-dx, x0 - min_x), (dx, max_x - x0), (-dy, y0 - min_y), (dy, max_y - y0)):
+        if p == 0.0:
+            if q < 0.0:
+                return False
+        else:
+            t = q / p
+            if p < 0.0:
+                if t > t1:
+                    return False
+                t0 = max(t0, t)
+            else:
+                if t < t0:
+                    return False
+                t1 = min(t1, t)
+    return True
+
+class _EdgeIndex(object):
+    # Polygon edges grouped by horizontal slabs for fast point in polygon tests
+    def __init__(self, edges):
+        self.min_y = min(min(edge[1], edge[3]) for edge in edges)
+        max_y = max(max(edge[1], edge[3]) for edge in edges)
+        self.count = max(1, len(edges) // 4)
+        self.size = (max_y - self.min_y) / self.count or 1.0
+        self.slabs = [[] for _ in range(self.count)]
+        for edge in edges:
+            first = self._slab(min(edge[1], edge[3]))
+            last = self._slab(max(edge[1], edge[3]))
+            for slab in range(first, last + 1):
+                self.slabs[slab].append(edge)
+
+    def _slab(self, y):
+        return min(max(int((y - self.min_y) / self.size), 0), self.count - 1)
+
+    def contains(self, x, y):
+        # Even-odd rule, so holes and several outer rings are supported
+        inside = False
+        for x0, y0, x1, y1 in self.slabs[self._slab(y)]:
+            if (y0 > y) != (y1 > y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+        return inside
+
+def _ring_edges(rings):
+    edges = []
+    for ring in rings:
+        points = [(float(x), float(y)) for x, y in ring]
+        if points and points[0] != points[-1]:
+            points.append(points[0])
+        for (x0, y0), (x1, y1) in zip(points[:-1], points[1:]):
+            if (x0, y0) != (x1, y1):
+                edges.append((x0, y0, x1, y1))
+    return edges
+
+def _scale_chain(scale):
+    chain = [1]
+    for parts in sheetid.levels[scale]:
+        chain.append(chain[-1] * parts)
+    return chain
+
+def _cell_rect(is_south, row, col, parts):
+    size_x = 6.0 / parts
+    size_y = 4.0 / parts
+    min_x = col * size_x - 180.0
+    if is_south:
+        return min_x, -(row + 1) * size_y, min_x + size_x, -row * size_y
+    return min_x, row * size_y, min_x + size_x, (row + 1) * size_y
+
+def _cover_cell(scale, chain, level, is_south, row, col, edges, index):
+    # Yields (row, col, is_inside) cells of target scale inside the cell
+    min_x, min_y, max_x, max_y = _cell_rect(is_south, row, col, chain[level])
+    cell_edges = [edge for edge in edges if _segment_in_rect(edge, min_x, min_y, max_x, max_y)]
+
+    if not cell_edges:
+        if index.contains((min_x + max_x) / 2, (min_y + max_y) / 2):
+            # All cells are inside, no more tests required
+            ratio = chain[-1] // chain[level]
+            for child_row in range(row * ratio, (row + 1) * ratio):
+                for child_col in range(col * ratio, (col + 1) * ratio):
+                    yield child_row, child_col, True
+        return
+
+    if level == len(chain) - 1:
+        yield row, col, False
+        return
+
+    ratio = chain[level + 1] // chain[level]
+    for child_row in range(row * ratio, (row + 1) * ratio):
+        for child_col in range(col * ratio, (col + 1) * ratio):
+            for cell in _cover_cell(scale, chain, level + 1, is_south, child_row, child_col, cell_edges, index):
+                yield cell
+
+def polygon_sheet_ids(rings, scale):
+    """Yields (sheet identifier, status) for all sheets of the scale which 
+        intersect polygon. Status is INSIDE for sheets which are completely 
+        inside polygon and BOUNDARY for sheets crossed by polygon boundary.
+
+        Polygon is a list of rings, every ring is a list of (x, y) points.
+        Rings are combined by even-odd rule, so inner rings are holes. Sheets
+        are checked from 1:1 000 000 scale down to the scale only where they 
+        are crossed by boundary. Areas above 88 degrees are skipped.
+    """
+    edges = _ring_edges(rings)
+    if not edges:
+        return
+    index = _EdgeIndex(edges)
+    chain = _scale_chain(scale)
+
+    min_x = min(min(edge[0], edge[2]) for edge in edges)
+    max_x = max(max(edge[0], edge[2]) for edge in edges)
+    min_y = min(min(edge[1], edge[3]) for edge in edges)
+    max_y = max(max(edge[1], edge[3]) for edge in edges)
+
+    first_col, last_col = _index_range(min_x + 180.0, max_x + 180.0, 6.0, 60)
+    polar_sheets = {}
+
+    for is_south, min_abs_y, max_abs_y in _hemisphere_ranges(min_y, max_y):
+        first_row, last_row = _index_range(min_abs_y, max_abs_y, 4.0, sheetid.POLE_ROW)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                for cell_row, cell_col, is_inside in _cover_cell(scale, chain, 0, is_south, row, col, edges, index):
+                    sheet_id = sheetid.from_grid(scale, is_south, cell_row, cell_col)
+                    if sheetid.get_polar_width(scale, row) == 1:
+                        yield sheet_id, INSIDE if is_inside else BOUNDARY
+                    else:
+                        # Polar sheet is inside only if all its parts are inside
+                        polar_sheets[sheet_id] = polar_sheets.get(sheet_id, True) and is_inside
+
+    for sheet_id, is_inside in polar_sheets.items():
+        yield sheet_id, INSIDE if is_inside else BOUNDARY
+
+def polygon_sheets(rings, scale):
+    """Yields (nomk, min_x, max_x, min_y, max_y, status) for all sheets of 
+        the scale which intersect polygon (see polygon_sheet_ids)
+    """
+    for sheet_id, status in polygon_sheet_ids(rings, scale):
+        yield sheetid.to_nomk(sheet_id) + (status,)
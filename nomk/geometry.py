@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Binary and GeoJSON output of sheet bboxes.
+#
+# Items are results of coord.coords_to_* (nomk, min_x, max_x, min_y, max_y),
+# text.text_to_* (scale, min_x, max_x, min_y, max_y) or nomk2 objects. 
+# Polygons have the same ring as nomk2.Nomk.to_wkt, GeoJSON rings are 
+# counterclockwise.
+#
+# Example:
+#   from nomk import cover, geometry
+#   sheets = cover.sheets_in_bbox(37.0, 55.0, 38.0, 56.0, '25k')
+#   data = geometry.encode_many(list(sheets), srid = 4326)  # EWKB records one by one
+#   with open('sheets.geojson', 'w') as f:
+#       geometry.write_feature_collection(cover.sheets_in_bbox(37.0, 55.0, 38.0, 56.0, '25k'), f)
+
+import json
+import struct
+from . import sheetid
+
+WKB_POLYGON = 3
+EWKB_SRID_FLAG = 0x20000000
+LITTLE_ENDIAN = 1
+
+# Byte order, type, rings count, points count and 5 points of ring
+_wkb = struct.Struct('<BIII10d')
+# The same with SRID after type
+_ewkb = struct.Struct('<BIIII10d')
+
+WKB_SIZE = _wkb.size
+EWKB_SIZE = _ewkb.size
+
+_scales = frozenset(sheetid.scales)
+
+def get_bbox(item):
+    """Returns (min_x, min_y, max_x, max_y) of coord.coords_to_* or 
+        text.text_to_* result or nomk2 object
+    """
+    if hasattr(item, 'get_bbox'):
+        min_x, min_y, max_x, max_y = item.get_bbox()
+        return min_x, min_y, max_x, max_y
+    _, min_x, max_x, min_y, max_y = item
+    # Southern sheets have min_y and max_y swapped
+    if min_y > max_y:
+        min_y, max_y = max_y, min_y
+    return min_x, min_y, max_x, max_y
+
+def get_name(item):
+    """Returns nomenclature of coord.coords_to_* result or None"""
+    if hasattr(item, 'get_bbox') or item[0] in _scales:
+        return None
+    return item[0]
+
+def get_size(srid = None):
+    """Returns size of record in bytes"""
+    return WKB_SIZE if srid is None else EWKB_SIZE
+
+def pack_into(buffer, offset, item, srid = None):
+    """Writes polygon of item bbox into buffer at offset as WKB, or EWKB if 
+        srid is set. Returns offset after record.
+    """
+    min_x, min_y, max_x, max_y = get_bbox(item)
+    if srid is None:
+        _wkb.pack_into(buffer, offset, LITTLE_ENDIAN, WKB_POLYGON, 1, 5, 
+            min_x, min_y, min_x, max_y, max_x, max_y, max_x, min_y, min_x, min_y)
+        return offset + WKB_SIZE
+    _ewkb.pack_into(buffer, offset, LITTLE_ENDIAN, WKB_POLYGON | EWKB_SRID_FLAG, srid, 1, 5, 
+        min_x, min_y, min_x, max_y, max_x, max_y, max_x, min_y, min_x, min_y)
+    return offset + EWKB_SIZE
+
+def to_wkb(item, srid = None):
+    """Returns WKB (EWKB if srid is set) of item bbox polygon"""
+    buffer = bytearray(get_size(srid))
+    pack_into(buffer, 0, item, srid)
+    return bytes(buffer)
+
+def encode_many(items, srid = None, buffer = None):
+    """Writes WKB (EWKB if srid is set) of sequence of items one after 
+        another into one buffer. Record i starts at i * get_size(srid).
+        Buffer is allocated if not given. Returns memoryview of records.
+    """
+    size = get_size(srid)
+    if not hasattr(items, '__len__'):
+        items = list(items)
+    if buffer is None:
+        buffer = bytearray(len(items) * size)
+    offset = 0
+    for item in items:
+        offset = pack_into(buffer, offset, item, srid)
+    return memoryview(buffer)[:offset]
+
+def iter_records(data, srid = None):
+    """Yields memoryviews of records of encode_many result"""
+    size = get_size(srid)
+    for offset in range(0, len(data), size):
+        yield data[offset:offset + size]
+
+def to_feature(item, properties = None):
+    """Returns GeoJSON feature of item bbox polygon. Properties are 
+        {"nomk": ...} for coord.coords_to_* results by default.
+    """
+    min_x, min_y, max_x, max_y = get_bbox(item)
+    if properties is None:
+        name = get_name(item)
+        properties = {} if name is None else {'nomk': name}
+    return {
+        'type': 'Feature',
+        'properties': properties,
+        'geometry': {
+            'type': 'Polygon',
+            'coordinates': [[[min_x, min_y], [max_x, min_y], [max_x, max_y], [min_x, max_y], [min_x, min_y]]],
+        },
+    }
+
+def write_feature_collection(items, output, properties_func = None):
+    """Writes GeoJSON FeatureCollection of iterable of items to text stream
+        output feature by feature, so items are not kept in memory. 
+        properties_func(item) returns properties of feature. Returns number
+        of features.
+    """
+    count = 0
+    output.write('{"type": "FeatureCollection", "features": [\n')
+    for item in items:
+        properties = None if properties_func is None else properties_func(item)
+        if count > 0:
+            output.write(',\n')
+        output.write(json.dumps(to_feature(item, properties), ensure_ascii = False))
+        count += 1
+    output.write('\n]}\n')
+    return count
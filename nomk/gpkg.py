@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# GeoPackage export of sheets through sqlite3, without GDAL. Sheets are 
+# inserted in batches in one transaction, then the spatial index 
+# rtree_<table>_geom is filled by one query.
+#
+# Example:
+#   from nomk import gpkg
+#   gpkg.export_bbox('sheets.gpkg', 36.0, 52.0, 42.0, 56.0, '25k')
+#   gpkg.write_sheets('sheets.gpkg', [coord.coords_to_100k(37.0, 55.0)], 'points_100k')
+
+import datetime
+import itertools
+import sqlite3
+import struct
+from . import cover, geometry, parser, sheetid
+
+SRID = 4326
+BATCH_SIZE = 10000
+
+# "GPKG" and version 1.2
+APPLICATION_ID = 0x47504B47
+USER_VERSION = 10200
+
+# Magic, version, flags (little endian, xy envelope), srs id and envelope
+_header = struct.Struct('<2sBBi4d')
+# Envelope is minx, maxx, miny, maxy
+_envelope = struct.Struct('<4d')
+HEADER_SIZE = _header.size
+BLOB_SIZE = HEADER_SIZE + geometry.WKB_SIZE
+
+_srs_wgs84 = ('WGS 84 geodetic', 4326, 'EPSG', 4326, 
+    'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,298.257223563,AUTHORITY["EPSG","7030"]],'
+    'AUTHORITY["EPSG","6326"]],PRIMEM["Greenwich",0,AUTHORITY["EPSG","8901"]],'
+    'UNIT["degree",0.0174532925199433,AUTHORITY["EPSG","9122"]],AUTHORITY["EPSG","4326"]]',
+    'longitude/latitude coordinates in decimal degrees on the WGS 84 spheroid')
+
+def to_blob(item, srid = SRID):
+    """Returns GeoPackage geometry blob of polygon of item bbox (see 
+        geometry.get_bbox)
+    """
+    min_x, min_y, max_x, max_y = geometry.get_bbox(item)
+    blob = bytearray(BLOB_SIZE)
+    _header.pack_into(blob, 0, b'GP', 0, 0x03, srid, min_x, max_x, min_y, max_y)
+    geometry.pack_into(blob, HEADER_SIZE, item)
+    return bytes(blob)
+
+def _envelope_value(index):
+    # SQL function which returns value of envelope of blob
+    def func(blob):
+        if blob is None:
+            return None
+        return _envelope.unpack_from(blob, 8)[index]
+    return func
+
+def _is_empty(blob):
+    return 0 if blob is not None else None
+
+def _register_functions(connection):
+    # Functions used by spatial index triggers
+    connection.create_function('ST_MinX', 1, _envelope_value(0), deterministic = True)
+    connection.create_function('ST_MaxX', 1, _envelope_value(1), deterministic = True)
+    connection.create_function('ST_MinY', 1, _envelope_value(2), deterministic = True)
+    connection.create_function('ST_MaxY', 1, _envelope_value(3), deterministic = True)
+    connection.create_function('ST_IsEmpty', 1, _is_empty, deterministic = True)
+
+def connect(path):
+    """Opens GeoPackage (creates if needed) with functions for spatial index
+        triggers registered
+    """
+    connection = sqlite3.connect(path, isolation_level = None)
+    _register_functions(connection)
+    connection.execute('PRAGMA application_id = {}'.format(APPLICATION_ID))
+    connection.execute('PRAGMA user_version = {}'.format(USER_VERSION))
+    connection.executescript('''
+        CREATE TABLE IF NOT EXISTS gpkg_spatial_ref_sys (
+            srs_name TEXT NOT NULL, srs_id INTEGER NOT NULL PRIMARY KEY,
+            organization TEXT NOT NULL, organization_coordsys_id INTEGER NOT NULL,
+            definition TEXT NOT NULL, description TEXT);
+        CREATE TABLE IF NOT EXISTS gpkg_contents (
+            table_name TEXT NOT NULL PRIMARY KEY, data_type TEXT NOT NULL,
+            identifier TEXT UNIQUE, description TEXT DEFAULT '',
+            last_change DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+            min_x DOUBLE, min_y DOUBLE, max_x DOUBLE, max_y DOUBLE,
+            srs_id INTEGER, CONSTRAINT fk_gc_r_srs_id FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys(srs_id));
+        CREATE TABLE IF NOT EXISTS gpkg_geometry_columns (
+            table_name TEXT NOT NULL, column_name TEXT NOT NULL,
+            geometry_type_name TEXT NOT NULL, srs_id INTEGER NOT NULL,
+            z TINYINT NOT NULL, m TINYINT NOT NULL,
+            CONSTRAINT pk_geom_cols PRIMARY KEY (table_name, column_name),
+            CONSTRAINT uk_gc_table_name UNIQUE (table_name),
+            CONSTRAINT fk_gc_tn FOREIGN KEY (table_name) REFERENCES gpkg_contents(table_name),
+            CONSTRAINT fk_gc_srs FOREIGN KEY (srs_id) REFERENCES gpkg_spatial_ref_sys (srs_id));
+        CREATE TABLE IF NOT EXISTS gpkg_extensions (
+            table_name TEXT, column_name TEXT, extension_name TEXT NOT NULL,
+            definition TEXT NOT NULL, scope TEXT NOT NULL,
+            CONSTRAINT ge_tce UNIQUE (table_name, column_name, extension_name));
+    ''')
+    connection.executemany('INSERT OR IGNORE INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)', [
+        ('Undefined cartesian SRS', -1, 'NONE', -1, 'undefined', 'undefined cartesian coordinate reference system'),
+        ('Undefined geographic SRS', 0, 'NONE', 0, 'undefined', 'undefined geographic coordinate reference system'),
+        _srs_wgs84,
+    ])
+    return connection
+
+def _create_table(connection, table):
+    connection.execute('DROP TABLE IF EXISTS "rtree_{0}_geom"'.format(table))
+    connection.execute('DROP TABLE IF EXISTS "{0}"'.format(table))
+    for meta_table in ('gpkg_extensions', 'gpkg_geometry_columns', 'gpkg_contents'):
+        connection.execute('DELETE FROM {} WHERE table_name = ?'.format(meta_table), (table,))
+    connection.execute('CREATE TABLE "{0}" (fid INTEGER PRIMARY KEY AUTOINCREMENT, '
+        'geom POLYGON, nomk TEXT, scale TEXT)'.format(table))
+    connection.execute('INSERT INTO gpkg_contents (table_name, data_type, identifier, srs_id) '
+        'VALUES (?, ?, ?, ?)', (table, 'features', table, SRID))
+    connection.execute('INSERT INTO gpkg_geometry_columns VALUES (?, ?, ?, ?, ?, ?)', 
+        (table, 'geom', 'POLYGON', SRID, 0, 0))
+
+# Spatial index of GeoPackage RTree extension, {t} is table name
+_rtree_statements = [
+    '''CREATE VIRTUAL TABLE "rtree_{t}_geom" USING rtree(id, minx, maxx, miny, maxy)''',
+    '''INSERT INTO "rtree_{t}_geom" 
+        SELECT fid, ST_MinX(geom), ST_MaxX(geom), ST_MinY(geom), ST_MaxY(geom) 
+        FROM "{t}" WHERE geom NOT NULL AND NOT ST_IsEmpty(geom)''',
+    '''CREATE TRIGGER "rtree_{t}_geom_insert" AFTER INSERT ON "{t}"
+        WHEN (new.geom NOT NULL AND NOT ST_IsEmpty(NEW.geom))
+        BEGIN
+            INSERT OR REPLACE INTO "rtree_{t}_geom" VALUES (NEW.fid,
+                ST_MinX(NEW.geom), ST_MaxX(NEW.geom), ST_MinY(NEW.geom), ST_MaxY(NEW.geom));
+        END''',
+    '''CREATE TRIGGER "rtree_{t}_geom_update1" AFTER UPDATE OF geom ON "{t}"
+        WHEN OLD.fid = NEW.fid AND (NEW.geom NOTNULL AND NOT ST_IsEmpty(NEW.geom))
+        BEGIN
+            INSERT OR REPLACE INTO "rtree_{t}_geom" VALUES (NEW.fid,
+                ST_MinX(NEW.geom), ST_MaxX(NEW.geom), ST_MinY(NEW.geom), ST_MaxY(NEW.geom));
+        END''',
+    '''CREATE TRIGGER "rtree_{t}_geom_update2" AFTER UPDATE OF geom ON "{t}"
+        WHEN OLD.fid = NEW.fid AND (NEW.geom ISNULL OR ST_IsEmpty(NEW.geom))
+        BEGIN
+            DELETE FROM "rtree_{t}_geom" WHERE id = OLD.fid;
+        END''',
+    '''CREATE TRIGGER "rtree_{t}_geom_update3" AFTER UPDATE ON "{t}"
+        WHEN OLD.fid != NEW.fid AND (NEW.geom NOTNULL AND NOT ST_IsEmpty(NEW.geom))
+        BEGIN
+            DELETE FROM "rtree_{t}_geom" WHERE id = OLD.fid;
+            INSERT OR REPLACE INTO "rtree_{t}_geom" VALUES (NEW.fid,
+                ST_MinX(NEW.geom), ST_MaxX(NEW.geom), ST_MinY(NEW.geom), ST_MaxY(NEW.geom));
+        END''',
+    '''CREATE TRIGGER "rtree_{t}_geom_update4" AFTER UPDATE ON "{t}"
+        WHEN OLD.fid != NEW.fid AND (NEW.geom ISNULL OR ST_IsEmpty(NEW.geom))
+        BEGIN
+            DELETE FROM "rtree_{t}_geom" WHERE id IN (OLD.fid, NEW.fid);
+        END''',
+    '''CREATE TRIGGER "rtree_{t}_geom_delete" AFTER DELETE ON "{t}"
+        WHEN old.geom NOT NULL
+        BEGIN
+            DELETE FROM "rtree_{t}_geom" WHERE id = OLD.fid;
+        END''',
+]
+
+def _create_rtree(connection, table):
+    # Index is filled by one query after loading, triggers keep it in sync 
+    # with later changes
+    connection.execute('INSERT INTO gpkg_extensions VALUES (?, ?, ?, ?, ?)', 
+        (table, 'geom', 'gpkg_rtree_index', 'http://www.geopackage.org/spec120/#extension_rtree', 'write-only'))
+    # executescript would commit transaction, so statements are run one by one
+    for statement in _rtree_statements:
+        connection.execute(statement.format(t = table))
+
+def _rows(items, scale, extent):
+    for item in items:
+        nomk_str = geometry.get_name(item)
+        item_scale = scale
+        if item_scale is None:
+            item_scale = parser.parse(nomk_str)[0]
+        min_x, min_y, max_x, max_y = geometry.get_bbox(item)
+        if min_x < extent[0]:
+            extent[0] = min_x
+        if min_y < extent[1]:
+            extent[1] = min_y
+        if max_x > extent[2]:
+            extent[2] = max_x
+        if max_y > extent[3]:
+            extent[3] = max_y
+        yield to_blob(item), nomk_str, item_scale
+
+def write_sheets(path, items, table = 'sheets', scale = None, batch_size = BATCH_SIZE):
+    """Writes layer table of sheets to GeoPackage, the table is replaced if
+        exists. Items are coord.coords_to_* results (nomk, min_x, max_x, 
+        min_y, max_y), which are read by batches of batch_size. Scale is 
+        detected from nomenclature if not set. Returns number of sheets.
+    """
+    if not table.replace('_', '').isalnum():
+        raise Exception('Unsupported table name {}'.format(table))
+    connection = connect(path)
+    try:
+        connection.execute('BEGIN')
+        _create_table(connection, table)
+        extent = [float('inf'), float('inf'), float('-inf'), float('-inf')]
+        rows = _rows(items, scale, extent)
+        count = 0
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            connection.executemany('INSERT INTO "{}" (geom, nomk, scale) VALUES (?, ?, ?)'.format(table), batch)
+            count += len(batch)
+        _create_rtree(connection, table)
+        if count > 0:
+            connection.execute('UPDATE gpkg_contents SET min_x = ?, min_y = ?, max_x = ?, max_y = ?, '
+                'last_change = ? WHERE table_name = ?', extent + [
+                    datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z', table])
+        connection.execute('COMMIT')
+    except Exception:
+        if connection.in_transaction:
+            connection.execute('ROLLBACK')
+        raise
+    finally:
+        connection.close()
+    return count
+
+def export_bbox(path, min_x, min_y, max_x, max_y, scale, table = None, batch_size = BATCH_SIZE):
+    """Writes all sheets of the scale which intersect bbox (see 
+        cover.sheets_in_bbox) to layer table of GeoPackage (sheets_<scale>
+        by default). Sheets are streamed, so memory does not depend on 
+        their number. Returns number of sheets.
+    """
+    if table is None:
+        table = 'sheets_' + scale
+    sheets = cover.sheets_in_bbox(min_x, min_y, max_x, max_y, scale)
+    return write_sheets(path, sheets, table, scale, batch_size)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Integer grid of sheets. Corners of sheets of all scales are integers in 
+# units of 1/576 of the side of 1:1 000 000 sheet (the side of 1:2 000 
+# sheet), counted from 180 meridian and from equator. Sheets are found by 
+# integer arithmetic and corners are converted to degrees only at output.
+#
+# Example:
+#   from nomk import grid
+#   row, col = grid.subdivide(13, 36, 12, 3, 11)  # N-37-004
+#   min_x, max_x, min_y, max_y = grid.get_bbox('100k', False, row, col)
+
+from . import util
+
+UNITS = 576
+POLE_ROW = 22
+
+# Distance in degrees from edges of sheets within which coord.coords_to_* 
+# can return other sheet than locate
+EDGE_MARGIN = 1e-9
+
+# Number of sheets joined by longitude between 60 and 76 and above 76 degrees
+polar_widths = {
+    '1m': (2, 4),
+    '500k': (2, 4),
+    '200k': (2, 3),
+    '100k': (2, 4),
+    '50k': (2, 4),
+    '25k': (2, 4),
+    '10k': (2, 4),
+    '5k': (2, 4),
+    '2k': (3, 3),
+}
+
+def get_polar_width(scale, row):
+    """Returns number of sheets of the scale joined by longitude in row of 
+        1:1 000 000 sheets
+    """
+    if row >= 19:
+        return polar_widths[scale][1]
+    elif row >= 15:
+        return polar_widths[scale][0]
+    return 1
+
+def get_step(scale):
+    """Returns side of sheet of the scale in units"""
+    return UNITS // util.scale_parts[scale]
+
+def subdivide(row, col, parts, local_col, local_row):
+    """Returns global (row, col) of part (local_col, local_row) of sheet 
+        (row, col) divided to parts x parts sheets. Local row is counted 
+        from equator as util.get_pos_* return it.
+    """
+    return row * parts + local_row, col * parts + local_col
+
+def locate(x, y, scale):
+    """Returns hemisphere and global (row, col) in grid of scale of sheet 
+        which contains point
+    """
+    step = get_step(scale)
+    # Exact floor by integer ratio of float, float arithmetic would round 
+    # points near edges of sheets to the next sheet
+    numerator, denominator = float(x).as_integer_ratio()
+    units_x = numerator * (UNITS // 6) // denominator + 180 * (UNITS // 6)
+    numerator, denominator = abs(float(y)).as_integer_ratio()
+    units_y = numerator * (UNITS // 4) // denominator
+    return y < 0, units_y // step, units_x // step
+
+def near_edge(x, y, scale, margin = EDGE_MARGIN):
+    """Returns True if point is near edge of sheet of the scale, where 
+        coord.coords_to_* can return other sheet than locate: it rounds 
+        points to the next sheet by float arithmetic and uses number of 
+        joined sheets of the latitude, not of the row, on 60, 76 and 88 
+        degrees
+    """
+    parts = util.scale_parts[scale]
+    units_x = (x + 180.0) * parts / 6.0
+    units_y = abs(y) * parts / 4.0
+    return abs(units_x - round(units_x)) * 6.0 / parts < margin or \
+        abs(units_y - round(units_y)) * 4.0 / parts < margin
+
+def get_units(scale, row, col, alternative = False):
+    """Returns (min_col, max_col, min_row, max_row) in units of sheet with 
+        global (row, col) in grid of scale. Double, triple and quad sheets 
+        are joined, alternative 1:1 000 000 sheets are not joined above 76 
+        degrees. Rows above 88 degrees of 1:1 000 000 are the pole sheet Z.
+    """
+    if scale == '1m' and row >= POLE_ROW:
+        return 0, 60 * UNITS, POLE_ROW * UNITS, POLE_ROW * UNITS + UNITS // 2
+
+    parts = util.scale_parts[scale]
+    step = UNITS // parts
+    width = get_polar_width(scale, row // parts)
+    if alternative and width == polar_widths[scale][1]:
+        width = 1
+    col = col // width * width
+    return col * step, (col + width) * step, row * step, (row + 1) * step
+
+def to_degrees(min_col, max_col, min_row, max_row, is_south = False):
+    """Converts bbox in units to (min_x, max_x, min_y, max_y) in degrees. 
+        Latitudes of southern sheets are negated as in text.text_to_*
+    """
+    mult = -1.0 if is_south else 1.0
+    return min_col * 6.0 / UNITS - 180.0, max_col * 6.0 / UNITS - 180.0, \
+        min_row * 4.0 / UNITS * mult, max_row * 4.0 / UNITS * mult
+
+def get_bbox(scale, is_south, row, col, alternative = False):
+    """Returns (min_x, max_x, min_y, max_y) of sheet with global (row, col)
+        in grid of scale
+    """
+    return to_degrees(*get_units(scale, row, col, alternative), is_south = is_south)
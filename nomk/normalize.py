@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Canonical form of nomenclature strings, so equal sheets written in 
+# different ways are equal strings (or identifiers, see sheetid) in joins.
+#
+# Fixed in one str.translate pass with homoglyph tables:
+#   spaces                  'N - 37 - 027' -> 'N-37-027'
+#   Latin letters in labels 'N-37-027-B' -> 'N-37-027-В' (Cyrillic В)
+#   Cyrillic row letter     'М-37' -> 'M-37', 'Н-37' -> 'H-37'
+#   Cyrillic roman figures  'N-37-ХІ' -> 'N-37-XI'
+# and then by formatting of parsed parts:
+#   zero padding            'N-37-27-В' -> 'N-37-027-В', 'N-37-027-(64)' -> 'N-37-027-(064)'
+#   1:200 000 sheets        'N-37-27' (numeric form of nomk2) -> 'N-37-XXVII'
+#                           with numeric_200k or scale '200k'
+#   nomk2 brackets          'N-37-87(70-и)' -> 'N-37-087-(070)-и'
+#
+# Bare number after zone is 1:100 000 sheet as parser.parse reads it. Set 
+# numeric_200k to read two digit numbers (up to 36) as numeric 1:200 000 
+# sheets of nomk2 or scale '200k' to read any numbers so.
+#
+# Example:
+#   from nomk import normalize
+#   normalize.normalize(' N-37-27-B ')  # 'N-37-027-В'
+#   normalize.normalize_many(['N-37-XXVII', 'N-37-27'], roman = False, numeric_200k = True)  # ['N-37-27', 'N-37-27']
+#   normalize.normalize_keys(['N-37-027-В', 'N-37-27-B'])  # equal sheet identifiers
+
+import re
+from . import parser, sheetid, util
+
+# Cyrillic letters and Latin letters which look the same
+homoglyphs = {
+    u'А': 'A', u'В': 'B', u'Е': 'E', u'К': 'K', u'М': 'M', u'Н': 'H', u'О': 'O', 
+    u'Р': 'P', u'С': 'C', u'Т': 'T', u'Х': 'X', u'І': 'I', u'У': 'Y',
+    u'а': 'a', u'е': 'e', u'о': 'o', u'р': 'p', u'с': 'c', u'х': 'x', u'у': 'y', u'і': 'i',
+}
+
+def _label_table():
+    # Latin homoglyphs of Cyrillic labels to Cyrillic, Cyrillic homoglyphs of
+    # roman figures to Latin, spaces are removed
+    table = dict((ord(char), None) for char in u' \t\r\n\u00a0')
+    cyrillic = util.ru_letters + [letter.lower() for letter in util.ru_letters] + util.ru_letters_small
+    for cyrillic_char, latin_char in homoglyphs.items():
+        if cyrillic_char in cyrillic:
+            table[ord(latin_char)] = cyrillic_char
+        elif latin_char in 'IVX':
+            table[ord(cyrillic_char)] = latin_char
+    return table
+
+def _row_table():
+    # Row letter in Latin upper case
+    table = dict((ord(cyrillic_char), latin_char.upper()) for cyrillic_char, latin_char in homoglyphs.items() 
+        if latin_char.upper() in util.letters)
+    table.update((ord(letter.lower()), letter) for letter in util.letters)
+    return table
+
+label_table = _label_table()
+row_table = _row_table()
+
+# Forms of other writers: numeric 1:200 000 sheets and brackets of nomk2
+_numeric_200k = re.compile(r'^([A-V]-\d+-)(\d\d(?:,\d\d)*)({})?$'.format(parser.south_suffix()))
+_numeric_200k_scale = re.compile(r'^([A-V]-\d+-)(\d+(?:,\d+)*)({})?$'.format(parser.south_suffix()))
+_nomk2_brackets = re.compile(r'-(\d+)\((\d+)(?:-(\w))?\)')
+
+def _to_roman(match):
+    # Returns None if numbers can not be 1:200 000 sheets
+    labels = []
+    for number in match.group(2).split(','):
+        number = int(number)
+        if number < 1 or number > len(util.roman_figures):
+            return None
+        labels.append(util.roman_figures[number - 1])
+    return match.group(1) + ','.join(labels) + (match.group(3) or '')
+
+def _nomk2_to_parser(match):
+    nomk_str = '-{}-({})'.format(match.group(1), match.group(2))
+    return nomk_str + '-' + match.group(3) if match.group(3) else nomk_str
+
+def _translate(nomk_str):
+    nomk_str = nomk_str.translate(label_table)
+    return nomk_str[:1].translate(row_table) + nomk_str[1:]
+
+def _prepare(nomk_str, scale, numeric_200k):
+    # String which parser.parse reads from translated string
+    if scale == '200k' or (not scale and numeric_200k):
+        result = (_numeric_200k_scale if scale else _numeric_200k).match(nomk_str)
+        roman_str = _to_roman(result) if result is not None else None
+        if roman_str is not None:
+            return roman_str, '200k'
+    if '(' in nomk_str and '-(' not in nomk_str:
+        nomk_str = _nomk2_brackets.sub(_nomk2_to_parser, nomk_str, 1)
+    return nomk_str, scale
+
+def _format_label(level, value):
+    # Label of level as coord.coords_to_* writes it or exception
+    _, valid_labels, width = level
+    label = '{:0{}d}'.format(value, width) if width else value
+    if label not in valid_labels:
+        raise Exception('Unsupported sheet part {}'.format(value))
+    return label
+
+def _parse(nomk_str, scale, numeric_200k):
+    # Parts of translated string, zone is checked as other parts
+    scale, parts, is_south = parser.parse(*_prepare(nomk_str, scale, numeric_200k))
+    _format_label(parser.validation_levels[scale][0], parts[1])
+    return scale, parts, is_south
+
+def normalize_key(nomk_str, scale = '', numeric_200k = False):
+    """Returns identifier of sheet (see sheetid) for nomenclature in any of 
+        supported forms. Raises exception if not parsed.
+    """
+    return sheetid.from_parts(*_parse(_translate(nomk_str), scale, numeric_200k))
+
+# Rows of 1:1 000 000 sheets below 60 degrees, where sheets are not joined
+_regular_rows = frozenset(util.letters[:15])
+
+def _roman_to_number(labels):
+    return ','.join('{:02d}'.format(util.roman_figures.index(label) + 1) for label in labels.split(','))
+
+def _format(scale, parts, is_south, roman):
+    # Canonical nomenclature of sheet, the same as coord.coords_to_* returns.
+    # Labels are checked by sets of valid labels of parser.validate.
+    suffix = util.south_suffix() if is_south else ''
+    if sheetid.get_polar_width(scale, util.letters.index(parts[0])) > 1:
+        # Joined sheets
+        nomk_str = sheetid.to_nomk(sheetid.from_parts(scale, parts, is_south))[0]
+        if scale == '200k' and not roman:
+            prefix, labels = nomk_str[:len(nomk_str) - len(suffix)].rsplit('-', 1)
+            nomk_str = prefix + '-' + _roman_to_number(labels) + suffix
+        return nomk_str
+
+    labels = [parts[0]]
+    for level, value in zip(parser.validation_levels[scale], parts[1:]):
+        label = _format_label(level, value)
+        kind = level[0]
+        if kind == parser._OPEN:
+            label = '(' + label + ')'
+        elif kind == parser._ROMAN and not roman:
+            label = _roman_to_number(label)
+        labels.append(label)
+    return '-'.join(labels) + suffix
+
+def normalize(nomk_str, scale = '', roman = True, numeric_200k = False):
+    """Returns canonical nomenclature (as coord.coords_to_* returns) for 
+        nomenclature in any of supported forms. 1:200 000 sheets are numeric
+        as in nomk2 if roman is False, set numeric_200k to read them so. 
+        Raises exception if not parsed.
+    """
+    nomk_str = _translate(nomk_str)
+    if nomk_str[:1] in _regular_rows and ',' not in nomk_str:
+        # Already canonical string of sheet which is not joined
+        valid = parser._valid_regex.match(nomk_str)
+        if valid is not None:
+            valid_scale = parser._valid_scales[valid.lastindex - 1]
+            if (not scale or scale == valid_scale) and (roman or valid_scale != '200k'):
+                return nomk_str
+
+    return _format(*_parse(nomk_str, scale, numeric_200k), roman)
+
+def _map(func, nomks, *args):
+    # Results of func for column, None for strings which are not parsed. 
+    # Equal strings are processed once.
+    results = {}
+    mapped = []
+    for nomk_str in nomks:
+        try:
+            mapped.append(results[nomk_str])
+            continue
+        except KeyError:
+            pass
+        except TypeError:
+            # Not hashable
+            mapped.append(None)
+            continue
+        try:
+            result = func(nomk_str, *args)
+        except Exception:
+            result = None
+        results[nomk_str] = result
+        mapped.append(result)
+    return mapped
+
+def normalize_many(nomks, scale = '', roman = True, numeric_200k = False):
+    """Returns list of canonical nomenclatures (see normalize) for column of
+        nomenclatures, None for strings which are not parsed
+    """
+    return _map(normalize, nomks, scale, roman, numeric_200k)
+
+def normalize_keys(nomks, scale = '', numeric_200k = False):
+    """Returns list of sheet identifiers (see normalize_key) for column of
+        nomenclatures, None for strings which are not parsed
+    """
+    return _map(normalize_key, nomks, scale, numeric_200k)
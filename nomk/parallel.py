@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Conversion of large point sets in a pool of worker processes.
+#
+# Example:
+#   from nomk import parallel
+#   points = ((37.0, 55.0), (37.6, 55.7))
+#   for nomk, min_x, max_x, min_y, max_y in parallel.coords_to_many(points, '100k', jobs=4):
+#       print(nomk)
+
+import collections
+import functools
+import itertools
+import multiprocessing
+from . import coord
+
+DEFAULT_CHUNK_SIZE = 10000
+
+coords_to_funcs = {
+    '1m': coord.coords_to_1m,
+    '500k': coord.coords_to_500k,
+    '200k': coord.coords_to_200k,
+    '100k': coord.coords_to_100k,
+    '50k': coord.coords_to_50k,
+    '25k': coord.coords_to_25k,
+    '10k': coord.coords_to_10k,
+    '5k': coord.coords_to_5k,
+    '2k': coord.coords_to_2k,
+    'all': coord.coords_to_all,
+}
+
+def _chunks(iterable, chunk_size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _map_chunk(func, items):
+    return [func(item) for item in items]
+
+def imap(func, iterable, jobs = None, chunk_size = DEFAULT_CHUNK_SIZE):
+    """Yields func(item) for every item of iterable in the input order.
+
+        Items are split into chunks of chunk_size, which are processed by 
+        jobs worker processes (number of CPUs by default, 1 processes in the
+        current process). Not more than two chunks per worker are in flight,
+        so memory use does not depend on input size. Func should be picklable
+        (module level function or functools.partial of it). An exception 
+        raised by func is raised by the generator.
+    """
+    if chunk_size < 1:
+        raise Exception('Chunk size should be positive')
+    if jobs is None:
+        jobs = multiprocessing.cpu_count()
+
+    if jobs <= 1:
+        for item in iterable:
+            yield func(item)
+        return
+
+    pool = multiprocessing.Pool(jobs)
+    try:
+        pending = collections.deque()
+        for chunk in _chunks(iterable, chunk_size):
+            if len(pending) >= jobs * 2:
+                for result in pending.popleft().get():
+                    yield result
+            pending.append(pool.apply_async(_map_chunk, (func, chunk)))
+        while pending:
+            for result in pending.popleft().get():
+                yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+def _convert_point(scale, point):
+    return coords_to_funcs[scale](*point)
+
+def coords_to_many(points, scale, jobs = None, chunk_size = DEFAULT_CHUNK_SIZE):
+    """Yields coord.coords_to_* results for iterable of (x, y) points in 
+        the input order. Scale 'all' yields coord.coords_to_all results.
+
+        Points are converted by imap with jobs processes and chunk_size.
+    """
+    if scale not in coords_to_funcs:
+        raise Exception('Unsupported scale {}'.format(scale))
+    return imap(functools.partial(_convert_point, scale), points, jobs, chunk_size)
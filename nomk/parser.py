@@ -58,87 +58,163 @@ def get_first_sym(val):
     parts = some_str.split('-')
     return parts[0]
 
+regex_1m = r'^([A-V])-((,?\d+)+)\s?({})?'.format(south_suffix())
+regex_500k = r'^([A-V])-((,?\d+-(,?[А-Г])+)+)\s?({})?'.format(south_suffix())
+regex_200k = r'^([A-V])-((,?\d+-(,?[IVX]+)+)+)\s?({})?'.format(south_suffix())
+regex_100k = r'^([A-V])-(\d+)-((,?\d+)+)\s?({})?'.format(south_suffix())
+regex_50k = r'^([A-V])-(\d+)-((,?\d+)-(,?[А-Г])+)+\s?({})?'.format(south_suffix())
+regex_25k = r'^([A-V])-(\d+)-(\d+)-(,?[А-Г]-(,?[а-г])+)+\s?({})?'.format(south_suffix())
+regex_10k = r'^([A-V])-(\d+)-(\d+)-([А-Г])-((,?[а-г])+-(,?\d)+)+\s?({})?'.format(south_suffix())
+regex_5k = r'^([A-V])-(\d+)-(\d+)-\((,?\d+)+\)\s?({})?'.format(south_suffix())
+regex_2k = r'^([A-V])-(\d+)-(\d+)-\((,?\d+)+\)-(,?[а-и])+\s?({})?'.format(south_suffix())
+
+# Functions below get tuple of regex groups, so group(N) is groups[N - 1]
+
+def _parse1m(groups):
+    letter = groups[0]
+    number = int(groups[2].replace(',', ''))
+    return [letter, number], groups[3] != None
+
+def _parse500k(groups):
+    letter = groups[0]
+    number = int(get_first_sym(groups[2]))
+    last_letter = groups[3].replace(',', '')
+    return [letter, number, last_letter], groups[4] != None
+
+def _parse200k(groups):
+    letter = groups[0]
+    number = int(get_first_sym(groups[1]))
+    last_letter = groups[3].replace(',', '')
+    return [letter, number, last_letter], groups[4] != None
+
+def _parse100k(groups):
+    letter = groups[0]
+    number = int(get_first_sym(groups[1]))
+    last_letter = groups[3].replace(',', '')
+    last_letter_num = int(last_letter)
+    return [letter, number, last_letter_num], groups[4] != None
+
+def _parse50k(groups):
+    letter = groups[0]
+    number = int(get_first_sym(groups[1]))
+    last_number = groups[3].replace(',', '')
+    last_number_num = int(last_number)
+    last_letter = groups[4].replace(',', '')
+    return [letter, number, last_number_num, last_letter], groups[5] != None
+
+def _parse25k(groups):
+    letter = groups[0]
+    number = int(groups[1])
+    number2 = int(groups[2])
+    letter2 = get_first_sym(groups[3])
+    last_letter = groups[4].replace(',', '')
+    return [letter, number, number2, letter2, last_letter], groups[5] != None
+
+def _parse10k(groups):
+    letter = groups[0]
+    number = int(groups[1])
+    number2 = int(groups[2])
+    letter2 = groups[3].replace(',', '')
+    last_letter = groups[5].replace(',', '')
+    last_number = int(groups[6].replace(',', ''))
+    return [letter, number, number2, letter2, last_letter, last_number], groups[7] != None
+
+def _parse5k(groups):
+    letter = groups[0]
+    number = int(groups[1])
+    number2 = int(groups[2])
+    last_number = int(groups[3].replace(',', ''))
+    return [letter, number, number2, last_number], groups[4] != None
+
+def _parse2k(groups):
+    letter = groups[0]
+    number = int(groups[1])
+    number2 = int(groups[2])
+    last_number = int(groups[3])
+    last_letter = groups[4].replace(',', '')
+    return [letter, number, number2, last_number, last_letter], groups[5] != None
+
+# Scales in order of testing if scale is not set. The first matched pattern wins.
+parsers = [
+    ('2k', re.compile(regex_2k), _parse2k),
+    ('5k', re.compile(regex_5k), _parse5k),
+    ('10k', re.compile(regex_10k), _parse10k),
+    ('25k', re.compile(regex_25k), _parse25k),
+    ('50k', re.compile(regex_50k), _parse50k),
+    ('100k', re.compile(regex_100k), _parse100k),
+    ('200k', re.compile(regex_200k), _parse200k),
+    ('500k', re.compile(regex_500k), _parse500k),
+    ('1m', re.compile(regex_1m), _parse1m),
+]
+scale_regexes = dict((scale, regex) for scale, regex, _ in parsers)
+scale_parsers = dict((scale, parse_func) for scale, _, parse_func in parsers)
+
+# All patterns in one alternation: the regex engine tries them in the same 
+# order as separate patterns, so one match finds the scale. Every pattern is 
+# wrapped in a group, which index identifies the matched scale.
+_all_groups = {}
+_all_patterns = []
+_group_index = 1
+for _pos, (_scale, _regex, _) in enumerate(parsers):
+    _all_groups[_group_index] = (_pos, _group_index, _group_index + _regex.groups)
+    _all_patterns.append('({})'.format(_regex.pattern))
+    _group_index += _regex.groups + 1
+regex_all = re.compile('|'.join(_all_patterns))
+
 def parse1m(nomk_str):
-    regex_1m = r'^([A-V])-((,?\d+)+)\s?({})?'.format(south_suffix())
-    result = re.match(regex_1m, nomk_str)
-    letter = result.group(1)
-    number = int(result.group(3).replace(',', ''))
-    return [letter, number], result.group(4) != None
+    return _parse1m(scale_regexes['1m'].match(nomk_str).groups())
 
 def parse500k(nomk_str):
-    regex_500k = r'^([A-V])-((,?\d+-(,?[А-Г])+)+)\s?({})?'.format(south_suffix())
-    result = re.match(regex_500k, nomk_str)
-    letter = result.group(1)
-    number = int(get_first_sym(result.group(3)))
-    last_letter = result.group(4).replace(',', '')
-    return [letter, number, last_letter], result.group(5) != None
+    return _parse500k(scale_regexes['500k'].match(nomk_str).groups())
 
 def parse200k(nomk_str):
-    regex_200k = r'^([A-V])-((,?\d+-(,?[IVX]+)+)+)\s?({})?'.format(south_suffix())
-    result = re.match(regex_200k, nomk_str)
-    letter = result.group(1)
-    number = int(get_first_sym(result.group(2)))
-    last_letter = result.group(4).replace(',', '')
-    return [letter, number, last_letter], result.group(5) != None
+    return _parse200k(scale_regexes['200k'].match(nomk_str).groups())
 
 def parse100k(nomk_str):
-    regex_100k = r'^([A-V])-(\d+)-((,?\d+)+)\s?({})?'.format(south_suffix())
-    result = re.match(regex_100k, nomk_str)
-    letter = result.group(1)
-    number = int(get_first_sym(result.group(2)))
-    last_letter = result.group(4).replace(',', '')
-    last_letter_num = int(last_letter)
-    return [letter, number, last_letter_num], result.group(5) != None
+    return _parse100k(scale_regexes['100k'].match(nomk_str).groups())
 
 def parse50k(nomk_str):
-    regex_50k = r'^([A-V])-(\d+)-((,?\d+)-(,?[А-Г])+)+\s?({})?'.format(south_suffix())
-    result = re.match(regex_50k, nomk_str)
-    letter = result.group(1)
-    number = int(get_first_sym(result.group(2)))
-    last_number = result.group(4).replace(',', '')
-    last_number_num = int(last_number)
-    last_letter = result.group(5).replace(',', '')
-    return [letter, number, last_number_num, last_letter], result.group(6) != None
+    return _parse50k(scale_regexes['50k'].match(nomk_str).groups())
 
 def parse25k(nomk_str):
-    regex_25k = r'^([A-V])-(\d+)-(\d+)-(,?[А-Г]-(,?[а-г])+)+\s?({})?'.format(south_suffix())
-    result = re.match(regex_25k, nomk_str)
-    letter = result.group(1)
-    number = int(result.group(2))
-    number2 = int(result.group(3))
-    letter2 = get_first_sym(result.group(4))
-    last_letter = result.group(5).replace(',', '')
-    return [letter, number, number2, letter2, last_letter], result.group(6) != None
+    return _parse25k(scale_regexes['25k'].match(nomk_str).groups())
 
 def parse10k(nomk_str):
-    regex_10k = r'^([A-V])-(\d+)-(\d+)-([А-Г])-((,?[а-г])+-(,?\d)+)+\s?({})?'.format(south_suffix())
-    result = re.match(regex_10k, nomk_str)
-    letter = result.group(1)
-    number = int(result.group(2))
-    number2 = int(result.group(3))
-    letter2 = result.group(4).replace(',', '')
-    last_letter = result.group(6).replace(',', '')
-    last_number = int(result.group(7).replace(',', ''))
-    return [letter, number, number2, letter2, last_letter, last_number], result.group(8) != None
+    return _parse10k(scale_regexes['10k'].match(nomk_str).groups())
 
 def parse5k(nomk_str):
-    regex_5k = r'^([A-V])-(\d+)-(\d+)-\((,?\d+)+\)\s?({})?'.format(south_suffix())
-    result = re.match(regex_5k, nomk_str)
-    letter = result.group(1)
-    number = int(result.group(2))
-    number2 = int(result.group(3))
-    last_number = int(result.group(4).replace(',', ''))
-    return [letter, number, number2, last_number], result.group(5) != None
+    return _parse5k(scale_regexes['5k'].match(nomk_str).groups())
 
 def parse2k(nomk_str):
-    regex_2k = r'^([A-V])-(\d+)-(\d+)-\((,?\d+)+\)-(,?[а-и])+\s?({})?'.format(south_suffix())
-    result = re.match(regex_2k, nomk_str)
-    letter = result.group(1)
-    number = int(result.group(2))
-    number2 = int(result.group(3))
-    last_number = int(result.group(4))
-    last_letter = result.group(5).replace(',', '')
-    return [letter, number, number2, last_number, last_letter], result.group(6) != None
+    return _parse2k(scale_regexes['2k'].match(nomk_str).groups())
+
+def detect(nomk_str):
+    """Detects scale of nomenclature string in one regex match. 
+
+        Returns scale and list of parts of first sheet or raises exception
+    """
+    result = regex_all.match(nomk_str)
+    if result is None:
+        raise Exception('Failed to parse')
+
+    pos, begin, end = _all_groups[result.lastindex]
+    scale, _, parse_func = parsers[pos]
+    try:
+        return (scale,) + parse_func(result.groups()[begin:end])
+    except (ValueError, AttributeError):
+        pass
+
+    # Matched pattern has wrong values, try the rest ones as before
+    for scale, regex, parse_func in parsers[pos + 1:]:
+        result = regex.match(nomk_str)
+        if result is None:
+            continue
+        try:
+            return (scale,) + parse_func(result.groups())
+        except (ValueError, AttributeError):
+            pass
+
+    raise Exception('Failed to parse')
 
 def parse(nomk_str, scale = ''):
     """Parses input nomenclature string and returns scale and 
@@ -149,69 +225,284 @@ def parse(nomk_str, scale = ''):
 
     nomk_str = nomk_str.strip().replace(" ", "")
 
-    if scale == '1m':
-        return ('1m',) + parse1m(nomk_str)
-    elif scale == '500k':
-        return ('500k',) + parse500k(nomk_str)
-    elif scale == '200k':
-        return ('200k',) + parse200k(nomk_str)
-    elif scale == '100k':
-        return ('100k',) + parse100k(nomk_str)
-    elif scale == '50k':
-        return ('50k',) + parse50k(nomk_str)
-    elif scale == '25k':
-        return ('25k',) + parse25k(nomk_str)
-    elif scale == '10k':
-        return ('10k',) + parse10k(nomk_str)
-    elif scale == '5k':
-        return ('5k',) + parse5k(nomk_str)
-    elif scale == '2k':
-        return ('2k',) + parse2k(nomk_str)
-    else:
-        # Test all parsers
-        try:
-            return ('2k',) + parse2k(nomk_str)
-        except:
-            pass
+    if scale in scale_parsers:
+        return (scale,) + scale_parsers[scale](scale_regexes[scale].match(nomk_str).groups())
 
-        try:
-            return ('5k',) + parse5k(nomk_str)
-        except:
-            pass
+    return detect(nomk_str)
 
-        try:
-            return ('10k',) + parse10k(nomk_str)
-        except:
-            pass
+# Validation without exceptions. The string is split to tokens by one regex 
+# pass, the sequence of labels of the first sheet detects the scale and the 
+# labels of all sheets are checked against the sets of valid labels. 
+# Validation is stricter than parse: the whole string must be nomenclature, 
+# numbers must be zero padded as in coord.coords_to_* and labels of joined 
+# sheets must be separated by commas.
 
-        try:
-            return ('25k',) + parse25k(nomk_str)
-        except:
-            pass
+ERROR_EMPTY = 'empty'
+ERROR_LETTER = 'letter'
+ERROR_ALPHABET = 'alphabet'
+ERROR_SEPARATOR = 'separator'
+ERROR_PART = 'part'
+ERROR_BRACKET = 'bracket'
+ERROR_PADDING = 'padding'
+ERROR_RANGE = 'range'
+ERROR_TRAILING = 'trailing'
+ERROR_TYPE = 'type'
 
-        try:
-            return ('50k',) + parse50k(nomk_str)
-        except:
-            pass
+# Inside the string parse removes only spaces, and its regexes allow one 
+# whitespace before the suffix of southern hemisphere. Other whitespaces 
+# are tokens of invalid characters.
+_validate_tokens = re.compile(r' *(?:\s *(?={0}))?({0}|\d+|[IVX]+|\S|\s)'.format(south_suffix()))
+_SOUTH, _DIGITS, _ROMAN, _UPPER, _LOWER, _LETTER, _DASH, _COMMA, _OPEN, _CLOSE, _OTHER = range(1, 12)
 
-        try:
-            return ('100k',) + parse100k(nomk_str)
-        except:
-            pass
+def _get_kind(token):
+    # Any letter which is not Cyrillic and can not be row letter or roman 
+    # figure is a letter of wrong alphabet (Latin A instead of Cyrillic А)
+    if len(token) > 1:
+        return _SOUTH if token[0] == '(' else _DIGITS if token[0].isdigit() else _ROMAN
+    if token in 'IVX':
+        return _ROMAN
+    if u'А' <= token <= u'Я' or token == u'Ё':
+        return _UPPER
+    if u'а' <= token <= u'я' or token == u'ё':
+        return _LOWER
+    if token.isalpha():
+        return _LETTER
+    if token.isdigit():
+        return _DIGITS
+    return {'-': _DASH, ',': _COMMA, '(': _OPEN, ')': _CLOSE}.get(token, _OTHER)
 
-        try:
-            return ('200k',) + parse200k(nomk_str)
-        except:
-            pass
+_row_letters = frozenset(util.letters[:22])
 
-        try:
-            return ('500k',) + parse500k(nomk_str)
-        except:
-            pass    
+def _number_labels(width, count):
+    return frozenset('{:0{}d}'.format(number, width) for number in range(1, count + 1))
 
-        try:
-            return ('1m',) + parse1m(nomk_str)
-        except:
-            pass
- 
-        raise Exception('Failed to parse')
+# Levels as (kind of label token, valid labels, width of zero padded numbers),
+# _OPEN is number in brackets
+_zone_level = (_DIGITS, _number_labels(2, 60), 2)
+_100k_level = (_DIGITS, _number_labels(3, 144), 3)
+_500k_level = (_UPPER, frozenset(util.ru_letters), 0)
+_25k_level = (_LOWER, frozenset(letter.lower() for letter in util.ru_letters), 0)
+_5k_level = (_OPEN, _number_labels(3, 256), 3)
+
+validation_levels = {
+    '1m': (_zone_level,),
+    '500k': (_zone_level, _500k_level),
+    '200k': (_zone_level, (_ROMAN, frozenset(util.roman_figures), 0)),
+    '100k': (_zone_level, _100k_level),
+    '50k': (_zone_level, _100k_level, _500k_level),
+    '25k': (_zone_level, _100k_level, _500k_level, _25k_level),
+    '10k': (_zone_level, _100k_level, _500k_level, _25k_level, (_DIGITS, _number_labels(1, 4), 1)),
+    '5k': (_zone_level, _100k_level, _5k_level),
+    '2k': (_zone_level, _100k_level, _5k_level, (_LOWER, frozenset(util.ru_letters_small), 0)),
+}
+
+# Max number of labels of joined sheets after comma (T-47-А,Б,48-А,Б), 
+# joined 1:5 000 sheets are listed in brackets
+joined_depths = {'1m': 1, '500k': 2, '200k': 2, '100k': 1, '50k': 2, '25k': 2, '10k': 2, '5k': 0, '2k': 1}
+
+_signatures = dict((tuple(level[0] for level in levels), scale) for scale, levels in validation_levels.items())
+_next_kinds = {}
+for _signature in _signatures:
+    for _pos in range(len(_signature)):
+        _next_kinds.setdefault(_signature[:_pos], set()).add(_signature[_pos])
+
+# Kinds of frequent tokens: characters, south suffix and valid labels
+_token_kinds = dict((token, _get_kind(token)) for token in 
+    list(u'-,()0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+        u'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдеёжзийклмнопрстуфхцчшщъыьэюя') + 
+    [util.south_suffix()] + [label for levels in validation_levels.values() for level in levels for label in level[1]])
+
+def _labels_regex(labels):
+    # Regex of set of labels as trie, so it is matched without backtracking
+    trie = {}
+    for label in labels:
+        node = trie
+        for char in label:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def to_regex(node):
+        items = [re.escape(char) + to_regex(child) for char, child in sorted(node.items()) if char]
+        if not items:
+            return ''
+        regex = items[0] if len(items) == 1 else '(?:{})'.format('|'.join(items))
+        return '(?:{})?'.format(regex) if '' in node else regex
+    return to_regex(trie)
+
+def _level_regex(level, is_last):
+    regex = _labels_regex(level[1])
+    if level[0] == _OPEN:
+        return r'\({}{}\)'.format(regex, '(?:,{})*'.format(regex) if is_last else '')
+    return regex
+
+def _scale_regex(scale):
+    levels = validation_levels[scale]
+    regexes = [_level_regex(level, pos == len(levels) - 1) for pos, level in enumerate(levels)]
+    joined = regexes[-1]
+    for regex in reversed(regexes[-joined_depths[scale]:-1]):
+        joined = '(?:{}-)?{}'.format(regex, joined)
+    regex = '-'.join(regexes)
+    if joined_depths[scale] > 0:
+        regex += '(?:,{})*'.format(joined)
+    return regex
+
+# Strict patterns of all scales for valid strings without spaces inside, the
+# index of matched group is the index of scale in _valid_scales. Strings which 
+# do not match are checked token by token to find the error.
+_valid_scales = list(validation_levels)
+_valid_regex = re.compile(r'\s*[A-V]-(?:{})(?:{})?\s*\Z'.format(
+    '|'.join('({})'.format(_scale_regex(scale)) for scale in _valid_scales), south_suffix()))
+
+def _check_values(level, tokens, indexes):
+    # Returns (error, token index) of the first invalid value of label or None
+    _, labels, width = level
+    for index in indexes:
+        value = tokens[index]
+        if value not in labels:
+            if width and value.isdigit() and value.lstrip('0').zfill(width) in labels:
+                return ERROR_PADDING, index
+            return ERROR_RANGE, index
+    return None
+
+def _scan(tokens, kinds):
+    # Splits tokens to sheets as lists of labels (kind, token index, token 
+    # indexes of values). Returns sheets and (error, token index) of the first
+    # error in the structure or None, index of the end of string is the number
+    # of tokens.
+    count = len(tokens)
+    sheets = []
+    labels = []
+    index = 2
+    while True:
+        if index == count:
+            sheets.append(labels)
+            return sheets, (ERROR_PART, index)
+        kind = kinds[index]
+        if kind == _OPEN:
+            first = index
+            while True:
+                index += 1
+                if index == count or kinds[index] != _DIGITS:
+                    sheets.append(labels)
+                    return sheets, (ERROR_ALPHABET if index < count and kinds[index] == _LETTER else ERROR_BRACKET, index)
+                index += 1
+                if index == count or kinds[index] not in (_COMMA, _CLOSE):
+                    sheets.append(labels)
+                    return sheets, (ERROR_BRACKET, index)
+                if kinds[index] == _CLOSE:
+                    break
+            labels.append((kind, first, range(first + 1, index, 2)))
+        elif kind in (_DIGITS, _ROMAN, _UPPER, _LOWER):
+            labels.append((kind, index, (index,)))
+        else:
+            sheets.append(labels)
+            if kind == _LETTER:
+                return sheets, (ERROR_ALPHABET, index)
+            elif kind == _CLOSE or tokens[index] in '[]{}':
+                return sheets, (ERROR_BRACKET, index)
+            return sheets, (ERROR_PART, index)
+
+        index += 1
+        if index == count:
+            sheets.append(labels)
+            return sheets, None
+        kind = kinds[index]
+        if kind == _DASH:
+            index += 1
+        elif kind == _COMMA:
+            sheets.append(labels)
+            labels = []
+            index += 1
+        elif kind == _SOUTH:
+            sheets.append(labels)
+            if index + 1 < count:
+                return sheets, (ERROR_TRAILING, index + 1)
+            return sheets, None
+        else:
+            sheets.append(labels)
+            return sheets, (ERROR_ALPHABET if kind == _LETTER else ERROR_SEPARATOR, index)
+
+def _check_tokens(tokens, kinds):
+    # Returns (scale, None, None) or (None, error, token index)
+    if not tokens:
+        return None, ERROR_EMPTY, 0
+    if kinds[0] not in (_LETTER, _ROMAN) or tokens[0] not in _row_letters:
+        return None, ERROR_ALPHABET if kinds[0] in (_UPPER, _LOWER) else ERROR_LETTER, 0
+    if len(tokens) == 1 or kinds[1] != _DASH:
+        return None, ERROR_SEPARATOR, 1
+
+    sheets, error = _scan(tokens, kinds)
+
+    # The first sheet detects the scale. Labels before error in structure 
+    # are checked by scale of their signature, all its prefixes are valid.
+    signature = tuple(kind for kind, _, _ in sheets[0])
+    scale = _signatures.get(signature)
+    if scale is None:
+        for pos, kind in enumerate(signature):
+            expected = _next_kinds.get(signature[:pos], ())
+            if kind not in expected:
+                error = ERROR_BRACKET if kind == _OPEN or kind == _DIGITS and _OPEN in expected else ERROR_PART, sheets[0][pos][1]
+                sheets = [sheets[0][:pos]]
+                scale = _signatures.get(signature[:pos])
+                break
+        if scale is None:
+            # No zone
+            return (None,) + error
+
+    levels = validation_levels[scale]
+    for sheet_pos, sheet in enumerate(sheets):
+        sheet_levels = levels
+        if sheet_pos > 0 and sheet:
+            if len(sheet) > joined_depths[scale]:
+                return (None, ERROR_PART, sheet[0][1]) if error is None or sheet[0][1] < error[1] else (None,) + error
+            sheet_levels = levels[-len(sheet):]
+        for level, (kind, index, values) in zip(sheet_levels, sheet):
+            if error is not None and index > error[1]:
+                break
+            if kind != level[0]:
+                return None, ERROR_BRACKET if _OPEN in (kind, level[0]) else ERROR_PART, index
+            if len(values) > 1 and level is not levels[-1]:
+                return None, ERROR_BRACKET, values[1] - 1
+            value_error = _check_values(level, tokens, values)
+            if value_error is not None:
+                return (None,) + value_error
+    if error is not None:
+        return (None,) + error
+    return scale, None, None
+
+def validate(nomk_str):
+    """Checks nomenclature string and never raises exceptions. 
+
+        Returns (scale, None, None) for valid string or (None, error, position)
+        where error is one of ERROR_* codes and position is index of the 
+        character in the string where validation failed
+    """
+    if not isinstance(nomk_str, str):
+        return None, ERROR_TYPE, 0
+    valid = _valid_regex.match(nomk_str)
+    if valid is not None:
+        return _valid_scales[valid.lastindex - 1], None, None
+
+    # Whitespaces at the ends are stripped by parse
+    stripped = nomk_str.strip()
+    tokens = _validate_tokens.findall(stripped)
+    get_kind = _token_kinds.get
+    kinds = [get_kind(token) or _get_kind(token) for token in tokens]
+    scale, error, index = _check_tokens(tokens, kinds)
+    if error is None:
+        return scale, None, None
+    start = len(nomk_str) - len(nomk_str.lstrip())
+    if index < len(tokens):
+        # Tokens are not separated by spaces in most strings
+        position = start + sum(len(token) for token in tokens[:index])
+        if stripped.startswith(''.join(tokens[:index + 1])):
+            return None, error, position
+        for pos, match in enumerate(_validate_tokens.finditer(stripped)):
+            if pos == index:
+                return None, error, start + match.start(1)
+    return None, error, start + len(stripped)
+
+def validate_many(nomks):
+    """Yields validate result (scale, error, position) for every string"""
+    for nomk_str in nomks:
+        yield validate(nomk_str)
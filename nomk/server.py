@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Long running nomenclature service. Clients send JSON requests one per line
+# over TCP or Unix socket and get JSON responses one per line in the same 
+# order. A request is an object or an array of objects, the response is an 
+# object or an array of the same length.
+#
+# Operations:
+#   {"op": "point", "x": 37.0, "y": 55.0, "scales": ["1m", "100k"]}
+#       -> {"1m": {"nomk": ..., "min_x": ..., ...}, "100k": {...}}
+#   {"op": "name", "nomk": "N-37-027", "scale": "100k"}
+#       -> {"scale": "100k", "min_x": ..., "max_x": ..., "min_y": ..., "max_y": ...}
+#   {"op": "bbox", "bbox": [min_x, min_y, max_x, max_y], "scale": "100k"}
+#       -> [{"nomk": ..., "min_x": ..., ...}, ...]
+#   {"op": "neighbors", "nomks": ["N-37-027"], "scale": "100k", "k": 2}
+#       -> ["N-37-014", ...] (neighbors without k, sheets of k-ring with k)
+#
+# Every request can have "id", which is returned in the response. Errors are
+# returned as {"id": ..., "error": "..."}. All items of a request return not
+# more than MAX_SHEETS sheets in total. Requests are handled in threads of
+# the default executor, so the event loop keeps serving other connections.
+#
+# Example:
+#   > python nomk.py --serve 127.0.0.1:8765
+#   > echo '{"op": "point", "x": 37.0, "y": 55.0}' | nc 127.0.0.1 8765
+
+import asyncio
+import itertools
+import json
+from . import algos, cache, cover, sheetid
+
+# Limits which keep memory of server bounded
+MAX_LINE = 1 << 20
+MAX_ITEMS = 10000
+MAX_SHEETS = 100000
+MAX_CONNECTIONS = 256
+
+
+class _Budget(object):
+    # Number of sheets which can be returned for the rest of request
+    def __init__(self, sheets = MAX_SHEETS):
+        self.sheets = sheets
+
+    def take(self, count):
+        if count > self.sheets:
+            raise Exception('More than {} sheets in request'.format(MAX_SHEETS))
+        self.sheets -= count
+
+
+
+def _sheet(result):
+    nomk_str, min_x, max_x, min_y, max_y = result
+    return {'nomk': nomk_str, 'min_x': min_x, 'max_x': max_x, 'min_y': min_y, 'max_y': max_y}
+
+def _scales(request):
+    scales = request.get('scales')
+    if scales is None:
+        return sheetid.scales
+    for scale in scales:
+        if scale not in sheetid.scales:
+            raise Exception('Unsupported scale {}'.format(scale))
+    return scales
+
+def _point(request, budget):
+    x = float(request['x'])
+    y = float(request['y'])
+    if x < -180.0 or x >= 180.0 or y < -90.0 or y > 90.0:
+        raise Exception('Coordinates out of bounds')
+    scales = _scales(request)
+    budget.take(len(scales))
+    return dict((scale, _sheet(cache.coords_to(x, y, scale))) for scale in scales)
+
+def _name(request, budget):
+    budget.take(1)
+    scale, min_x, max_x, min_y, max_y = cache.text_to_bbox(request['nomk'], request.get('scale', ''))
+    return {'scale': scale, 'min_x': min_x, 'max_x': max_x, 'min_y': min_y, 'max_y': max_y}
+
+def _bbox(request, budget):
+    min_x, min_y, max_x, max_y = [float(value) for value in request['bbox']]
+    scale = request['scale']
+    if scale not in sheetid.scales:
+        raise Exception('Unsupported scale {}'.format(scale))
+    sheet_ids = list(itertools.islice(cover.sheet_ids_in_bbox(min_x, min_y, max_x, max_y, scale), budget.sheets + 1))
+    budget.take(len(sheet_ids))
+    return [_sheet(cache.sheet_to_nomk(sheet_id)) for sheet_id in sheet_ids]
+
+def _neighbors(request, budget):
+    nomks = request['nomks'] if 'nomks' in request else [request['nomk']]
+    if len(nomks) > MAX_ITEMS:
+        raise Exception('More than {} sheets in request'.format(MAX_ITEMS))
+    if 'k' in request:
+        k = max(int(request['k']), 0)
+        # Every sheet adds not more than (2k + 1)^2 sheets to the ring, it 
+        # is checked before the ring is built
+        if len(nomks) * (2 * k + 1) ** 2 > budget.sheets:
+            raise Exception('More than {} sheets in request'.format(MAX_SHEETS))
+        result = list(algos.k_ring(nomks, k, request.get('scale')))
+    else:
+        result = list(algos.get_neighbors(nomks, request.get('scale')))
+    budget.take(len(result))
+    return result
+
+operations = {
+    'point': _point,
+    'name': _name,
+    'bbox': _bbox,
+    'neighbors': _neighbors,
+}
+
+def handle_item(request, budget = None):
+    """Returns response object for request object. Budget limits sheets 
+        returned for all items of request.
+    """
+    request_id = request.get('id') if isinstance(request, dict) else None
+    if budget is None:
+        budget = _Budget()
+    try:
+        if not isinstance(request, dict):
+            raise Exception('Request should be object')
+        if request.get('op') not in operations:
+            raise Exception('Unsupported operation {}'.format(request.get('op')))
+        result = operations[request['op']](request, budget)
+    except KeyError as e:
+        return {'id': request_id, 'error': 'Missing parameter {}'.format(e)}
+    except Exception as e:
+        return {'id': request_id, 'error': str(e) or e.__class__.__name__}
+    return {'id': request_id, 'result': result}
+
+def handle_request(line):
+    """Returns response line (without line end) for request line, which can
+        be UTF-8 bytes
+    """
+    if isinstance(line, bytes):
+        try:
+            line = line.decode('utf-8')
+        except UnicodeDecodeError as e:
+            return json.dumps({'id': None, 'error': 'Invalid UTF-8: {}'.format(e)})
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        return json.dumps({'id': None, 'error': 'Invalid JSON: {}'.format(e)})
+
+    if isinstance(request, list):
+        if len(request) > MAX_ITEMS:
+            return json.dumps({'id': None, 'error': 'More than {} items in request'.format(MAX_ITEMS)})
+        budget = _Budget()
+        response = [handle_item(item, budget) for item in request]
+    else:
+        response = handle_item(request)
+    return json.dumps(response, ensure_ascii = False)
+
+async def _handle_connection(reader, writer, connections):
+    # Requests of connection are handled one by one and the next line is
+    # not read until response is sent, so slow clients hold back only 
+    # themselves and buffers are bounded by MAX_LINE
+    loop = asyncio.get_running_loop()
+    async with connections:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Line is longer than limit, the rest can not be parsed
+                    writer.write(json.dumps({'id': None, 'error': 'Request is too long'}).encode() + b'\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                # Conversions are CPU bound, they do not block the event loop
+                response = await loop.run_in_executor(None, handle_request, line)
+                writer.write(response.encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+def parse_address(address):
+    """Returns (host, port) or (None, path) of unix:PATH, HOST:PORT or PORT"""
+    if address.startswith('unix:'):
+        return None, address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+async def start_server(address, max_connections = MAX_CONNECTIONS):
+    """Starts serving on address (see parse_address), returns asyncio server"""
+    connections = asyncio.Semaphore(max_connections)
+    def handler(reader, writer):
+        return _handle_connection(reader, writer, connections)
+
+    host, port = parse_address(address)
+    if host is None:
+        return await asyncio.start_unix_server(handler, port, limit = MAX_LINE)
+    return await asyncio.start_server(handler, host, port, limit = MAX_LINE)
+
+async def serve(address, max_connections = MAX_CONNECTIONS):
+    server = await start_server(address, max_connections)
+    async with server:
+        await server.serve_forever()
+
+def run(address, max_connections = MAX_CONNECTIONS):
+    """Serves on address until interrupted"""
+    try:
+        asyncio.run(serve(address, max_connections))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Compact 64-bit integer identifiers of sheets.
+#
+# Bits of identifier (from high to low):
+#   62      hemisphere (1 - southern)
+#   57..61  row of 1:1 000 000 sheet (letter index)
+#   51..56  column of 1:1 000 000 sheet (zone number - 1)
+#   43..50  index in 1:1 000 000 sheet (1:500 000, 1:200 000 or 1:100 000 sheet)
+#   35..42  index in 1:100 000 sheet (1:50 000 or 1:5 000 sheet)
+#   31..34  index in 1:50 000 or 1:5 000 sheet (1:25 000 or 1:2 000 sheet)
+#   29..30  index in 1:25 000 sheet (1:10 000 sheet)
+#   0..3    scale
+#
+# Indexes are positions in subdivision tables (see util), so the identifier of
+# the parent sheet is the identifier with child indexes cleared and other
+# scale. Double, triple and quad sheets are identified by their first
+# (western) part.
+
+from . import coord, grid, parser, util
+
+scales = ['1m', '500k', '200k', '100k', '50k', '25k', '10k', '5k', '2k']
+
+parents = {
+    '500k': '1m',
+    '200k': '1m',
+    '100k': '1m',
+    '50k': '100k',
+    '25k': '50k',
+    '10k': '25k',
+    '5k': '100k',
+    '2k': '5k',
+}
+
+# Subdivision of every level as number of columns (rows) in parent sheet
+levels = {
+    '1m': (),
+    '500k': (2,),
+    '200k': (6,),
+    '100k': (12,),
+    '50k': (12, 2),
+    '25k': (12, 2, 2),
+    '10k': (12, 2, 2, 2),
+    '5k': (12, 16),
+    '2k': (12, 16, 3),
+}
+
+# Number of sheets joined by longitude between 60 and 76 and above 76 degrees
+polar_widths = grid.polar_widths
+
+# Labels of subdivisions in nomenclature for every level
+labels = {
+    '1m': (),
+    '500k': ('ru',),
+    '200k': ('roman',),
+    '100k': ('num',),
+    '50k': ('num', 'ru'),
+    '25k': ('num', 'ru', 'ru_low'),
+    '10k': ('num', 'ru', 'ru_low', 'num'),
+    '5k': ('num', 'num'),
+    '2k': ('num', 'num', 'ru_small'),
+}
+
+HEMISPHERE_SHIFT = 62
+ROW_SHIFT = 57
+ZONE_SHIFT = 51
+LEVEL_SHIFTS = (43, 35, 31, 29)
+LEVEL_BITS = (8, 8, 4, 2)
+SCALE_BITS = 4
+
+SCALE_MASK = (1 << SCALE_BITS) - 1
+
+POLE_ROW = grid.POLE_ROW
+
+
+def get_parts_count(scale):
+    return util.scale_parts[scale]
+
+def get_scale(sheet_id):
+    return scales[(sheet_id & SCALE_MASK) - 1]
+
+get_polar_width = grid.get_polar_width
+
+def _encode(scale, is_south, row, zone, indexes):
+    sheet_id = (int(is_south) << HEMISPHERE_SHIFT) | (row << ROW_SHIFT) | (zone << ZONE_SHIFT)
+    for shift, index in zip(LEVEL_SHIFTS, indexes):
+        sheet_id |= index << shift
+    return sheet_id | (scales.index(scale) + 1)
+
+def _decode(sheet_id):
+    scale = get_scale(sheet_id)
+    is_south = bool(sheet_id >> HEMISPHERE_SHIFT & 1)
+    row = sheet_id >> ROW_SHIFT & 31
+    zone = sheet_id >> ZONE_SHIFT & 63
+    indexes = [sheet_id >> shift & ((1 << bits) - 1) 
+        for shift, bits, _ in zip(LEVEL_SHIFTS, LEVEL_BITS, levels[scale])]
+    return scale, is_south, row, zone, indexes
+
+def to_grid(sheet_id):
+    """Returns scale, hemisphere and global (row, col) of sheet in grid of 
+        its scale. Rows are counted from equator, columns from 180 meridian
+    """
+    scale, is_south, row, col, indexes = _decode(sheet_id)
+    for parts, index in zip(levels[scale], indexes):
+        local_row = index // parts
+        if not is_south:
+            local_row = parts - 1 - local_row
+        row = row * parts + local_row
+        col = col * parts + index % parts
+    return scale, is_south, row, col
+
+def from_grid(scale, is_south, row, col):
+    """Returns identifier of sheet with global (row, col) in grid of scale"""
+    parts_count = get_parts_count(scale)
+    if scale == '1m' and row >= POLE_ROW:
+        return _encode(scale, is_south, POLE_ROW, 0, [])
+
+    width = get_polar_width(scale, row // parts_count)
+    col = col // width * width
+
+    indexes = []
+    for parts in reversed(levels[scale]):
+        local_row = row % parts
+        if not is_south:
+            local_row = parts - 1 - local_row
+        indexes.insert(0, local_row * parts + col % parts)
+        row //= parts
+        col //= parts
+    return _encode(scale, is_south, row, col, indexes)
+
+def from_coords(x, y, scale):
+    """Returns identifier of sheet which contains point. It is the sheet 
+        which coord.coords_to_* returns except points for which 
+        grid.near_edge is true: on 60 and 76 degrees coords_to_* returns 
+        sheets which are not joined (P-37 instead of P-37,38), on 88 
+        degrees it returns sheets of row W, and its float arithmetic can 
+        round points near edges to the next sheet
+    """
+    abs_y = abs(y)
+    if abs_y > 88.0 and scale != '1m':
+        raise Exception('Unsupported latitude ({:.6f}) for this scale'.format(y))
+
+    return from_grid(scale, *grid.locate(x, y, scale))
+
+def _label_to_index(kind, label):
+    if kind == 'num':
+        return label - 1
+    elif kind == 'roman':
+        return util.roman_figures.index(label)
+    elif kind == 'ru_small':
+        return util.ru_letters_small.index(label)
+    return util.ru_letters.index(label.upper())
+
+def _index_to_label(kind, index):
+    if kind == 'num':
+        return index + 1
+    elif kind == 'roman':
+        return util.roman_figures[index]
+    elif kind == 'ru_small':
+        return util.ru_letters_small[index]
+    elif kind == 'ru_low':
+        return util.ru_letters[index].lower()
+    return util.ru_letters[index]
+
+def from_parts(scale, parts, is_south):
+    """Returns identifier of sheet by result of parser.parse"""
+    letter, number = parts[:2]
+    if number < 1 or number > 60:
+        raise Exception('Unsupported zone {}'.format(number))
+    indexes = []
+    for level_parts, kind, label in zip(levels[scale], labels[scale], parts[2:]):
+        try:
+            index = _label_to_index(kind, label)
+        except ValueError:
+            index = -1
+        if index < 0 or index >= level_parts * level_parts:
+            raise Exception('Unsupported sheet part {}'.format(label))
+        indexes.append(index)
+
+    row = util.letters.index(letter)
+    sheet_id = _encode(scale, is_south, row, number - 1, indexes)
+    if get_polar_width(scale, row) == 1:
+        return sheet_id
+    return from_grid(*to_grid(sheet_id))
+
+def from_nomk(nomk_str, scale = ''):
+    """Returns identifier of sheet by nomenclature string"""
+    scale, parts, is_south = parser.parse(nomk_str, scale)
+    return from_parts(scale, parts, is_south)
+
+def to_parts(sheet_id):
+    """Returns scale, parts and hemisphere in the format of parser.parse, 
+        which can be passed to text.text_to_* functions
+    """
+    scale, is_south, row, zone, indexes = _decode(sheet_id)
+    parts = [util.letters[row], zone + 1]
+    for kind, index in zip(labels[scale], indexes):
+        parts.append(_index_to_label(kind, index))
+    return scale, parts, is_south
+
+def to_nomk(sheet_id):
+    """Returns coord.coords_to_* result (nomk, min_x, max_x, min_y, max_y) 
+        for sheet identifier
+    """
+    scale, is_south, row, col = to_grid(sheet_id)
+    mult = -1 if is_south else 1
+    if scale == '1m' and row >= POLE_ROW:
+        return coord.coords_to_1m(0.0, 89.0 * mult)
+
+    parts = get_parts_count(scale)
+    x = (col + 0.5) * 6.0 / parts - 180.0
+    y = (row + 0.5) * 4.0 / parts * mult
+    return getattr(coord, 'coords_to_' + scale)(x, y)
+
+def to_bbox(sheet_id):
+    """Returns text.text_to_* result (scale, min_x, max_x, min_y, max_y)
+        for sheet identifier
+    """
+    scale, is_south, row, col = to_grid(sheet_id)
+    return (scale,) + grid.get_bbox(scale, is_south, row, col)
+
+def get_parent(sheet_id, scale = None):
+    """Returns identifier of parent sheet of the scale (nearest by default).
+        The scale may be any larger scale which sheets consist of whole 
+        sheets of the scale of identifier, not only one of its levels
+    """
+    child_scale, is_south, row, col = to_grid(sheet_id)
+    if scale is None:
+        scale = parents[child_scale]
+    parent_parts = get_parts_count(scale)
+    child_parts = get_parts_count(child_scale)
+    if child_parts < parent_parts or child_parts % parent_parts != 0:
+        raise Exception('Scale {} is not a parent of {}'.format(scale, child_scale))
+    # Parent of part of polar sheet can be the second part of parent polar sheet
+    ratio = child_parts // parent_parts
+    return from_grid(scale, is_south, row // ratio, col // ratio)
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Opt-in instrumentation of public functions: number of calls and latency 
+# per function and per branch (hemisphere and band of polar sheets). 
+#
+# While disabled the functions are not touched, so there is no overhead. 
+# enable() replaces functions in modules of the package (including tables of
+# functions like algos.coords_to_funcs) with counting wrappers, disable() 
+# restores them. References to functions taken before enable() are not 
+# counted.
+#
+# Example:
+#   from nomk import coord, stats
+#   stats.enable()
+#   coord.coords_to_100k(37.0, 55.0)
+#   print(stats.snapshot()['coord.coords_to_100k'])
+#   stats.disable()
+
+import functools
+import math
+import threading
+import time
+from . import algos, cache, coord, cover, parallel, parser, sheetid, stream, text, util
+
+# Latencies are kept in histogram with BUCKETS_PER_OCTAVE buckets per power
+# of two nanoseconds (about 9% width), so memory does not grow with calls
+BUCKETS_PER_OCTAVE = 8
+
+# Modules which functions and tables of functions are instrumented
+modules = [coord, text, parser, algos, cache, cover, parallel, sheetid, stream]
+
+_lock = threading.Lock()
+_counters = {}
+_patched = []
+_enabled_at = None
+
+
+class Counter(object):
+    """Calls, total time and latency histogram of function"""
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.histogram = {}
+        self.branches = {}
+
+    def add(self, branch, elapsed_ns, is_error):
+        self.count += 1
+        self.errors += is_error
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        bucket = int(math.log2(elapsed_ns + 1) * BUCKETS_PER_OCTAVE)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+        calls, total_ns = self.branches.get(branch, (0, 0))
+        self.branches[branch] = (calls + 1, total_ns + elapsed_ns)
+
+    def percentile(self, percent):
+        """Returns upper bound of latency bucket in nanoseconds"""
+        rank = self.count * percent / 100.0
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= rank:
+                return min(2.0 ** ((bucket + 1) / BUCKETS_PER_OCTAVE) - 1, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_s': self.total_ns / 1e9,
+            'mean_ns': self.total_ns / self.count if self.count else 0.0,
+            'p50_ns': self.percentile(50),
+            'p90_ns': self.percentile(90),
+            'p99_ns': self.percentile(99),
+            'max_ns': self.max_ns,
+            'branches': dict((branch, {'count': calls, 'total_s': total_ns / 1e9}) 
+                for branch, (calls, total_ns) in self.branches.items()),
+        }
+
+
+def _band(abs_row):
+    # Rows of 1:1M sheets with doubled and quadrupled (tripled) sheets
+    if abs_row >= 19:
+        return 'polar76'
+    elif abs_row >= 15:
+        return 'polar60'
+    return 'regular'
+
+def _branch(is_south, row):
+    return '{}/{}'.format('south' if is_south else 'north', _band(row))
+
+def _point_branch(args, kwargs, result):
+    y = args[1]
+    return _branch(y < 0, int(abs(y) // 4))
+
+def _text_branch(south_pos):
+    def branch(args, kwargs, result):
+        is_south = args[south_pos] if len(args) > south_pos else kwargs.get('is_south')
+        return _branch(is_south, util.letters.index(args[0]))
+    return branch
+
+def _parse_branch(args, kwargs, result):
+    # parse and detect return scale, parts and hemisphere, parse* - parts and hemisphere
+    parts, is_south = result[-2:]
+    branch = _branch(is_south, util.letters.index(parts[0]))
+    return branch if len(result) == 2 else '{}/{}'.format(result[0], branch)
+
+def _scale_branch(args, kwargs, result):
+    scale = args[1] if len(args) > 1 else kwargs.get('scale')
+    return scale if scale else 'detect'
+
+def _targets():
+    # (module, name, branch function) of instrumented functions
+    targets = []
+    for scale in sheetid.scales:
+        targets.append((coord, 'coords_to_' + scale, _point_branch))
+        text_func = getattr(text, 'text_to_' + scale)
+        targets.append((text, 'text_to_' + scale, 
+            _text_branch(text_func.__code__.co_varnames.index('is_south'))))
+        targets.append((parser, 'parse' + scale, _parse_branch))
+    targets += [
+        (coord, 'coords_to_all', _point_branch),
+        (parser, 'parse', _parse_branch),
+        (parser, 'detect', _parse_branch),
+        (algos, 'get_neighbors', _scale_branch),
+        (algos, 'get_neighbors_for_nomk', _scale_branch),
+    ]
+    return targets
+
+def _wrap(name, func, branch_func):
+    counter = _counters.setdefault(name, Counter())
+    perf_counter_ns = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            elapsed = perf_counter_ns() - start
+            with _lock:
+                counter.add('error', elapsed, True)
+            raise
+        elapsed = perf_counter_ns() - start
+        try:
+            branch = branch_func(args, kwargs, result)
+        except Exception:
+            branch = 'unknown'
+        with _lock:
+            counter.add(branch, elapsed, False)
+        return result
+    return wrapper
+
+def is_enabled():
+    return _enabled_at is not None
+
+def enable():
+    """Starts counting calls of public functions of the package"""
+    global _enabled_at
+    if is_enabled():
+        return
+    wrappers = {}
+    for module, name, branch_func in _targets():
+        func = getattr(module, name)
+        wrappers[func] = _wrap('{}.{}'.format(module.__name__.split('.')[-1], name), func, branch_func)
+
+    for module in modules:
+        for attr, value in list(vars(module).items()):
+            if callable(value) and value in wrappers:
+                _patched.append((module, attr, value))
+                setattr(module, attr, wrappers[value])
+            elif isinstance(value, dict):
+                for key, item in list(value.items()):
+                    if callable(item) and item in wrappers:
+                        _patched.append((value, key, item))
+                        value[key] = wrappers[item]
+    _enabled_at = time.perf_counter()
+
+def disable():
+    """Stops counting and restores original functions. Counters are kept."""
+    global _enabled_at
+    while _patched:
+        target, key, func = _patched.pop()
+        if isinstance(target, dict):
+            target[key] = func
+        else:
+            setattr(target, key, func)
+    _enabled_at = None
+
+def reset():
+    """Clears counters"""
+    with _lock:
+        for counter in _counters.values():
+            counter.__init__()
+
+def snapshot():
+    """Returns dictionary function name -> counters of called functions. 
+        Latencies are in nanoseconds, percentiles are approximate.
+    """
+    with _lock:
+        return dict((name, counter.to_dict()) for name, counter in _counters.items() 
+            if counter.count > 0)
+
+def report(elapsed = None):
+    """Returns text table of snapshot. Throughput is calls per second of
+        elapsed time (since enable() by default).
+    """
+    if elapsed is None and _enabled_at is not None:
+        elapsed = time.perf_counter() - _enabled_at
+    lines = [u'{:<32}{:>10}{:>12}{:>10}{:>10}{:>10}{:>10}'.format(
+        'function', 'calls', 'calls/s', 'mean us', 'p50 us', 'p90 us', 'p99 us')]
+    for name, counters in sorted(snapshot().items()):
+        rate = counters['count'] / elapsed if elapsed else 0.0
+        lines.append(u'{:<32}{:>10}{:>12.0f}{:>10.1f}{:>10.1f}{:>10.1f}{:>10.1f}'.format(
+            name, counters['count'], rate, counters['mean_ns'] / 1e3, 
+            counters['p50_ns'] / 1e3, counters['p90_ns'] / 1e3, counters['p99_ns'] / 1e3))
+        for branch, branch_counters in sorted(counters['branches'].items()):
+            lines.append(u'  {:<30}{:>10}'.format(branch, branch_counters['count']))
+    return u'\n'.join(lines)
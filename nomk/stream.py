@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Streaming conversion of coordinates and nomenclatures. Records are read, 
+# converted and written one by one, so memory use does not depend on input 
+# size.
+#
+# Input formats (every record is coordinates or nomenclature):
+#   text   - "X Y" or "X,Y" or nomenclature per line
+#   csv    - header with x and y (lon and lat) or nomk (name) columns
+#   ndjson - {"x": X, "y": Y}, {"nomk": "..."}, [X, Y] or "..." per line
+#
+# Example:
+#   import sys
+#   from nomk import stream
+#   rows = stream.convert(stream.read_records(sys.stdin, 'csv'), ['100k'])
+#   stream.write_rows(rows, sys.stdout, 'ndjson')
+
+import csv
+import functools
+import json
+from . import cache, coord, parallel, sheetid
+
+input_formats = ('text', 'csv', 'ndjson')
+output_formats = ('text', 'csv', 'ndjson')
+
+columns = ('x', 'y', 'scale', 'nomk', 'min_x', 'min_y', 'max_x', 'max_y')
+
+x_columns = ('x', 'lon', 'lng', 'longitude')
+y_columns = ('y', 'lat', 'latitude')
+nomk_columns = ('nomk', 'name', 'nomenclature')
+
+
+class RecordError(Exception):
+    """Error of reading or converting record at line of input"""
+    def __init__(self, line, message):
+        # Arguments are kept as is, so error can be passed between processes
+        super(RecordError, self).__init__(line, str(message))
+        self.line = line
+        self.message = str(message)
+
+    def __str__(self):
+        return 'line {}: {}'.format(self.line, self.message)
+
+
+def _text_record(line):
+    values = line.replace(',', ' ').split()
+    if len(values) == 2:
+        try:
+            return float(values[0]), float(values[1])
+        except ValueError:
+            pass
+    return line.strip()
+
+def _json_record(line):
+    value = json.loads(line)
+    if isinstance(value, dict):
+        for name in nomk_columns:
+            if name in value:
+                return value[name]
+        value = (_find(value, x_columns), _find(value, y_columns))
+    if isinstance(value, list):
+        value = tuple(value)
+    if isinstance(value, tuple) and len(value) == 2:
+        return float(value[0]), float(value[1])
+    if isinstance(value, str):
+        return value
+    raise Exception('Unsupported record')
+
+def _find(record, names):
+    for name in names:
+        if name in record:
+            return record[name]
+    raise Exception('No column of {}'.format(', '.join(names)))
+
+def _csv_records(lines):
+    reader = csv.reader(lines)
+    header = [name.strip().lower() for name in next(reader, [])]
+    nomk_pos = _column(header, nomk_columns)
+    x_pos = _column(header, x_columns)
+    y_pos = _column(header, y_columns)
+    if nomk_pos is None and (x_pos is None or y_pos is None):
+        yield 1, RecordError(1, 'No coordinate or nomenclature columns in header')
+        return
+
+    for values in reader:
+        if not values:
+            continue
+        try:
+            if nomk_pos is not None:
+                yield reader.line_num, values[nomk_pos].strip()
+            else:
+                yield reader.line_num, (float(values[x_pos]), float(values[y_pos]))
+        except (IndexError, ValueError) as e:
+            yield reader.line_num, RecordError(reader.line_num, e)
+
+def _column(header, names):
+    for name in names:
+        if name in header:
+            return header.index(name)
+    return None
+
+def read_records(lines, input_format = 'text'):
+    """Yields (line, record) pairs from iterable of lines. Record is (x, y)
+        tuple, nomenclature string or RecordError if line can not be read.
+        Empty lines are skipped.
+    """
+    if input_format == 'csv':
+        for record in _csv_records(lines):
+            yield record
+        return
+    if input_format not in input_formats:
+        raise Exception('Unsupported input format {}'.format(input_format))
+
+    read_func = _text_record if input_format == 'text' else _json_record
+    for line_num, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_num, read_func(line)
+        except Exception as e:
+            yield line_num, RecordError(line_num, e)
+
+def _nomk_to_row(scales, nomk_str):
+    if len(scales) == 1:
+        try:
+            scale, min_x, max_x, min_y, max_y = cache.text_to_bbox(nomk_str, scales[0])
+        except AttributeError:
+            # Pattern of the scale does not match
+            raise Exception('Failed to parse as {}'.format(scales[0]))
+    else:
+        scale, min_x, max_x, min_y, max_y = cache.text_to_bbox(nomk_str)
+        if scale not in scales:
+            raise Exception('Scale {} is not requested'.format(scale))
+    return (None, None, scale, nomk_str, min_x, min_y, max_x, max_y)
+
+def _coords_to_rows(scales, x, y):
+    if not (-180.0 <= x < 180.0 and -90.0 <= y <= 90.0):
+        raise Exception('Coordinates out of bounds')
+    if len(scales) == 1:
+        sheets = {scales[0]: parallel.coords_to_funcs[scales[0]](x, y)}
+    else:
+        sheets = coord.coords_to_all(x, y)
+    rows = []
+    for scale in scales:
+        nomk_str, min_x, max_x, min_y, max_y = sheets[scale]
+        rows.append((x, y, scale, nomk_str, min_x, min_y, max_x, max_y))
+    return rows
+
+def convert_record(scales, line_record):
+    """Returns list of rows (see columns) for (line, record) pair or 
+        RecordError. A point gives one row per scale.
+    """
+    line_num, record = line_record
+    if isinstance(record, RecordError):
+        return record
+    try:
+        if isinstance(record, tuple):
+            return _coords_to_rows(scales, *record)
+        return [_nomk_to_row(scales, record)]
+    except Exception as e:
+        return RecordError(line_num, e)
+
+def convert(records, scales = None, skip_errors = False, on_error = None, 
+        jobs = 1, chunk_size = parallel.DEFAULT_CHUNK_SIZE):
+    """Yields rows (see columns) for (line, record) pairs of read_records in
+        the input order.
+
+        Scales limits scales of points and nomenclatures (all by default).
+        Records are converted by parallel.imap with jobs and chunk_size.
+        RecordError is raised for first failed record, unless skip_errors is 
+        set. Then on_error(error) is called for every failed record.
+    """
+    scales = sheetid.scales if not scales else [scale for scale in sheetid.scales if scale in scales]
+    convert_func = functools.partial(convert_record, scales)
+    for rows in parallel.imap(convert_func, records, jobs, chunk_size):
+        if isinstance(rows, RecordError):
+            if not skip_errors:
+                raise rows
+            if on_error is not None:
+                on_error(rows)
+            continue
+        for row in rows:
+            yield row
+
+def _format_float(value):
+    return '' if value is None else '{:.6f}'.format(value)
+
+def write_rows(rows, output, output_format = 'ndjson'):
+    """Writes rows to text stream output, returns number of rows"""
+    count = 0
+    if output_format == 'csv':
+        writer = csv.writer(output, lineterminator = '\n')
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([_format_float(row[0]), _format_float(row[1]), row[2], row[3]] + 
+                [_format_float(value) for value in row[4:]])
+            count += 1
+    elif output_format == 'ndjson':
+        for row in rows:
+            output.write(json.dumps(dict(zip(columns, row)), ensure_ascii = False))
+            output.write('\n')
+            count += 1
+    elif output_format == 'text':
+        for row in rows:
+            output.write(u'{}\t[{:.6f} {:.6f}, {:.6f} {:.6f}]\n'.format(*row[3:]))
+            count += 1
+    else:
+        raise Exception('Unsupported output format {}'.format(output_format))
+    return count
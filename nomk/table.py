@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+# Precomputed table of all sheets of small scales (1:1M - 1:100k by default)
+# in a binary file, which is read through mmap. Several processes can share
+# one copy of the table through page cache.
+#
+# File layout (little endian):
+#   header:  magic, version, number of scales
+#   scales:  name, parts, rows, columns, offset of records, offset and size
+#            of names for every scale
+#   records: (min_x, max_x, min_y, max_y, name offset, name size) for every
+#            cell of grid of the scale, northern hemisphere first, rows from
+#            equator, columns from 180 meridian. Cells of composite polar 
+#            sheets refer to the same name.
+#   names:   UTF-8 nomenclatures
+#
+# Example:
+#   from nomk import table
+#   table.build('sheets.bin')
+#   with table.SheetTable('sheets.bin') as sheets:
+#       nomk, min_x, max_x, min_y, max_y = sheets.lookup(37.0, 55.0, '100k')
+
+import mmap
+import struct
+from . import coord, grid, sheetid
+
+MAGIC = b'NOMKTBL\0'
+VERSION = 1
+DEFAULT_SCALES = ('1m', '500k', '200k', '100k')
+
+_header = struct.Struct('<8sII')
+_scale = struct.Struct('<8sIIIQQQ')
+# Bbox as coord.coords_to_* returns, offset and size of name
+_record = struct.Struct('<4dIH2x')
+RECORD_SIZE = _record.size
+
+def get_grid_size(scale):
+    """Returns number of rows (in one hemisphere) and columns of grid"""
+    parts = sheetid.get_parts_count(scale)
+    rows = sheetid.POLE_ROW * parts
+    if scale == '1m':
+        # Polar cap above 88 degrees
+        rows += 1
+    return rows, 60 * parts
+
+def build(path, scales = DEFAULT_SCALES):
+    """Writes table of all sheets of scales to file. Returns number of 
+        records.
+    """
+    sections = []
+    for scale in scales:
+        rows, cols = get_grid_size(scale)
+        names = bytearray()
+        records = bytearray(2 * rows * cols * RECORD_SIZE)
+        # Composite polar sheets are calculated once
+        sheets = {}
+        offset = 0
+        for is_south in (False, True):
+            for row in range(rows):
+                for col in range(cols):
+                    sheet_id = sheetid.from_grid(scale, is_south, row, col)
+                    sheet = sheets.get(sheet_id)
+                    if sheet is None:
+                        nomk_str, min_x, max_x, min_y, max_y = sheetid.to_nomk(sheet_id)
+                        name = nomk_str.encode('utf-8')
+                        sheet = (min_x, max_x, min_y, max_y, len(names), len(name))
+                        names += name
+                        sheets[sheet_id] = sheet
+                    _record.pack_into(records, offset, *sheet)
+                    offset += RECORD_SIZE
+        sections.append((scale, rows, cols, records, names))
+
+    offset = _header.size + _scale.size * len(sections)
+    with open(path, 'wb') as f:
+        f.write(_header.pack(MAGIC, VERSION, len(sections)))
+        for scale, rows, cols, records, names in sections:
+            f.write(_scale.pack(scale.encode('ascii'), sheetid.get_parts_count(scale), rows, cols, 
+                offset, offset + len(records), len(names)))
+            offset += len(records) + len(names)
+        for _, _, _, records, names in sections:
+            f.write(records)
+            f.write(names)
+    return sum(len(records) // RECORD_SIZE for _, _, _, records, _ in sections)
+
+
+class SheetTable(object):
+    """Read only table of sheets built by build(), mapped to memory"""
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+        magic, version, count = _header.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise Exception('Unsupported table file {}'.format(path))
+        # scale -> (parts, rows, columns, records offset, names offset)
+        self._scales = {}
+        for i in range(count):
+            name, parts, rows, cols, records_offset, names_offset, _ = _scale.unpack_from(
+                self._mm, _header.size + i * _scale.size)
+            self._scales[name.rstrip(b'\0').decode('ascii')] = (parts, rows, cols, records_offset, names_offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._mm.close()
+
+    def scales(self):
+        return list(self._scales)
+
+    def __len__(self):
+        return sum(2 * rows * cols for _, rows, cols, _, _ in self._scales.values())
+
+    def index(self, x, y, scale):
+        """Returns index of record of sheet which contains point by 
+            grid.locate. Near edges of sheets (grid.near_edge) it can be 
+            other sheet than coord.coords_to_* returns, see lookup. Raises 
+            IndexError on 88 degrees and above for scales except 1:1M.
+        """
+        _, rows, cols, _, _ = self._scales[scale]
+        is_south, row, col = grid.locate(x, y, scale)
+        if scale == '1m' and row >= sheetid.POLE_ROW:
+            row = sheetid.POLE_ROW
+        if row >= rows or col < 0 or col >= cols:
+            raise IndexError('Coordinates ({}, {}) are out of table of {}'.format(x, y, scale))
+        return ((rows if is_south else 0) + row) * cols + col
+
+    def sheet_index(self, sheet_id):
+        """Returns scale and index of record of sheet identifier"""
+        scale, is_south, row, col = sheetid.to_grid(sheet_id)
+        _, rows, cols, _, _ = self._scales[scale]
+        if scale == '1m' and row >= sheetid.POLE_ROW:
+            row = sheetid.POLE_ROW
+        return scale, ((rows if is_south else 0) + row) * cols + col
+
+    def get(self, scale, index):
+        """Returns (nomk, min_x, max_x, min_y, max_y) of record"""
+        _, _, _, records_offset, names_offset = self._scales[scale]
+        min_x, max_x, min_y, max_y, name_offset, name_size = _record.unpack_from(
+            self._mm, records_offset + index * RECORD_SIZE)
+        start = names_offset + name_offset
+        return self._mm[start:start + name_size].decode('utf-8'), min_x, max_x, min_y, max_y
+
+    def get_bbox(self, scale, index):
+        """Returns (min_x, max_x, min_y, max_y) of record"""
+        _, _, _, records_offset, _ = self._scales[scale]
+        return _record.unpack_from(self._mm, records_offset + index * RECORD_SIZE)[:4]
+
+    def lookup(self, x, y, scale):
+        """Returns coord.coords_to_* result for point from table. Points 
+            near edges of sheets (grid.near_edge) are passed to coords_to_*
+        """
+        if scale in self._scales and grid.near_edge(x, y, scale):
+            return getattr(coord, 'coords_to_' + scale)(x, y)
+        return self.get(scale, self.index(x, y, scale))
@@ -35,6 +35,19 @@ roman_figures = ['I', 'II', 'III', 'IV', 'V', 'VI',
     'XXXI', 'XXXII', 'XXXIII', 'XXXIV', 'XXXV', 'XXXVI']
 ru_letters_small = [u'а', u'б', u'в', u'г', u'д', u'е', u'ж', u'з', u'и']
 
+# Count of sheets of the scale along one side of 1:1 000 000 sheet
+scale_parts = {
+    '1m': 1,
+    '500k': 2,
+    '200k': 6,
+    '100k': 12,
+    '50k': 24,
+    '25k': 48,
+    '10k': 96,
+    '5k': 192,
+    '2k': 576,
+}
+
 def south_suffix():
     return u'(ЮП)'
 
@@ -140,7 +153,7 @@ def get_pos_num2(number, is_south):
     return col, row
 
 def get_pos_num_small(number, is_south):
-    row = int(math.floor(number / 2)) - 1
+    row = int(math.floor((number - 1) / 2))
     col = number - row * 2 - 1
 
     if not is_south:
@@ -178,8 +191,5 @@ def get_grid_pos(x, y, min_x, min_y, parts, is_south):
     max_x = min_x + size_x
     max_y = min_y + size_y
 
-    if is_south:
-        row = parts - 1 - row
-
     return row, col, size_x, size_y, min_x, max_x, min_y, max_y
 
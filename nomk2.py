@@ -1,10 +1,13 @@
 import string
 import re
+import weakref
 
 
 class Nomk(object):
 	reg_exp = None
 
+	__slots__ = ()
+
 	def to_wkt(self, x_min, y_min, x_max, y_max):
 		return 'POLYGON (({x_min} {y_min}, {x_min} {y_max}, {x_max} {y_max}, {x_max} {y_min}, {x_min} {y_min}))'.format(
 			x_min=x_min,
@@ -17,27 +20,89 @@ class Nomk(object):
 		return self.to_wkt(*self.get_bbox())
 
 
+def _parts_index(parts_matrix):
+	# Label -> (row, col) of label in matrix, starting from 1
+	return dict(
+		(part, (row_num, col_num))
+		for row_num, row in enumerate(parts_matrix, 1)
+		for col_num, part in enumerate(row, 1)
+	)
+
+
+class _Level(object):
+	# Subdivision of sheet of the scale into parts of the next level
+	__slots__ = ('scale', 'parts_matrix', 'parts_index', 'sheet_size', 'convert')
+
+	def __init__(self, scale, parts_matrix, sheet_size, convert):
+		self.scale = scale
+		self.parts_matrix = tuple(tuple(row) for row in parts_matrix)
+		self.parts_index = _parts_index(self.parts_matrix)
+		self.sheet_size = sheet_size
+		self.convert = convert
+
+
+def _split_str(parts):
+	return tuple(parts.split(','))
+
+
+def _split_int(parts):
+	return tuple(map(int, parts.split(',')))
+
+
+# Tables are built once and shared by all instances
+_level_500k = _Level('1m', (
+	('А', 'Б'),
+	('В', 'Г'),
+), (6.0, 4.0), _split_str)
+# (
+# 	('I', 'II', 'III', 'IV', 'V', 'VI'),
+# 	('VII', 'VIII', 'IX', 'X', 'XI', 'XII'),
+# 	('XIII', 'XIV', 'XV', 'XVI', 'XVII', 'XVIII'),
+# 	('XIX', 'XX', 'XXI', 'XXII', 'XXIII', 'XXIV'),
+# 	('XXV', 'XXVI', 'XXVII', 'XXVIII', 'XXIX', 'XXX'),
+# 	('XXXI', 'XXXII', 'XXXIII', 'XXXIV', 'XXXV', 'XXXVI'),
+# )
+_level_200k = _Level('1m', [list(range(row * 6 + 1, row * 6 + 6 + 1)) for row in range(6)], (6.0, 4.0), _split_int)
+_level_100k = _Level('1m', [list(range(row * 12 + 1, row * 12 + 12 + 1)) for row in range(12)], (6.0, 4.0), _split_int)
+_level_50k = _Level('100k', (
+	('А', 'Б'),
+	('В', 'Г'),
+), (6.0 / 12, 4.0 / 12), _split_str)
+_level_25k = _Level('50k', (
+	('а', 'б'),
+	('в', 'г'),
+), (6.0 / 12 / 2, 4.0 / 12 / 2), _split_str)
+_level_10k = _Level('25k', (
+	('1', '2'),
+	('3', '4'),
+), (6.0 / 12 / 2 / 2, 4.0 / 12 / 2 / 2), _split_str)
+_level_5k = _Level('100k', [list(range(row * 16 + 1, row * 16 + 16 + 1)) for row in range(16)], (6.0 / 12, 4.0 / 12), _split_int)
+_level_2k = _Level('5k', (
+	('а', 'б', 'в'),
+	('г', 'д', 'е'),
+	('ж', 'з', 'и'),
+), (6.0 / 12 / 16, 4.0 / 12 / 16), _split_str)
+
+
 class Nomk1m(Nomk):
 	reg_exp = r'^[A-V]-\d{1,2}(,\d{1,2})*$'
 
 	row_availbale = string.ascii_lowercase[:22].upper()
 	col_availbale = range(1, 61)
 
-	def __init__(self, row, cols):
+	# Subdivisions from 1:1 000 000 sheet to the sheet of class
+	_levels = ()
+
+	__slots__ = ('row', 'cols', '_requested_parts', '__weakref__')
+
+	def __init__(self, row, cols, *parts):
 		super().__init__()
 
 		self.row = row
-		self.cols = list(map(int, cols.split(',')))
-
-		self._all_parts = {}
-		self._requested_parts = {}
-		self._sheet_size = {
-			'1m': (6.0, 4.0)
-		}
+		self.cols = tuple(map(int, cols.split(',')))
+		self._requested_parts = tuple(level.convert(level_parts) for level, level_parts in zip(self._levels, parts))
 
 	def get_bbox(self):
-		parts = self.prepare_parts()
-
 		col_min = self.cols[0]
 		col_max = self.cols[-1]
 
@@ -49,14 +114,14 @@ class Nomk1m(Nomk):
 		
 		bbox = [x_min, y_min, x_max, y_max]
 
-		for scale in sorted(self._all_parts, key=lambda scale: int(scale.replace('k', '000').replace('m','000000')), reverse=True):
+		for level, parts_list in zip(self._levels, self._requested_parts):
 			bbox = self.get_bbox_by_parts(
 				bbox, 
-				self._all_parts[scale],
-				self._requested_parts[scale],
-				parts[scale],
-				self._sheet_size[scale][0],
-				self._sheet_size[scale][1],
+				level.parts_matrix,
+				parts_list,
+				level.parts_index,
+				level.sheet_size[0],
+				level.sheet_size[1],
 			)
 
 
@@ -68,17 +133,7 @@ class Nomk1m(Nomk):
 		return cls(row, cols)
 
 	def prepare_parts(self):
-		all_parts = {}
-		for scale, parts in self._all_parts.items():
-			all_parts[scale] = {}
-			row_num = 1
-			for row in parts:
-				col_num = 1
-				for col in row:
-					all_parts[scale][col] = (row_num, col_num)
-					col_num += 1
-				row_num += 1
-		return all_parts
+		return dict((level.scale, level.parts_index) for level in self._levels)
 
 
 	@staticmethod
@@ -121,14 +176,12 @@ class Nomk1m(Nomk):
 class Nomk500k(Nomk1m):
 	reg_exp = r'^[A-V]-\d{1,2}(,\d{1,2})*-[А-Г](,[А-Г]){0,2}$'
 
-	def __init__(self, row, cols, parts_1m):
-		super().__init__(row, cols)
+	_levels = (_level_500k,)
 
-		self._all_parts['1m'] = (
-			('А', 'Б'),
-			('В', 'Г'),
-		)
-		self._requested_parts['1m'] = parts_1m.split(',')
+	__slots__ = ()
+
+	def __init__(self, row, cols, parts_1m):
+		super().__init__(row, cols, parts_1m)
 
 	@classmethod
 	def construct(cls, nomk):
@@ -140,20 +193,12 @@ class Nomk200k(Nomk1m):
 	reg_exp = r'^[A-V]-\d{1,2}(,\d{1,2})*-\d\d$'
 	# reg_exp = r'^[A-V]-\d{1,2}(,\d{1,2})*-[XIV]{1,5}$'
 
-	def __init__(self, row, cols, parts_1m):
-		super().__init__(row, cols)
+	_levels = (_level_200k,)
 
-		# self._all_parts['1m'] = (
-		# 	('I', 'II', 'III', 'IV', 'V', 'VI'),
-		# 	('VII', 'VIII', 'IX', 'X', 'XI', 'XII'),
-		# 	('XIII', 'XIV', 'XV', 'XVI', 'XVII', 'XVIII'),
-		# 	('XIX', 'XX', 'XXI', 'XXII', 'XXIII', 'XXIV'),
-		# 	('XXV', 'XXVI', 'XXVII', 'XXVIII', 'XXIX', 'XXX'),
-		# 	('XXXI', 'XXXII', 'XXXIII', 'XXXIV', 'XXXV', 'XXXVI'),
-		# )
-		self._all_parts['1m'] = [list(range(row * 6 + 1, row * 6 + 6 + 1)) for row in range(6)]
+	__slots__ = ()
 
-		self._requested_parts['1m'] = map(int, parts_1m.split(','))
+	def __init__(self, row, cols, parts_1m):
+		super().__init__(row, cols, parts_1m)
 
 	@classmethod
 	def construct(cls, nomk):
@@ -164,13 +209,12 @@ class Nomk200k(Nomk1m):
 class Nomk100k(Nomk1m):
 	reg_exp = r'^[A-V]-\d{1,2}(,\d{1,2})*-\d\d\d$'
 
-	def __init__(self, row, cols, parts_1m):
-		super().__init__(row, cols)
+	_levels = (_level_100k,)
 
-		self._sheet_size['100k'] = (6.0 / 12, 4.0 / 12)
+	__slots__ = ()
 
-		self._all_parts['1m'] = [list(range(row * 12 + 1, row * 12 + 12 + 1)) for row in range(12)]
-		self._requested_parts['1m'] = map(int, parts_1m.split(','))
+	def __init__(self, row, cols, parts_1m):
+		super().__init__(row, cols, parts_1m)
 
 	@classmethod
 	def construct(cls, nomk):
@@ -180,17 +224,13 @@ class Nomk100k(Nomk1m):
 
 class Nomk50k(Nomk100k):
 	reg_exp = r'^[A-V]-\d{1,2}(,\d{1,2})*-\d{1,3}-[А-Г](,[А-Г]){0,2}$'
-	
-	def __init__(self, row, cols, parts_1m, parts_100k):
-		super().__init__(row, cols, parts_1m)
 
-		self._sheet_size['50k'] = (6.0 / 12 / 2, 4.0 / 12 / 2)
+	_levels = Nomk100k._levels + (_level_50k,)
 
-		self._all_parts['100k'] = (
-			('А', 'Б'),
-			('В', 'Г'),
-		)
-		self._requested_parts['100k'] = parts_100k.split(',')
+	__slots__ = ()
+	
+	def __init__(self, row, cols, parts_1m, parts_100k):
+		Nomk1m.__init__(self, row, cols, parts_1m, parts_100k)
 
 	@classmethod
 	def construct(cls, nomk):
@@ -201,16 +241,12 @@ class Nomk50k(Nomk100k):
 class Nomk25k(Nomk50k):
 	reg_exp = r'^[A-V]-\d{1,2}(,\d{1,2})*-\d{1,3}-[А-Г](,[А-Г]){0,2}-[а-г](,[а-г]){0,2}$'
 
-	def __init__(self, row, cols, parts_1m, parts_100k, parts_50k):
-		super().__init__(row, cols, parts_1m, parts_100k)
+	_levels = Nomk50k._levels + (_level_25k,)
 
-		self._sheet_size['25k'] = (6.0 / 12 / 2 / 2, 4.0 / 12 / 2 / 2)
-		
-		self._all_parts['50k'] = (
-			('а', 'б'),
-			('в', 'г'),
-		)
-		self._requested_parts['50k'] = parts_50k.split(',')
+	__slots__ = ()
+
+	def __init__(self, row, cols, parts_1m, parts_100k, parts_50k):
+		Nomk1m.__init__(self, row, cols, parts_1m, parts_100k, parts_50k)
 
 	@classmethod
 	def construct(cls, nomk):
@@ -220,15 +256,13 @@ class Nomk25k(Nomk50k):
 
 class Nomk10k(Nomk25k):
 	reg_exp = r'^[A-V]-\d{1,2}(,\d{1,2})*-\d{1,3}-[А-Г](,[А-Г]){0,2}-[а-г](,[а-г]){0,2}-[1-4]$'
+
+	_levels = Nomk25k._levels + (_level_10k,)
+
+	__slots__ = ()
 	
 	def __init__(self, row, cols, parts_1m, parts_100k, parts_50k, parts_25k):
-		super().__init__(row, cols, parts_1m, parts_100k, parts_50k)
-
-		self._all_parts['25k'] = (
-			('1', '2'),
-			('3', '4'),
-		)
-		self._requested_parts['25k'] = parts_25k.split(',')
+		Nomk1m.__init__(self, row, cols, parts_1m, parts_100k, parts_50k, parts_25k)
 
 	@classmethod
 	def construct(cls, nomk):
@@ -238,15 +272,13 @@ class Nomk10k(Nomk25k):
 
 class Nomk5k(Nomk100k):
 	reg_exp = r'^[A-V]-\d{1,2}(,\d{1,2})*-\d{1,3}\(\d{1,3}\)$'
-	
-	def __init__(self, row, cols, parts_1m, parts_100k):
-		super().__init__(row, cols, parts_1m)
 
-		self._sheet_size['5k'] = (6.0 / 12 / 16, 4.0 / 12 / 16)
+	_levels = Nomk100k._levels + (_level_5k,)
 
-		self._all_parts['100k'] = [list(range(row * 16 + 1, row * 16 + 16 + 1)) for row in range(16)]
-
-		self._requested_parts['100k'] =  map(int, parts_100k.split(','))
+	__slots__ = ()
+	
+	def __init__(self, row, cols, parts_1m, parts_100k):
+		Nomk1m.__init__(self, row, cols, parts_1m, parts_100k)
 
 	@classmethod
 	def construct(cls, nomk):
@@ -259,17 +291,13 @@ class Nomk5k(Nomk100k):
 
 class Nomk2k(Nomk5k):
 	reg_exp = r'^[A-V]-\d{1,2}(,\d{1,2})*-\d{1,3}\(\d{1,3}-[а-и]\)$'
-	
-	def __init__(self, row, cols, parts_1m, parts_100k, parts_5k):
-		super().__init__(row, cols, parts_1m, parts_100k)
 
-		self._all_parts['5k'] = (
-			('а', 'б', 'в'),
-			('г', 'д', 'е'),
-			('ж', 'з', 'и'),
-		)
+	_levels = Nomk5k._levels + (_level_2k,)
 
-		self._requested_parts['5k'] =  parts_5k.split(',')
+	__slots__ = ()
+	
+	def __init__(self, row, cols, parts_1m, parts_100k, parts_5k):
+		Nomk1m.__init__(self, row, cols, parts_1m, parts_100k, parts_5k)
 
 	@classmethod
 	def construct(cls, nomk):
@@ -280,6 +308,49 @@ class Nomk2k(Nomk5k):
 		return cls(row, cols, parts_1m, parts_100k, parts_5k)
 
 
+# Classes in order of testing, the first matched pattern wins
+nomk_classes = [Nomk1m, Nomk500k, Nomk200k, Nomk100k, Nomk50k, Nomk25k, Nomk10k, Nomk5k, Nomk2k]
+
+# All patterns in one alternation wrapped in groups, so one match finds the 
+# class by index of the matched group
+_group_classes = {}
+_patterns = []
+_group_index = 1
+for _nomk_class in nomk_classes:
+	_group_classes[_group_index] = _nomk_class
+	_patterns.append('({})'.format(_nomk_class.reg_exp))
+	_group_index += re.compile(_nomk_class.reg_exp).groups + 1
+reg_exp_all = re.compile('|'.join(_patterns))
+
+# Parsed sheets are shared while they are used, so the same nomk string
+# is not parsed and allocated twice
+_interned = weakref.WeakValueDictionary()
+
+
+class NomkError(object):
+	''' Error of parsing nomk string in get_nomks '''
+	__slots__ = ('index', 'nomk', 'message')
+
+	def __init__(self, index, nomk, message):
+		self.index = index
+		self.nomk = nomk
+		self.message = message
+
+	def __repr__(self):
+		return 'NomkError({!r}, {!r}, {!r})'.format(self.index, self.nomk, self.message)
+
+	def __eq__(self, other):
+		return isinstance(other, NomkError) and (self.index, self.nomk, self.message) == (other.index, other.nomk, other.message)
+
+
+def get_nomk_class(nomk):
+	''' Get nomk class by nomk string or None '''
+	result = reg_exp_all.match(nomk)
+	if result is None:
+		return None
+	return _group_classes[result.lastindex]
+
+
 def get_nomk(nomk):
 	''' Get nomk class by nomk string
 		Example:
@@ -287,9 +358,40 @@ def get_nomk(nomk):
             nomk = get_nomk('O-37-050')
             print(nomk.get_bbox_as_wkt())
 	'''
-	for nomk_class in [Nomk1m, Nomk500k, Nomk200k, Nomk100k, Nomk50k, Nomk25k, Nomk10k, Nomk5k, Nomk2k]:
-		if re.match(nomk_class.reg_exp, nomk):
-			return nomk_class.construct(nomk)
+	instance = _interned.get(nomk)
+	if instance is not None:
+		return instance
+
+	result = reg_exp_all.match(nomk)
+	if result is None:
+		return None
+	instance = _group_classes[result.lastindex].construct(nomk)
+	_interned[nomk] = instance
+	return instance
+
+
+def get_nomks(nomks):
+	''' Yield nomk objects for iterable of nomk strings. NomkError with
+		index of string in iterable is yielded for string which is not parsed
+		Example:
+            from nomk2 import get_nomks, NomkError
+            for nomk in get_nomks(['O-37-050', 'O-37']):
+                if not isinstance(nomk, NomkError):
+                    print(nomk.get_bbox_as_wkt())
+	'''
+	for index, nomk in enumerate(nomks):
+		if not isinstance(nomk, str):
+			yield NomkError(index, nomk, 'Not a string')
+			continue
+		try:
+			instance = get_nomk(nomk)
+		except ValueError as e:
+			yield NomkError(index, nomk, str(e))
+			continue
+		if instance is None:
+			yield NomkError(index, nomk, 'Unknown format')
+		else:
+			yield instance
 
 if __name__ == '__main__':
 	
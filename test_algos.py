@@ -1,3 +1,4 @@
+import pytest
 import nomk.algos
 
 
@@ -7,3 +8,78 @@ def test_neighbors_N_36_012():
     real_neighbors = ('N-36-011', 'N-36-023', 'N-36-024', 'N-37-001', 'N-37-013', 'O-36-143', 'O-36-144', 'O-37-133')
 
     assert len(set(nomks).difference(real_neighbors)) == 0, 'Wrong neighbors calculation'
+
+
+def test_neighbors_antimeridian():
+    nomks = nomk.algos.get_neighbors_for_nomk('N-01-001')
+
+    real_neighbors = ('N-60-012', 'N-60-024', 'N-01-002', 'N-01-013', 'N-01-014', 'O-60-144', 'O-01-133', 'O-01-134')
+
+    assert set(nomks) == set(real_neighbors)
+
+
+def test_neighbors_equator():
+    nomks = nomk.algos.get_neighbors_for_nomk('A-37-001(ЮП)')
+
+    real_neighbors = ('A-36-012(ЮП)', 'A-36-024(ЮП)', 'A-37-002(ЮП)', 'A-37-013(ЮП)', 'A-37-014(ЮП)', 'A-36-144', 'A-37-133', 'A-37-134')
+
+    assert set(nomks) == set(real_neighbors)
+
+
+def test_neighbors_polar():
+    nomks = nomk.algos.get_neighbors_for_nomk('T-48-XXVIII,XXIX,XXX')
+
+    real_neighbors = ('T-48-XIX,XX,XXI', 'T-48-XXII,XXIII,XXIV', 'T-48-XXV,XXVI,XXVII', 'T-48-XXXI,XXXII,XXXIII', 'T-48-XXXIV,XXXV,XXXVI', 
+        'T-49-XIX,XX,XXI', 'T-49-XXV,XXVI,XXVII', 'T-49-XXXI,XXXII,XXXIII')
+
+    assert set(nomks) == set(real_neighbors)
+
+    nomks = nomk.algos.get_neighbors_for_nomk('V-01,02,03,04', '1m')
+
+    assert set(nomks) == set(('U-57,58,59,60', 'U-01,02,03,04', 'U-05,06,07,08', 'V-57,58,59,60', 'V-05,06,07,08', 'Z'))
+
+
+def test_k_ring():
+    assert nomk.algos.k_ring(['N-37-012'], 0) == ('N-37-012',)
+    assert len(nomk.algos.k_ring(['N-37-012'], 3)) == 49
+    assert len(nomk.algos.k_ring(['N-37-012', 'N-37-024'], 1)) == 12
+
+    nomks = nomk.algos.k_ring(['N-36-012'], 1, '100k')
+    assert set(nomks) == set(nomk.algos.get_neighbors(['N-36-012'], '100k')).union(['N-36-012'])
+
+
+def test_parent():
+    assert nomk.algos.parent('N-37-027-В-в-3', '100k') == 'N-37-027'
+    assert nomk.algos.parent('N-37-027-В-в-3', '1m') == 'N-37'
+    assert nomk.algos.parent('N-37-027-В-в-3', '500k') == 'N-37-А'
+    assert nomk.algos.parent('N-37-027-В-в-3', '200k') == 'N-37-VIII'
+    assert nomk.algos.parent('N-37-144-(256)-и(ЮП)', '100k') == 'N-37-144(ЮП)'
+    assert nomk.algos.parent('U-48-141,142,143,144', '200k') == 'U-48-XXXIV,XXXV,XXXVI'
+    assert nomk.algos.parent('N-37-027', '100k') == 'N-37-027'
+
+
+def test_children():
+    assert list(nomk.algos.children('N-37-027', '50k')) == ['N-37-027-А', 'N-37-027-Б', 'N-37-027-В', 'N-37-027-Г']
+    assert list(nomk.algos.children('N-37-001(ЮП)', '50k')) == ['N-37-001-А(ЮП)', 'N-37-001-Б(ЮП)', 'N-37-001-В(ЮП)', 'N-37-001-Г(ЮП)']
+    assert list(nomk.algos.children('P-37-001,002', '50k')) == ['P-37-001-А,Б', 'P-37-002-А,Б', 'P-37-001-В,Г', 'P-37-002-В,Г']
+
+    nomks = list(nomk.algos.children('N-37', '10k'))
+    assert len(nomks) == 96 * 96 == len(set(nomks))
+    assert nomks[0] == 'N-37-001-А-а-1'
+    assert all(nomk.algos.parent(child, '1m') == 'N-37' for child in nomks[::97])
+
+    nomks = list(nomk.algos.children('U-37,38,39,40', '100k'))
+    assert len(nomks) == 144 == len(set(nomks))
+    assert set(nomk.algos.parent(child, '1m') for child in nomks) == set(['U-37,38,39,40'])
+
+    with pytest.raises(Exception):
+        list(nomk.algos.children('N-37-027', '1m'))
+
+
+def test_invalid_zone():
+    for nomk_str in ['N-00', 'N-61', 'N-99']:
+        with pytest.raises(Exception, match='Unsupported zone'):
+            list(nomk.algos.children(nomk_str, '500k'))
+    for nomk_str in ['N-00-027', 'N-61-027', 'N-99-027']:
+        with pytest.raises(Exception, match='Unsupported zone'):
+            nomk.algos.parent(nomk_str, '1m')
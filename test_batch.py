@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+ 
+import random
+import pytest
+from nomk import cache, coord
+
+np = pytest.importorskip('numpy')
+from nomk import batch
+
+delta = 0.00000001
+
+def random_points(count):
+    rnd = random.Random(42)
+    points = [(rnd.uniform(-180.0, 180.0), rnd.uniform(-88.0, 88.0)) for _ in range(count)]
+    # More points in the double and quad sheets areas
+    points += [(rnd.uniform(-180.0, 180.0), rnd.choice([-1, 1]) * rnd.uniform(60.0, 88.0)) for _ in range(count // 2)]
+    return points
+
+@pytest.mark.parametrize('scale', ['1m', '500k', '200k', '100k', '50k', '25k', '10k', '5k', '2k'])
+def test_batch_equal_scalar(scale):
+    points = random_points(2000)
+    xs = np.array([x for x, _ in points])
+    ys = np.array([y for _, y in points])
+
+    scalar_func = getattr(coord, 'coords_to_' + scale)
+    nomks, min_xs, max_xs, min_ys, max_ys = batch.coords_to(scale, xs, ys)
+
+    assert len(nomks) == len(points)
+    for i, (x, y) in enumerate(points):
+        nomk_str, min_x, max_x, min_y, max_y = scalar_func(x, y)
+        assert nomks[i] == nomk_str
+        assert abs(min_xs[i] - min_x) < delta
+        assert abs(max_xs[i] - max_x) < delta
+        assert abs(min_ys[i] - min_y) < delta
+        assert abs(max_ys[i] - max_y) < delta
+
+def test_batch_south():
+    nomks, _, _, min_ys, max_ys = batch.coords_to_100k([37.61556, 37.61556], [55.75222, -55.75222])
+    assert nomks[0] == u'N-37-004'
+    assert nomks[1] == u'N-37-136' + coord.util.south_suffix()
+    assert abs(min_ys[0] + min_ys[1]) < delta
+    assert abs(max_ys[0] + max_ys[1]) < delta
+
+def test_batch_unsupported_latitude():
+    with pytest.raises(Exception):
+        batch.coords_to_100k([37.0], [89.0])
+
+def test_text_to_bbox_equal_scalar():
+    rnd = random.Random(7)
+    nomks = []
+    for scale in ['1m', '500k', '200k', '100k', '50k', '25k', '10k', '5k', '2k']:
+        func = getattr(coord, 'coords_to_' + scale)
+        nomks += [func(x, y)[0] for x, y in random_points(300)]
+    rnd.shuffle(nomks)
+
+    scales, min_xs, max_xs, min_ys, max_ys, errors = batch.text_to_bbox(nomks)
+    assert not errors.any()
+    for i, nomk_str in enumerate(nomks):
+        scale, min_x, max_x, min_y, max_y = cache.text_to_bbox(nomk_str)
+        assert scales[i] == scale
+        assert abs(min_xs[i] - min_x) < delta
+        assert abs(max_xs[i] - max_x) < delta
+        assert abs(min_ys[i] - min_y) < delta
+        assert abs(max_ys[i] - max_y) < delta
+
+def test_text_to_bbox_errors():
+    scales, min_xs, _, _, _, errors = batch.text_to_bbox(['N-37', 'wrong', 'N-37-145', 'N-37-004', 'N-99'], '100k')
+    assert errors.tolist() == [True, True, True, False, True]
+    assert scales.tolist() == ['', '', '', '100k', '']
+    assert np.isnan(min_xs[errors]).all()
+    assert abs(min_xs[3] - 37.5) < delta
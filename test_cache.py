@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+ 
+import threading
+import pytest
+from nomk import cache, coord, text
+
+def test_lru_cache():
+    lru = cache.LRUCache(2)
+    lru.put('a', 1)
+    lru.put('b', 2)
+    assert lru.get('a') == 1
+    lru.put('c', 3)
+    assert 'b' not in lru
+    assert lru.get('b') is None
+    assert lru.get_or_compute('d', lambda: 4) == 4
+    assert len(lru) == 2
+
+    stats = lru.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['evictions'] == 2
+
+def test_cached_text_to_bbox():
+    cache.clear()
+    assert cache.text_to_bbox(u'N-37-004-В-а') == text.text_to_25k('N', 37, 4, u'В', u'а', False)
+    assert cache.text_to_bbox(u'N-37-004-В-а') == text.text_to_25k('N', 37, 4, u'В', u'а', False)
+    assert cache.stats()['text']['hits'] == 1
+
+    with pytest.raises(Exception):
+        cache.text_to_bbox('garbage')
+
+def test_cached_coords_to():
+    cache.clear()
+    assert cache.coords_to(37.61556, 55.75222, '50k') == coord.coords_to_50k(37.61556, 55.75222)
+    assert cache.coords_to(37.52, 55.70, '50k') == coord.coords_to_50k(37.52, 55.70)
+    assert cache.coords_to(97.20, 76.60, '50k') == coord.coords_to_50k(97.20, 76.60)
+    assert cache.coords_to(97.85, 76.60, '50k') == coord.coords_to_50k(97.85, 76.60)
+    assert cache.coords_to(97.90, 76.61, '50k') == coord.coords_to_50k(97.90, 76.61)
+    assert cache.stats()['coords'] == {'size': 3, 'max_size': cache.coords_cache.max_size, 
+        'hits': 2, 'misses': 3, 'evictions': 0}
+
+def test_cached_coords_to_edges():
+    cache.clear()
+    points = [(37.3, 60.0), (37.3, 76.0), (37.3, -60.0), (37.3, -76.0), (37.3, 88.0), 
+        (-5e-324, 55.1), (37.1, 0.9999999999999999), (37.5, 55.1)]
+    for scale in ['1m', '500k', '200k', '100k', '50k', '25k', '10k', '5k', '2k']:
+        func = getattr(coord, 'coords_to_' + scale)
+        for x, y in points:
+            try:
+                expected = func(x, y)
+            except Exception as e:
+                expected = type(e)
+            for _ in range(2):
+                try:
+                    assert cache.coords_to(x, y, scale) == expected
+                except AssertionError:
+                    raise
+                except Exception as e:
+                    assert type(e) == expected
+
+def test_cache_warm():
+    cache.clear()
+    assert cache.warm(['N-37-027', 'N-37-028', 'garbage']) == 1
+    assert cache.warm(['N-37-027', 'N-37-145', 'N-99-027', 'garbage']) == 3
+    cache.text_to_bbox('N-37-027')
+    cache.coords_to(37.1, 55.1, '100k')
+    stats = cache.stats()
+    assert stats['text']['hits'] == 1
+    assert stats['coords']['hits'] == 1
+
+def test_cache_threads():
+    cache.clear()
+    errors = []
+
+    def worker(shift):
+        for i in range(200):
+            x = 30.05 + (i + shift) % 50 * 0.1
+            if cache.coords_to(x, 55.2, '100k') != coord.coords_to_100k(x, 55.2):
+                errors.append(x)
+
+    threads = [threading.Thread(target=worker, args=(shift,)) for shift in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    stats = cache.stats()['coords']
+    assert stats['hits'] + stats['misses'] == 800
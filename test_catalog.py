@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+import random
+from nomk import catalog, coord, sheetid, text, parser
+
+def test_query():
+    index = catalog.CatalogIndex(['N-37', 'N-37-027', 'N-37-027-В-в-3', 'U-37,38,39,40', 'bad', 'N-37-27', ('N-37-А', 'value')])
+    assert len(index) == 6
+    assert index.errors == [('bad', 'Failed to parse')]
+    assert index.scales() == ['1m', '500k', '100k', '10k']
+    assert index.query(37.01, 55.01) == ['N-37', 'value', 'N-37-027', 'N-37-27', 'N-37-027-В-в-3']
+    assert index.query(59.0, 83.0) == ['U-37,38,39,40']
+    assert index.query(37.01, -55.01) == []
+    assert index.query(37.01, 89.0) == []
+    assert index.query_many([(37.01, 55.01), (36.5, 55.5)]) == [['N-37', 'value', 'N-37-027', 'N-37-27', 'N-37-027-В-в-3'], ['N-37', 'value']]
+
+def test_query_bbox():
+    # Compare with test of bboxes of all sheets
+    rnd = random.Random(14)
+    nomks = []
+    for _ in range(300):
+        x = rnd.uniform(-180.0, 180.0)
+        y = rnd.uniform(-87.9, 87.9)
+        nomks.append(getattr(coord, 'coords_to_' + rnd.choice(sheetid.scales))(x, y)[0])
+    index = catalog.CatalogIndex(nomks)
+    assert len(index) == len(nomks) and not index.errors
+    bboxes = []
+    for nomk_str in nomks:
+        scale, parts, is_south = parser.parse(nomk_str)
+        _, min_x, max_x, min_y, max_y = getattr(text, 'text_to_' + scale)(*parts, is_south)
+        bboxes.append((nomk_str, min_x, max_x, min(min_y, max_y), max(min_y, max_y)))
+
+    for nomk_str, min_x, max_x, min_y, max_y in bboxes[:100]:
+        x = min_x + (max_x - min_x) * 0.3
+        y = min_y + (max_y - min_y) * 0.7
+        expected = set(name for name, x0, x1, y0, y1 in bboxes if x0 < x < x1 and y0 < y < y1)
+        assert set(index.query(x, y)) == expected
+
+def test_invalid_zone():
+    index = catalog.CatalogIndex(['N-99-027', 'N-35-027', 'N-00'])
+    assert len(index) == 1
+    assert [nomk_str for nomk_str, _ in index.errors] == ['N-99-027', 'N-00']
+    assert 'Unsupported zone' in index.errors[0][1]
+    assert index.query(25.25, 55.2) == ['N-35-027']
+
+def test_query_edges():
+    nomks = [u'P-37,38', u'P-37-135,136', u'T-37,38,39,40', u'T-37-133,134,135,136', 
+        u'P-37,38(ЮП)', u'P-37-003,004(ЮП)', u'T-37-001,002,003,004(ЮП)', u'V-37-XXXIII,XXXIV,XXXV', 
+        u'N-31', u'N-30', u'A-37-111', u'A-37-099']
+    index = catalog.CatalogIndex(nomks)
+    # coords_to_* returns sheets which are not joined on 60 and 76 degrees
+    assert index.query(37.3, 60.0) == [u'P-37,38', u'P-37-135,136']
+    assert index.query(37.3, 76.0) == [u'T-37,38,39,40', u'T-37-133,134,135,136']
+    assert index.query(37.3, -60.0) == [u'P-37,38(ЮП)', u'P-37-003,004(ЮП)']
+    assert index.query(37.3, -76.0) == [u'T-37-001,002,003,004(ЮП)']
+    assert index.query(37.3, 88.0) == []
+    # Points which coords_to_* rounds to the next sheet
+    assert index.query(-5e-324, 55.1) == [u'N-31']
+    assert index.query(37.1, 0.9999999999999999) == [u'A-37-099']
+
+    for x, y in [(37.3, 60.0), (37.3, 76.0), (37.3, -60.0), (37.3, -76.0)]:
+        for scale in ['1m', '200k', '100k']:
+            nomk_str = getattr(coord, 'coords_to_' + scale)(x, y)[0]
+            assert [value for value in index.query(x, y) 
+                if sheetid.get_scale(sheetid.from_nomk(value)) == scale] == \
+                [value for value in nomks if sheetid.from_nomk(value) == sheetid.from_nomk(nomk_str)]
+
+def test_memory_report():
+    index = catalog.CatalogIndex(['N-37', 'N-37-027', 'N-37-028', 'N-37-28'])
+    report = index.memory_report()
+    assert report['1m']['sheets'] == 1
+    assert report['100k'] == dict(report['100k'], sheets = 3, keys = 2)
+    assert report['total']['sheets'] == 4
+    assert report['total']['index_bytes'] > 0 and report['total']['values_bytes'] > 0
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+ 
+import random
+import pytest
+from nomk import cover, coord, util
+
+def test_sheets_in_bbox_count():
+    assert len(list(cover.sheets_in_bbox(36.0, 52.0, 42.0, 56.0, '100k'))) == 144
+    assert len(list(cover.sheets_in_bbox(36.0, 52.0, 42.0, 56.0, '10k'))) == 96 * 96
+    assert [sheet[0] for sheet in cover.sheets_in_bbox(36.5, 52.5, 41.5, 55.5, '1m')] == ['N-37']
+    assert [sheet[0] for sheet in cover.sheets_in_bbox(30.0, 60.5, 50.0, 61.0, '1m')] == ['P-35,36', 'P-37,38', 'P-39,40']
+    assert [sheet[0] for sheet in cover.sheets_in_bbox(-10.0, 85.0, 10.0, 89.0, '1m')] == ['V-29,30,31,32', 'Z']
+    assert [sheet[0] for sheet in cover.sheets_in_bbox(179.0, 1.0, -179.0, 2.0, '1m')] == ['A-60', 'A-01']
+    assert [sheet[0] for sheet in cover.sheets_in_bbox(-10.0, -1.0, -9.0, 0.0, '1m')] == ['A-29' + util.south_suffix()]
+
+@pytest.mark.parametrize('scale', ['500k', '200k', '100k', '50k', '25k', '10k', '5k', '2k'])
+def test_sheets_in_bbox_sampling(scale):
+    rnd = random.Random(11)
+    size_x = 6.0 / util.scale_parts[scale]
+    size_y = 4.0 / util.scale_parts[scale]
+    coords_to = getattr(coord, 'coords_to_' + scale)
+
+    for _ in range(10):
+        min_x = rnd.uniform(-180.0, 170.0)
+        min_y = rnd.uniform(-87.0, 83.0)
+        max_x = min(min_x + rnd.uniform(0.0, size_x * 5), 179.99)
+        max_y = min(min_y + rnd.uniform(0.0, size_y * 5), 87.99)
+
+        nomks = [sheet[0] for sheet in cover.sheets_in_bbox(min_x, min_y, max_x, max_y, scale)]
+        assert len(nomks) == len(set(nomks))
+
+        samples = set()
+        for i in range(31):
+            for j in range(31):
+                samples.add(coords_to(min_x + (max_x - min_x) * i / 30, min_y + (max_y - min_y) * j / 30)[0])
+        assert samples == set(nomks)
+
+def _rect_inside(sheet, min_x, min_y, max_x, max_y):
+    return sheet[1] > min_x and sheet[2] < max_x and sheet[3] > min_y and sheet[4] < max_y
+
+def _rect_intersects(sheet, min_x, min_y, max_x, max_y):
+    return sheet[1] <= max_x and sheet[2] >= min_x and sheet[3] <= max_y and sheet[4] >= min_y
+
+@pytest.mark.parametrize('scale', ['1m', '200k', '100k', '50k', '25k', '5k'])
+def test_polygon_sheets(scale):
+    outer = [(36.2, 52.2), (41.8, 52.2), (41.8, 55.8), (36.2, 55.8)]
+    hole = [(38.1, 53.1), (39.1, 53.1), (39.1, 54.1), (38.1, 54.1)]
+    result = dict((sheet[0], sheet[5]) for sheet in cover.polygon_sheets([outer, hole], scale))
+
+    expected = {}
+    for sheet in cover.sheets_in_bbox(36.2, 52.2, 41.8, 55.8, scale):
+        if _rect_inside(sheet, 38.1, 53.1, 39.1, 54.1):
+            continue
+        if _rect_inside(sheet, 36.2, 52.2, 41.8, 55.8) and not _rect_intersects(sheet, 38.1, 53.1, 39.1, 54.1):
+            expected[sheet[0]] = cover.INSIDE
+        else:
+            expected[sheet[0]] = cover.BOUNDARY
+
+    assert result == expected
+
+def test_polygon_sheets_polar():
+    ring = [(30.1, 61.1), (49.9, 61.1), (49.9, 78.9), (30.1, 78.9)]
+    nomks = [sheet[0] for sheet in cover.polygon_sheets([ring], '100k')]
+    assert len(nomks) == len(set(nomks))
+    assert set(nomks) == set(sheet[0] for sheet in cover.sheets_in_bbox(30.1, 61.1, 49.9, 78.9, '100k'))
+
+    statuses = dict((sheet[0], sheet[5]) for sheet in cover.polygon_sheets([ring], '1m'))
+    assert statuses['R-35,36'] == cover.BOUNDARY
+    assert statuses['R-37,38'] == cover.INSIDE
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+import io
+import json
+import struct
+import pytest
+import nomk2
+from nomk import coord, cover, geometry, text
+
+def unpack(data):
+    byte_order, geometry_type = struct.unpack_from('<BI', data)
+    assert byte_order == 1
+    srid = None
+    offset = 5
+    if geometry_type & geometry.EWKB_SRID_FLAG:
+        srid = struct.unpack_from('<I', data, offset)[0]
+        offset += 4
+    rings, points = struct.unpack_from('<II', data, offset)
+    coords = struct.unpack_from('<10d', data, offset + 8)
+    return geometry_type & ~geometry.EWKB_SRID_FLAG, srid, rings, points, coords
+
+@pytest.mark.parametrize('item', [
+    coord.coords_to_100k(37.2, 55.1),
+    text.text_to_100k('N', 37, 27, False),
+    nomk2.get_nomk('N-37-027'),
+])
+def test_to_wkb(item):
+    assert geometry.get_bbox(item) == (37.0, 55.0, 37.5, 55.0 + 1 / 3.0)
+    geometry_type, srid, rings, points, coords = unpack(geometry.to_wkb(item))
+    assert (geometry_type, srid, rings, points) == (3, None, 1, 5)
+    assert coords == (37.0, 55.0, 37.0, 55.0 + 1 / 3.0, 37.5, 55.0 + 1 / 3.0, 37.5, 55.0, 37.0, 55.0)
+    assert len(geometry.to_wkb(item)) == geometry.WKB_SIZE == 93
+
+    data = geometry.to_wkb(item, 4326)
+    assert len(data) == geometry.EWKB_SIZE == 97
+    assert unpack(data)[:2] == (3, 4326)
+    assert unpack(data)[4] == coords
+
+def test_south():
+    assert geometry.get_bbox(coord.coords_to_1m(37.0, -55.0)) == (36.0, -56.0, 42.0, -52.0)
+
+def test_encode_many():
+    sheets = list(cover.sheets_in_bbox(37.0, 55.0, 38.0, 56.0, '50k'))
+    data = geometry.encode_many(sheets, 4326)
+    assert len(data) == len(sheets) * geometry.EWKB_SIZE
+    records = list(geometry.iter_records(data, 4326))
+    assert len(records) == len(sheets)
+    assert all(bytes(record) == geometry.to_wkb(sheet, 4326) for record, sheet in zip(records, sheets))
+    assert bytes(geometry.encode_many(iter(sheets))) == b''.join(geometry.to_wkb(sheet) for sheet in sheets)
+
+def test_write_feature_collection():
+    output = io.StringIO()
+    count = geometry.write_feature_collection(cover.sheets_in_bbox(37.0, 55.0, 38.0, 56.0, '200k'), output)
+    collection = json.loads(output.getvalue())
+    assert count == len(collection['features']) == 2
+    feature = collection['features'][0]
+    assert feature['properties'] == {'nomk': 'N-37-VIII'}
+    ring = feature['geometry']['coordinates'][0]
+    assert ring[0] == ring[-1] and len(ring) == 5
+
+    output = io.StringIO()
+    assert geometry.write_feature_collection([], output) == 0
+    assert json.loads(output.getvalue())['features'] == []
+
+    output = io.StringIO()
+    geometry.write_feature_collection([nomk2.get_nomk('N-37')], output, lambda item: {'id': 1})
+    assert json.loads(output.getvalue())['features'][0]['properties'] == {'id': 1}
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+import pytest
+import sqlite3
+import struct
+from nomk import coord, cover, geometry, gpkg
+
+def test_export_bbox(tmp_path):
+    path = str(tmp_path / 'sheets.gpkg')
+    count = gpkg.export_bbox(path, 37.0, 55.0, 38.0, 56.0, '50k', batch_size = 7)
+    sheets = list(cover.sheets_in_bbox(37.0, 55.0, 38.0, 56.0, '50k'))
+    assert count == len(sheets) == 24
+
+    connection = sqlite3.connect(path)
+    assert connection.execute('PRAGMA application_id').fetchone()[0] == gpkg.APPLICATION_ID
+    assert connection.execute('PRAGMA integrity_check').fetchone()[0] == 'ok'
+    contents = connection.execute('SELECT data_type, srs_id, min_x, min_y, max_x, max_y FROM gpkg_contents '
+        'WHERE table_name = ?', ('sheets_50k',)).fetchone()
+    assert contents[:2] == ('features', 4326)
+    assert contents[2:] == pytest.approx((37.0, 55.0, 38.0, 56.0))
+    assert connection.execute('SELECT geometry_type_name FROM gpkg_geometry_columns').fetchone()[0] == 'POLYGON'
+    assert connection.execute('SELECT extension_name FROM gpkg_extensions').fetchone()[0] == 'gpkg_rtree_index'
+
+    rows = connection.execute('SELECT fid, geom, nomk, scale FROM sheets_50k ORDER BY fid').fetchall()
+    assert [row[2] for row in rows] == [sheet[0] for sheet in sheets]
+    assert all(row[3] == '50k' for row in rows)
+    magic, version, flags, srid = struct.unpack_from('<2sBBi', rows[0][1])
+    assert (magic, version, flags, srid) == (b'GP', 0, 3, 4326)
+    assert rows[0][1][gpkg.HEADER_SIZE:] == geometry.to_wkb(sheets[0])
+
+    assert connection.execute('SELECT count(*) FROM rtree_sheets_50k_geom').fetchone()[0] == 24
+    assert connection.execute('SELECT id FROM rtree_sheets_50k_geom WHERE minx <= 37.1 AND maxx >= 37.1 '
+        'AND miny <= 55.1 AND maxy >= 55.1').fetchall() == [(rows[[row[2] for row in rows].index(coord.coords_to_50k(37.1, 55.1)[0])][0],)]
+    connection.close()
+
+def test_write_sheets(tmp_path):
+    path = str(tmp_path / 'sheets.gpkg')
+    assert gpkg.write_sheets(path, iter([coord.coords_to_100k(37.0, 55.0), coord.coords_to_1m(37.0, -55.0)]), 'points') == 2
+    # Table is replaced
+    assert gpkg.write_sheets(path, [coord.coords_to_10k(37.0, 55.0)], 'points') == 1
+    assert gpkg.write_sheets(path, [], 'empty') == 0
+
+    connection = gpkg.connect(path)
+    assert connection.execute('SELECT nomk, scale FROM points').fetchall() == [(coord.coords_to_10k(37.0, 55.0)[0], '10k')]
+    assert connection.execute('SELECT count(*) FROM gpkg_contents').fetchone()[0] == 2
+    # Triggers keep index in sync
+    connection.execute('INSERT INTO points (geom, nomk, scale) VALUES (?, ?, ?)', 
+        (gpkg.to_blob(coord.coords_to_1m(37.0, -55.0)), 'N-37(ЮП)', '1m'))
+    assert connection.execute('SELECT minx, maxx, miny, maxy FROM rtree_points_geom WHERE id = 2').fetchone() == (36.0, 42.0, -56.0, -52.0)
+    connection.execute('DELETE FROM points WHERE fid = 1')
+    assert connection.execute('SELECT count(*) FROM rtree_points_geom').fetchone()[0] == 1
+    connection.close()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+import math
+import random
+from fractions import Fraction
+from nomk import coord, grid, parser, text, util
+
+delta = 0.00000001
+
+def test_locate_exact_near_edges():
+    rnd = random.Random(11)
+    for scale, parts in util.scale_parts.items():
+        for _ in range(500):
+            x = rnd.randrange(1, 60 * parts) * 6.0 / parts - 180.0
+            y = rnd.randrange(1, 22 * parts) * 4.0 / parts
+            for px in (math.nextafter(x, -180.0), x, math.nextafter(x, 180.0)):
+                for py in (math.nextafter(y, 0.0), y, -y):
+                    is_south, row, col = grid.locate(px, py, scale)
+                    assert is_south == (py < 0)
+                    assert row == math.floor(abs(Fraction(py)) * parts / 4)
+                    assert col == math.floor((Fraction(px) + 180) * parts / 6)
+
+def test_near_edge():
+    assert grid.near_edge(37.0, 55.1, '100k')
+    assert grid.near_edge(37.1, 56.0, '1m')
+    assert grid.near_edge(-5e-324, 55.1, '1m')
+    assert grid.near_edge(37.1, math.nextafter(1.0, 0.0), '100k')
+    assert grid.near_edge(37.1, -76.0, '2k')
+    assert not grid.near_edge(37.1, 55.1, '100k')
+    assert not grid.near_edge(37.1, 55.1, '2k')
+
+    # Far from edges coords_to_* returns the sheet of locate
+    rnd = random.Random(13)
+    for scale, parts in util.scale_parts.items():
+        for _ in range(300):
+            x = rnd.uniform(-180.0, 180.0)
+            y = rnd.uniform(-88.0, 88.0)
+            if grid.near_edge(x, y, scale):
+                continue
+            _, min_x, max_x, min_y, max_y = getattr(coord, 'coords_to_' + scale)(x, y)
+            is_south, row, col = grid.locate(x, y, scale)
+            min_x2, max_x2, min_y2, max_y2 = grid.get_bbox(scale, is_south, row, col)
+            assert abs(min_x - min_x2) < delta and abs(max_x - max_x2) < delta
+            assert abs(min_y - min_y2) < delta and abs(max_y - max_y2) < delta
+
+def test_get_units():
+    # N-37-004 and quad sheet T-47-133,134,135,136
+    assert grid.get_units('100k', 167, 438) == (438 * 48, 439 * 48, 167 * 48, 168 * 48)
+    assert grid.get_units('100k', 19 * 12 + 1, 46 * 12 + 2) == (46 * 576, 46 * 576 + 4 * 48, 229 * 48, 230 * 48)
+    assert grid.get_units('1m', 19, 46, alternative = True) == (46 * 576, 47 * 576, 19 * 576, 20 * 576)
+    assert grid.get_bbox('1m', True, 22, 10) == (-180.0, 180.0, -88.0, -90.0)
+
+def test_text_equal_coords():
+    rnd = random.Random(12)
+    for scale in util.scale_parts:
+        func = getattr(coord, 'coords_to_' + scale)
+        for _ in range(300):
+            x = rnd.uniform(-180.0, 180.0)
+            y = rnd.choice([-1, 1]) * rnd.uniform(0.0, 87.9)
+            nomk_str, min_x, max_x, min_y, max_y = func(x, y)
+            _, parts, is_south = parser.parse(nomk_str, scale)
+            bbox = getattr(text, 'text_to_' + scale)(*parts, is_south)
+            assert abs(bbox[1] - min_x) < delta
+            assert abs(bbox[2] - max_x) < delta
+            assert abs(bbox[3] - min_y) < delta
+            assert abs(bbox[4] - max_y) < delta
@@ -342,3 +342,27 @@ def test_O_46_072_A():
     
     assert O_46_072_A_min_x2 > O_46_071_B_min_x2
     assert O_46_072_A_max_x2 > O_46_071_B_max_x2
+
+def test_coords_to_all():
+    for x, y in [(37.61556, 55.75222), (37.61556, -55.75222), (-37.3, -75.0), (97.35, 76.60), (29.39, 60.0793697371)]:
+        sheets = coord.coords_to_all(x, y)
+        assert len(sheets) == 9
+        for scale, sheet in sheets.items():
+            assert sheet == getattr(coord, 'coords_to_' + scale)(x, y)
+
+def test_joined_sheets():
+    assert coord.coords_to_1m(97.35, 76.60)[0] == u'T-45,46,47,48'
+    assert coord.coords_to_500k(98.0, 78.5)[0] == u'T-47-А,Б,48-А,Б'
+    assert coord.coords_to_200k(112.5, 78.1)[0] == u'T-49-XVI,XVII,XVIII'
+    assert coord.coords_to_50k(97.35, 76.60)[0] == u'T-47-123-А,Б,124-А,Б'
+    assert coord.coords_to_25k(97.35, 76.60)[0] == u'T-47-123-А-а,б,Б-а,б'
+    assert coord.coords_to_10k(97.35, 76.60)[0] == u'T-47-123-Б-а-3,4,б-3,4'
+    assert coord.coords_to_5k(97.35, 76.60)[0] == u'T-47-123-(057,058,059,060)'
+    assert coord.coords_to_2k(97.35, -66.60)[0] == u'Q-47-087-(204)-ж,з,и' + util.south_suffix()
+
+def test_500k_polar_half():
+    # Point on the middle parallel of joined 1:500 000 sheet belongs to the 
+    # northern half as in the other sheets
+    nomk_str, _, _, min_y, max_y = coord.coords_to_500k(42.0, 78.0)
+    assert nomk_str == u'T-37-А,Б,38-А,Б'
+    assert (min_y, max_y) == (78.0, 80.0)
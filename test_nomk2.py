@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+import pytest
+import nomk2
+
+@pytest.mark.parametrize('nomk_str,wkt', [
+    ('N-37', 'POLYGON ((36 52, 36 56, 42 56, 42 52, 36 52))'),
+    ('U-37,38,39,40', 'POLYGON ((36 80, 36 84, 60 84, 60 80, 36 80))'),
+    ('N-37-А', 'POLYGON ((36.0 54.0, 36.0 56.0, 39.0 56.0, 39.0 54.0, 36.0 54.0))'),
+    ('N-37-027', 'POLYGON ((37.0 55.0, 37.0 55.333333333333336, 37.5 55.333333333333336, 37.5 55.0, 37.0 55.0))'),
+    ('N-37-027-В-в-3', 'POLYGON ((37.0 55.0, 37.0 55.04166666666667, 37.0625 55.04166666666667, 37.0625 55.0, 37.0 55.0))'),
+    ('N-37-027(241-ж)', 'POLYGON ((37.0 55.0, 37.0 55.00694444444445, 37.010416666666664 55.00694444444445, 37.010416666666664 55.0, 37.0 55.0))'),
+])
+def test_get_bbox_as_wkt(nomk_str, wkt):
+    sheet = nomk2.get_nomk(nomk_str)
+    assert sheet.get_bbox_as_wkt() == wkt
+    # Parts are kept, so bbox can be calculated again
+    assert sheet.get_bbox_as_wkt() == wkt
+
+def test_interning():
+    sheet = nomk2.get_nomk('N-37-027-В')
+    assert nomk2.get_nomk('N-37-027-В') is sheet
+    assert nomk2.get_nomk('N-37-027-Г') is not sheet
+    with pytest.raises(AttributeError):
+        sheet.extra = 1
+
+def test_shared_tables():
+    assert nomk2.Nomk100k('N', '37', '027').prepare_parts() is not None
+    assert nomk2.Nomk100k('N', '37', '027').prepare_parts()['1m'] is nomk2.Nomk100k('N', '37', '028').prepare_parts()['1m']
+    assert nomk2.Nomk5k._levels[0] is nomk2.Nomk100k._levels[0]
+    assert nomk2.Nomk100k._levels[0].parts_index[144] == (12, 12)
+
+@pytest.mark.parametrize('nomk_str,nomk_class', [
+    ('N-37', nomk2.Nomk1m),
+    ('R-39-А,Б', nomk2.Nomk500k),
+    ('N-36-15', nomk2.Nomk200k),
+    ('N-37-056', nomk2.Nomk100k),
+    ('N-37-134-А', nomk2.Nomk50k),
+    ('N-37-56-А-г', nomk2.Nomk25k),
+    ('N-37-56-А-г-3', nomk2.Nomk10k),
+    ('N-37-87(70)', nomk2.Nomk5k),
+    ('N-37-87(70-и)', nomk2.Nomk2k),
+    ('N-37-87(70-й)', None),
+    ('N-37-', None),
+])
+def test_get_nomk_class(nomk_str, nomk_class):
+    assert nomk2.get_nomk_class(nomk_str) is nomk_class
+    if nomk_class is None:
+        assert nomk2.get_nomk(nomk_str) is None
+    else:
+        assert type(nomk2.get_nomk(nomk_str)) is nomk_class
+
+def test_get_nomks():
+    sheets = list(nomk2.get_nomks(iter(['N-37', 'x', None, 'N-37-027(241-ж)'])))
+    assert len(sheets) == 4
+    assert sheets[0] is nomk2.get_nomk('N-37')
+    assert sheets[1] == nomk2.NomkError(1, 'x', 'Unknown format')
+    assert sheets[2] == nomk2.NomkError(2, None, 'Not a string')
+    assert isinstance(sheets[3], nomk2.Nomk2k)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+import random
+import pytest
+from nomk import coord, normalize, sheetid, util
+
+def test_forms():
+    samples = {
+        'N-37-027-В': ['N-37-27-В', 'N-37-027-В', 'N-37-027-B', ' N - 37 - 027 - В ', 'n-37-027-В'],
+        'N-37-XXVII': ['N-37-XXVII', 'N-37-ХХVІІ'],
+        'N-37-027': ['N-37-027', 'N - 37 - 027', 'N-37-27'],
+        'N-37-090': ['N-37-90'],
+        'N-37-087-(070)': ['N-37-87(70)', 'N-37-087-(70)'],
+        'N-37-087-(070)-и': ['N-37-87(70-и)', 'N-37-087-(070)-и'],
+        'M-37': ['М-37', 'm-37'],
+        'T-48-XXVIII,XXIX,XXX': ['T-48-XXVIII,XXIX,XXX'],
+        'A-15-XIX' + util.south_suffix(): ['A-15-XIX ' + util.south_suffix()],
+    }
+    for canonical, nomks in samples.items():
+        key = sheetid.from_nomk(canonical)
+        for nomk_str in nomks:
+            assert normalize.normalize(nomk_str) == canonical, nomk_str
+            assert normalize.normalize_key(nomk_str) == key, nomk_str
+
+    assert normalize.normalize('N-37-27', '100k') == 'N-37-027'
+    assert normalize.normalize_key('N-37-27') == sheetid.from_nomk('N-37-27')
+
+    # Numeric 1:200 000 sheets of nomk2
+    numeric = {
+        'N-37-XXVII': 'N-37-27',
+        'T-48-XXVIII,XXIX,XXX': 'T-48-28,29,30',
+        'A-15-XIX' + util.south_suffix(): 'A-15-19' + util.south_suffix(),
+    }
+    for canonical, nomk_str in numeric.items():
+        assert normalize.normalize(nomk_str, numeric_200k = True) == canonical
+        assert normalize.normalize(nomk_str, '200k') == canonical
+        assert normalize.normalize_key(nomk_str, numeric_200k = True) == sheetid.from_nomk(canonical)
+    assert normalize.normalize('N-37-127', numeric_200k = True) == 'N-37-127'
+    assert normalize.normalize_many(['N-37-27', 'N-37-XXVII'], roman = False, numeric_200k = True) == ['N-37-27', 'N-37-27']
+    assert normalize.normalize('N-37-XXVII', roman = False) == 'N-37-27'
+    assert normalize.normalize('T-48-XXVIII,XXIX,XXX', roman = False) == 'T-48-28,29,30'
+
+def test_canonical():
+    rnd = random.Random(25)
+    for _ in range(300):
+        x = rnd.uniform(-180.0, 180.0)
+        y = rnd.uniform(-88.0, 88.0)
+        for scale in sheetid.scales:
+            nomk_str = getattr(coord, 'coords_to_' + scale)(x, y)[0]
+            key = sheetid.from_nomk(nomk_str)
+            assert normalize.normalize(nomk_str) == nomk_str
+            assert normalize.normalize_key(normalize.normalize(nomk_str, roman = False), numeric_200k = True) == key
+
+def test_columns():
+    nomks = ['N-37-27-B', 'N-37-027-В', 'garbage', None, 'N-37-027-В']
+    assert normalize.normalize_many(nomks) == ['N-37-027-В', 'N-37-027-В', None, None, 'N-37-027-В']
+    key = sheetid.from_nomk('N-37-027-В')
+    assert normalize.normalize_keys(nomks) == [key, key, None, None, key]
+
+def test_invalid():
+    for nomk_str in ['N-99', 'N-00', 'N-61-027', 'T-20066-В-а-1,2,б-1,2']:
+        for func in (normalize.normalize, normalize.normalize_key):
+            with pytest.raises(Exception, match = 'Unsupported sheet part'):
+                func(nomk_str)
+    assert normalize.normalize_keys(['N-99', 'N-35']) == [None, sheetid.from_nomk('N-35')]
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+import random
+import pytest
+from nomk import coord, parallel
+
+random.seed(9)
+points = [(random.uniform(-179.9, 179.9), random.uniform(-87.9, 87.9)) for _ in range(1000)]
+
+@pytest.mark.parametrize('jobs,chunk_size', [
+    (1, 100), (2, 7), (3, 1000), (2, 5000),
+])
+def test_coords_to_many(jobs, chunk_size):
+    results = list(parallel.coords_to_many(iter(points), '25k', jobs, chunk_size))
+    assert results == [coord.coords_to_25k(x, y) for x, y in points]
+
+def test_coords_to_many_all():
+    results = list(parallel.coords_to_many(points[:50], 'all', 2, 10))
+    assert results == [coord.coords_to_all(x, y) for x, y in points[:50]]
+
+def test_coords_to_many_error():
+    with pytest.raises(Exception):
+        list(parallel.coords_to_many(points[:10] + [(37.0, 89.0)], '100k', 2, 3))
+    with pytest.raises(Exception):
+        list(parallel.coords_to_many(points, '3k', 1))
@@ -222,3 +222,78 @@ def test_2k_parse():
     assert parts[3] == 63
     assert parts[4] == 'а'
     assert is_south == False
+
+def test_detect():
+    samples = {
+        'U-37,38,39,40': '1m',
+        'T-47-В,Г,48-В,Г': '500k',
+        'A-15-XIX' + util.south_suffix(): '200k',
+        'U-48-141,142,143,144': '100k',
+        'T-48-033-А,Б,034-А,Б': '50k',
+        'T-48-047-А-а,б,Б-а,б': '25k',
+        'T-47-004-А-а-1,2,б-1,2': '10k',
+        'O-41-109-(064)': '5k',
+        'M-38-125-(063)-а': '2k',
+    }
+    for nomk_str, scale in samples.items():
+        assert parser.parse(nomk_str)[0] == scale
+        assert parser.detect(nomk_str) == parser.parse(nomk_str, scale)
+
+    # 2k pattern matches, but the sheet number can not be read, so 5k is used as before
+    assert parser.parse('M-38-125-(063,064)-а') == ('5k', ['M', 38, 125, 64], False)
+
+    with pytest.raises(Exception):
+        parser.parse('garbage')
+
+def test_validate():
+    samples = {
+        'U-37,38,39,40': '1m',
+        'T-47-В,Г,48-В,Г': '500k',
+        'A-15-XIX' + util.south_suffix(): '200k',
+        'U-48-141,142,143,144': '100k',
+        'T-48-033-А,Б,034-А,Б': '50k',
+        'T-48-047-А-а,б,Б-а,б': '25k',
+        'T-47-004-А-а-1,2,б-1,2': '10k',
+        'O-41-109-(064)': '5k',
+        'T-47-123-(057,058,059,060)': '5k',
+        'M-38-125-(063)-а': '2k',
+        ' N - 37 - 027 \n': '100k',
+    }
+    for nomk_str, scale in samples.items():
+        assert parser.validate(nomk_str) == (scale, None, None)
+        assert parser.parse(nomk_str)[0] == scale
+
+    errors = {
+        '': (parser.ERROR_EMPTY, 0),
+        'Н-37': (parser.ERROR_ALPHABET, 0),
+        'N-37-027-A': (parser.ERROR_ALPHABET, 9),
+        'N-37-XL': (parser.ERROR_ALPHABET, 6),
+        'Y-37': (parser.ERROR_LETTER, 0),
+        'N37': (parser.ERROR_SEPARATOR, 1),
+        'N-37-27': (parser.ERROR_PADDING, 5),
+        'R-58-17-А-а,бx': (parser.ERROR_PADDING, 5),
+        'T-47-123-(057,58)': (parser.ERROR_PADDING, 14),
+        'N-99': (parser.ERROR_RANGE, 2),
+        'N-37-027-Д': (parser.ERROR_RANGE, 9),
+        'O-41-109-064': (parser.ERROR_BRACKET, 9),
+        'O-41-109-[064]': (parser.ERROR_BRACKET, 9),
+        'O-41-109-(064': (parser.ERROR_BRACKET, 13),
+        'N-37-(027)': (parser.ERROR_BRACKET, 5),
+        'N-37-027,': (parser.ERROR_PART, 9),
+        'A-15' + util.south_suffix() + '-1': (parser.ERROR_TRAILING, 8),
+        None: (parser.ERROR_TYPE, 0),
+    }
+    results = list(parser.validate_many(errors))
+    for (nomk_str, (error, position)), result in zip(errors.items(), results):
+        assert result == (None, error, position), nomk_str
+
+def test_validate_whitespace():
+    # Inside the string parse removes only spaces
+    assert parser.validate(u'D-07\t-064-Г') == (None, parser.ERROR_SEPARATOR, 4)
+    assert parser.validate(u'B\t-60-075-А') == (None, parser.ERROR_SEPARATOR, 1)
+    assert parser.validate(u'N-37-\n027') == (None, parser.ERROR_PART, 5)
+    assert parser.validate(u'N-37\t\t(ЮП)') == (None, parser.ERROR_SEPARATOR, 4)
+    for nomk_str in [u'\tD-07 - 064-Г\r\n', u'N-37\t(ЮП)', u'N-37 \t (ЮП)']:
+        scale, _, _ = parser.validate(nomk_str)
+        assert scale is not None
+        assert parser.parse(nomk_str)[0] == scale
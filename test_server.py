@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+import asyncio
+import json
+import select
+import socket
+import threading
+import time
+from nomk import algos, coord, server
+
+def request(item):
+    return json.loads(server.handle_request(json.dumps(item)))
+
+def test_point():
+    response = request({'id': 7, 'op': 'point', 'x': 37.6, 'y': -55.7, 'scales': ['1m', '10k']})
+    assert response['id'] == 7
+    assert sorted(response['result']) == ['10k', '1m']
+    nomk_str, min_x, max_x, min_y, max_y = coord.coords_to_10k(37.6, -55.7)
+    assert response['result']['10k'] == {'nomk': nomk_str, 'min_x': min_x, 'max_x': max_x, 'min_y': min_y, 'max_y': max_y}
+
+def test_batch():
+    response = request([
+        {'op': 'name', 'nomk': 'N-37-027'},
+        {'op': 'bbox', 'bbox': [37.0, 55.0, 38.0, 56.0], 'scale': '200k'},
+        {'op': 'neighbors', 'nomks': ['N-36-012'], 'scale': '100k'},
+        {'op': 'neighbors', 'nomk': 'N-36-012', 'k': 2},
+        {'op': 'point', 'x': 37.0},
+        {'op': 'foo'},
+        {'op': 'bbox', 'bbox': [-180.0, -88.0, 180.0, 88.0], 'scale': '2k'},
+    ])
+    assert len(response) == 7
+    assert response[0]['result'] == {'scale': '100k', 'min_x': 37.0, 'max_x': 37.5, 'min_y': 55.0, 'max_y': 55.0 + 1 / 3.0}
+    assert [sheet['nomk'] for sheet in response[1]['result']] == ['N-37-VIII', 'N-37-II']
+    assert set(response[2]['result']) == set(algos.get_neighbors(['N-36-012'], '100k'))
+    assert len(response[3]['result']) == 25
+    assert 'y' in response[4]['error']
+    assert 'error' in response[5]
+    assert 'error' in response[6]
+
+# About 40 000 sheets
+slow_item = {'op': 'bbox', 'bbox': [30.0, 40.0, 60.0, 54.0], 'scale': '25k'}
+
+def test_limits():
+    response = request({'op': 'neighbors', 'nomk': 'N-37-027', 'k': 1000000000})
+    assert 'error' in response
+    response = request({'op': 'neighbors', 'nomks': ['N-37-027', 'N-37-028'], 'k': 120})
+    assert 'error' in response
+    response = request({'op': 'neighbors', 'nomk': 'N-37-027', 'k': -1})
+    assert response['result'] == ['N-37-027']
+
+    # Sheets of all items of request are limited together
+    count = len(request(slow_item)['result'])
+    assert count * 2 < server.MAX_SHEETS < count * 3
+    response = request([slow_item] * 3)
+    assert ['result' in item_response for item_response in response] == [True, True, False]
+    assert 'error' in response[2]
+
+def test_invalid():
+    assert 'error' in request({'op': 'point', 'x': 180.0, 'y': 55.0})
+    assert request({'op': 'point', 'x': -180.0, 'y': 55.0, 'scales': ['1m']})['result']['1m']['nomk'] == 'N-01'
+    assert 'UTF-8' in json.loads(server.handle_request(b'{"op": "name", "nomk": "\xff"}'))['error']
+    assert json.loads(server.handle_request(b'{"op": "name", "nomk": "N-37"}'))['result']['scale'] == '1m'
+    assert 'error' in json.loads(server.handle_request('{'))
+    assert 'error' in json.loads(server.handle_request('1'))
+    assert server.parse_address('unix:/tmp/nomk.sock') == (None, '/tmp/nomk.sock')
+    assert server.parse_address('8765') == ('127.0.0.1', 8765)
+    assert server.parse_address('0.0.0.0:8765') == ('0.0.0.0', 8765)
+
+def test_connection():
+    async def run():
+        nomk_server = await server.start_server('127.0.0.1:0')
+        port = nomk_server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'{"id": 1, "op": "name", "nomk": "N-37"}\n\n[{"id": 2, "op": "name", "nomk": "N-38"}]\n')
+        responses = [json.loads(await reader.readline()) for _ in range(2)]
+        writer.write(b'\xff\n')
+        assert 'UTF-8' in json.loads(await reader.readline())['error']
+        writer.write(b'{"id": 3, "op": "name", "nomk": "N-37"}\n')
+        responses.append(json.loads(await reader.readline()))
+        writer.write(b'"' + b'x' * server.MAX_LINE + b'"\n')
+        too_long = json.loads(await reader.readline())
+        writer.close()
+        nomk_server.close()
+        await nomk_server.wait_closed()
+        return responses, too_long
+
+    responses, too_long = asyncio.run(run())
+    assert responses[0]['id'] == 1 and responses[0]['result']['max_x'] == 42.0
+    assert responses[1][0]['id'] == 2 and responses[1][0]['result']['max_x'] == 48.0
+    assert 'error' in too_long
+    assert responses[2]['id'] == 3
+
+def test_connection_not_blocked():
+    # Slow request of one connection does not hold back other connections
+    loop = asyncio.new_event_loop()
+    nomk_server = loop.run_until_complete(server.start_server('127.0.0.1:0'))
+    port = nomk_server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target = loop.run_forever)
+    thread.start()
+    try:
+        with socket.create_connection(('127.0.0.1', port)) as slow, \
+                socket.create_connection(('127.0.0.1', port)) as fast:
+            slow.sendall(json.dumps(slow_item).encode() + b'\n')
+            time.sleep(0.05)
+            fast.sendall(b'{"op": "name", "nomk": "N-37"}\n')
+            assert json.loads(fast.makefile('rb').readline())['result']['scale'] == '1m'
+            # Response to the slow request is not sent yet
+            assert select.select([slow], [], [], 0)[0] == []
+            assert 'result' in json.loads(slow.makefile('rb').readline())
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        nomk_server.close()
+        loop.run_until_complete(nomk_server.wait_closed())
+        loop.close()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+ 
+import random
+import pytest
+from nomk import coord, grid, sheetid, util
+
+delta = 0.00000001
+
+def test_sheetid_coords():
+    rnd = random.Random(7)
+    for _ in range(500):
+        x = rnd.uniform(-180.0, 180.0)
+        y = rnd.uniform(-88.0, 88.0)
+        for scale in sheetid.scales:
+            nomk_str, min_x, max_x, min_y, max_y = getattr(coord, 'coords_to_' + scale)(x, y)
+            sheet_id = sheetid.from_coords(x, y, scale)
+
+            assert sheet_id < 2 ** 63
+            assert sheetid.get_scale(sheet_id) == scale
+            assert sheetid.from_nomk(nomk_str) == sheet_id
+            assert sheetid.to_nomk(sheet_id)[0] == nomk_str
+
+            _, min_x2, max_x2, min_y2, max_y2 = sheetid.to_bbox(sheet_id)
+            assert abs(min_x - min_x2) < delta
+            assert abs(max_x - max_x2) < delta
+            assert abs(min_y - min_y2) < delta
+            assert abs(max_y - max_y2) < delta
+
+def test_sheetid_parts():
+    sheet_id = sheetid.from_nomk(u'N-37-027-В-в-3')
+    assert sheetid.to_parts(sheet_id) == ('10k', ['N', 37, 27, u'В', u'в', 3], False)
+    assert sheetid.to_nomk(sheet_id)[0] == u'N-37-027-В-в-3'
+
+    sheet_id = sheetid.from_nomk(u'N-37-027-(241)' + util.south_suffix())
+    assert sheetid.to_nomk(sheet_id)[0] == u'N-37-027-(241)' + util.south_suffix()
+
+def test_sheetid_composite():
+    assert sheetid.from_nomk('U-37,38,39,40') == sheetid.from_coords(37.5, 81.0, '1m')
+    assert sheetid.to_nomk(sheetid.from_nomk('U-37,38,39,40'))[0] == 'U-37,38,39,40'
+    assert sheetid.from_nomk(u'T-48-047-А-а,б,Б-а,б') == sheetid.from_coords(107.2, 78.95, '25k')
+    assert sheetid.to_nomk(sheetid.from_nomk(u'T-48-047-А-а,б,Б-а,б'))[0] == u'T-48-047-А-а,б,Б-а,б'
+
+def test_sheetid_zone():
+    for nomk_str in ['N-00', 'N-61', 'N-99', 'N-99-027', 'N-64']:
+        with pytest.raises(Exception, match = 'Unsupported zone'):
+            sheetid.from_nomk(nomk_str)
+    assert sheetid.to_nomk(sheetid.from_nomk('N-60'))[0] == 'N-60'
+    assert sheetid.to_nomk(sheetid.from_nomk('N-01'))[0] == 'N-01'
+
+def test_sheetid_parent():
+    sheet_id = sheetid.from_nomk(u'N-37-027-В-в-3')
+    assert sheetid.to_nomk(sheetid.get_parent(sheet_id))[0] == u'N-37-027-В-в'
+    assert sheetid.to_nomk(sheetid.get_parent(sheet_id, '100k'))[0] == u'N-37-027'
+    assert sheetid.to_nomk(sheetid.get_parent(sheet_id, '1m'))[0] == u'N-37'
+    assert sheetid.get_parent(sheet_id, '100k') < sheet_id
+
+    sheet_id = sheetid.from_nomk(u'T-47-123-А,Б,124-А,Б')
+    assert sheetid.to_nomk(sheetid.get_parent(sheet_id))[0] == u'T-47-121,122,123,124'
+
+def test_sheetid_parent_not_level():
+    # 1:500 000 and 1:200 000 are not levels of nomenclature of smaller scales
+    sheet_id = sheetid.from_nomk(u'N-37-027-В-в-3')
+    assert sheetid.to_nomk(sheetid.get_parent(sheet_id, '500k'))[0] == u'N-37-А'
+    assert sheetid.to_nomk(sheetid.get_parent(sheet_id, '200k'))[0] == u'N-37-VIII'
+    sheet_id = sheetid.from_nomk(u'N-37-027')
+    assert sheetid.to_nomk(sheetid.get_parent(sheet_id, '500k'))[0] == u'N-37-А'
+    assert sheetid.to_nomk(sheetid.get_parent(sheet_id, '200k'))[0] == u'N-37-VIII'
+    sheet_id = sheetid.from_nomk(u'N-37-XXVII')
+    assert sheetid.to_nomk(sheetid.get_parent(sheet_id, '500k'))[0] == u'N-37-В'
+    sheet_id = sheetid.from_nomk(u'T-47-123-А,Б,124-А,Б')
+    assert sheetid.to_nomk(sheetid.get_parent(sheet_id, '200k'))[0] == u'T-47-XXXI,XXXII,XXXIII'
+    assert sheetid.to_nomk(sheetid.get_parent(sheet_id, '500k'))[0] == u'T-47-В,Г,48-В,Г'
+
+    with pytest.raises(Exception):
+        sheetid.get_parent(sheetid.from_nomk(u'N-37-А'), '200k')
+    with pytest.raises(Exception):
+        sheetid.get_parent(sheetid.from_nomk(u'N-37-А'), '100k')
+
+def test_sheetid_coords_band_edges():
+    # On 60 and 76 degrees coords_to_* returns a sheet which is not joined, 
+    # the identifier is of the joined sheet which contains it
+    for y, scale, nomk_str, joined in [
+            (60.0, '1m', u'P-37', u'P-37,38'),
+            (60.0, '100k', u'P-37-135', u'P-37-135,136'),
+            (76.0, '1m', u'T-37', u'T-37,38,39,40'),
+            (76.0, '100k', u'T-37-135,136', u'T-37-133,134,135,136'),
+            (-60.0, '1m', u'P-37(ЮП)', u'P-37,38(ЮП)'),
+            (-60.0, '100k', u'P-37-003(ЮП)', u'P-37-003,004(ЮП)'),
+            (-76.0, '1m', u'T-37(ЮП)', u'T-37,38,39,40(ЮП)'),
+            (-76.0, '100k', u'T-37-003,004(ЮП)', u'T-37-001,002,003,004(ЮП)')]:
+        assert getattr(coord, 'coords_to_' + scale)(37.3, y)[0] == nomk_str
+        sheet_id = sheetid.from_coords(37.3, y, scale)
+        assert sheetid.to_nomk(sheet_id)[0] == joined
+        assert sheetid.from_nomk(nomk_str) == sheet_id
+        assert grid.near_edge(37.3, y, scale)
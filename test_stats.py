@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+import pytest
+from nomk import algos, coord, parallel, parser, stats, text
+
+@pytest.fixture
+def enabled():
+    stats.reset()
+    stats.enable()
+    yield
+    stats.disable()
+    stats.reset()
+
+def test_disabled():
+    coords_to_100k = coord.coords_to_100k
+    stats.enable()
+    assert stats.is_enabled()
+    assert coord.coords_to_100k is not coords_to_100k
+    assert parallel.coords_to_funcs['100k'] is coord.coords_to_100k
+    stats.disable()
+    assert not stats.is_enabled()
+    assert coord.coords_to_100k is coords_to_100k
+    assert parallel.coords_to_funcs['100k'] is coords_to_100k
+    assert algos.coords_to_funcs['100k'] is coords_to_100k
+    stats.reset()
+
+def test_branches(enabled):
+    for y in (55.0, -55.0, 65.0, 80.0, -80.0):
+        coord.coords_to_1m(37.0, y)
+    text.text_to_100k('U', 37, 1, True)
+    parser.parse('N-37-027')
+    with pytest.raises(Exception):
+        parser.parse('bad')
+
+    snapshot = stats.snapshot()
+    counters = snapshot['coord.coords_to_1m']
+    assert counters['count'] == 5
+    assert counters['branches']['north/regular']['count'] == 1
+    assert counters['branches']['south/regular']['count'] == 1
+    assert counters['branches']['north/polar60']['count'] == 1
+    assert counters['branches']['north/polar76']['count'] == 1
+    assert counters['branches']['south/polar76']['count'] == 1
+    assert counters['p50_ns'] <= counters['p90_ns'] <= counters['p99_ns'] <= counters['max_ns']
+
+    assert snapshot['text.text_to_100k']['branches']['south/polar76']['count'] == 1
+    assert snapshot['parser.parse']['count'] == 2
+    assert snapshot['parser.parse']['errors'] == 1
+    assert snapshot['parser.parse']['branches']['100k/north/regular']['count'] == 1
+    assert 'coord.coords_to_2k' not in snapshot
+
+def test_report(enabled):
+    algos.get_neighbors(['N-37-027'], '100k')
+    report = stats.report()
+    assert 'algos.get_neighbors ' in report
+    assert stats.snapshot()['algos.get_neighbors']['branches']['100k']['count'] == 1
+    stats.reset()
+    assert stats.snapshot() == {}
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+import io
+import json
+import pytest
+from nomk import coord, stream
+
+def convert(data, input_format, scales = None, jobs = 1):
+    errors = []
+    rows = stream.convert(stream.read_records(io.StringIO(data), input_format), scales, True, errors.append, jobs, 2)
+    return list(rows), [error.line for error in errors]
+
+def test_text():
+    rows, errors = convert('37 55\n\nN-37-027\nfoo\n37.6,-55.7\n', 'text', ['100k', '1m'])
+    assert [row[3] for row in rows] == ['N-37', 'N-37-027', 'N-37-027', 'N-37(ЮП)', 'N-37-136(ЮП)']
+    assert rows[1] == (37.0, 55.0, '100k') + (coord.coords_to_100k(37.0, 55.0)[0], 37.0, 55.0, 37.5, 55.0 + 1 / 3.0)
+    assert rows[2][:4] == (None, None, '100k', 'N-37-027')
+    assert errors == [4]
+
+def test_csv():
+    rows, errors = convert('lon,lat,id\n37,55,1\n1,a,2\n\n37.6,-55.7,3\n', 'csv', ['10k'], 2)
+    assert [row[3] for row in rows] == [coord.coords_to_10k(37.0, 55.0)[0], coord.coords_to_10k(37.6, -55.7)[0]]
+    assert errors == [3]
+
+    rows, errors = convert('name\nN-37-027\nN-37-А\n', 'csv', ['100k'])
+    assert [row[3] for row in rows] == ['N-37-027']
+    assert errors == [3]
+
+    rows, errors = convert('a,b\n1,2\n', 'csv')
+    assert rows == [] and errors == [1]
+
+def test_ndjson():
+    rows, errors = convert('{"x": 37, "y": 55}\n"N-37-А"\n[37, 55]\n{"z": 1}\n{\n', 'ndjson')
+    assert len(rows) == 9 * 2 + 1
+    assert [row[2] for row in rows[:9]] == ['1m', '500k', '200k', '100k', '50k', '25k', '10k', '5k', '2k']
+    assert errors == [4, 5]
+
+def test_errors():
+    with pytest.raises(stream.RecordError) as e:
+        list(stream.convert(stream.read_records(['37 55\n', '37 89\n'])))
+    assert e.value.line == 2
+
+def test_out_of_bounds():
+    rows, errors = convert('500 55\n37 -91\n180 55\n-180 90\n37 55\n', 'text', ['1m'])
+    assert [row[3] for row in rows] == ['Z', 'N-37']
+    assert errors == [1, 2, 3]
+
+    with pytest.raises(stream.RecordError) as e:
+        list(stream.convert(stream.read_records(['37 55\n', '500 55\n'])))
+    assert e.value.line == 2
+    assert e.value.message == 'Coordinates out of bounds'
+
+@pytest.mark.parametrize('output_format', stream.output_formats)
+def test_write_rows(output_format):
+    rows, _ = convert('37 55\nN-37-027\n', 'text', ['100k'])
+    output = io.StringIO()
+    assert stream.write_rows(iter(rows), output, output_format) == 2
+    lines = output.getvalue().splitlines()
+    if output_format == 'csv':
+        assert lines[0] == ','.join(stream.columns)
+        assert lines[2] == ',,100k,N-37-027,37.000000,55.000000,37.500000,55.333333'
+    elif output_format == 'ndjson':
+        assert json.loads(lines[0])['nomk'] == 'N-37-027'
+        assert json.loads(lines[1])['x'] is None
+    else:
+        assert lines[1] == 'N-37-027\t[37.000000 55.000000, 37.500000 55.333333]'
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+################################################################################
+# Project: Topomaps nomenclature utility
+# Purpose: Transform coordinates to nomenclature and vice versa
+# Author:  Dmitry Baryshnikov, dmitry.baryshnikov@nextgis.ru
+# Version: 0.1
+################################################################################
+# Copyright (C) 2020-2026, NextGIS <info@nextgis.com>
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+################################################################################
+
+import random
+import pytest
+from nomk import coord, sheetid, table
+
+scales = ('1m', '500k', '200k')
+
+@pytest.fixture(scope = 'module')
+def sheets(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('table') / 'sheets.bin')
+    count = table.build(path, scales)
+    assert count == sum(2 * rows * cols for rows, cols in map(table.get_grid_size, scales))
+    with table.SheetTable(path) as sheets:
+        yield sheets
+
+def test_lookup(sheets):
+    assert sheets.scales() == list(scales)
+    rnd = random.Random(20)
+    for _ in range(3000):
+        x = rnd.uniform(-180.0, 179.999)
+        y = rnd.uniform(-87.99, 87.99)
+        scale = rnd.choice(scales)
+        assert sheets.lookup(x, y, scale) == getattr(coord, 'coords_to_' + scale)(x, y)
+
+def test_polar(sheets):
+    assert sheets.lookup(0.0, 89.0, '1m') == coord.coords_to_1m(0.0, 89.0)
+    assert sheets.lookup(10.0, -89.0, '1m')[0] == coord.coords_to_1m(10.0, -89.0)[0]
+    assert sheets.lookup(40.0, -81.0, '200k') == coord.coords_to_200k(40.0, -81.0)
+    # Parts of composite sheet have the same record
+    assert sheets.lookup(36.1, 81.0, '1m') == sheets.lookup(59.9, 81.0, '1m')
+    with pytest.raises(IndexError):
+        sheets.lookup(37.0, 89.0, '500k')
+    with pytest.raises(KeyError):
+        sheets.lookup(37.0, 55.0, '100k')
+
+def test_lookup_edges(sheets):
+    for y in (60.0, 76.0, 88.0, 0.0):
+        for mult in (1, -1):
+            for x in (-180.0, -5e-324, 37.3, 151.0):
+                for scale in scales:
+                    assert sheets.lookup(x, y * mult, scale) == getattr(coord, 'coords_to_' + scale)(x, y * mult)
+    assert sheets.lookup(37.3, 60.0, '1m')[0] == 'P-37'
+    assert sheets.lookup(151.0, 76.0, '1m')[0] == 'T-56'
+    assert sheets.lookup(37.3, 88.0, '500k')[0] == u'W-37-В,Г,38-В,Г'
+    # Records are of joined sheets
+    assert sheets.get('1m', sheets.index(37.3, 60.0, '1m'))[0] == 'P-37,38'
+    with pytest.raises(IndexError):
+        sheets.index(37.3, 88.0, '500k')
+
+def test_sheet_index(sheets):
+    sheet_id = sheetid.from_nomk('U-37-X,XI,XII(ЮП)')
+    scale, index = sheets.sheet_index(sheet_id)
+    assert scale == '200k'
+    assert sheets.get(scale, index) == sheets.lookup(40.0, -81.0, '200k')
+    assert sheets.get(scale, index)[0] == 'U-37-X,XI,XII(ЮП)'
+    assert sheets.get_bbox(scale, index) == sheets.get(scale, index)[1:]
+
+def test_invalid(tmp_path):
+    path = tmp_path / 'invalid.bin'
+    path.write_bytes(b'0' * 64)
+    with pytest.raises(Exception):
+        table.SheetTable(str(path))